@@ -1,3 +1,3 @@
 from .db import db_settings, engine
-from .logger import configure_logging
+from .logger import configure_logging, report_logger
 from .model import model_settings
@@ -3,8 +3,12 @@ This module sets up the logger configuration.
 
 It utilizes Pydantic's BaseSettings for configuration management,
 allowing settings to be read from environment variables and a .env file.
+Records of the report logger, such as the JSON output of the runner
+scripts, are also written to stdout.
 """
 
+import sys
+
 from loguru import logger
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -42,6 +46,21 @@ def configure_logging(log_level: str) -> None:
         compression='zip',
         level=log_level,
     )
+    logger.add(sys.stdout, format='{message}', filter=_is_report)
+
+
+def _is_report(record: dict) -> bool:
+    """
+    Tell whether a record was logged by the report logger.
+
+    Args:
+        record (dict): The loguru record.
+
+    Returns:
+        bool: Whether the record is a report.
+    """
+    return record['extra'].get('report', False)
 
 
 configure_logging(log_level=LoggerSettings().log_level)
+report_logger = logger.bind(report=True)
@@ -5,6 +5,8 @@ It utilizes Pydantic's BaseSettings for configuration management,
 allowing settings to be read from environment variables and a .env file.
 """
 
+from typing import Literal
+
 from pydantic import DirectoryPath
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -17,6 +19,18 @@ class ModelSettings(BaseSettings):
         model_config (SettingsConfigDict): Model config, loaded from .env file.
         model_path (DirectoryPath): Filesystem path to the model.
         model_name (str): Name of the ML model.
+        registry_enabled (bool): Whether to save models to the registry.
+        model_version (str): Registry version, latest or pinned to load.
+        distillation_enabled (bool): Whether to shrink the trained forest.
+        distillation_r2_tolerance (float): Largest R2 loss of distillation.
+        search_n_jobs (int): Threads across search fits, all cores if < 1.
+        forest_n_jobs (int): Threads per forest, cores left if < 1.
+        search_mode (str): Search, grid, warm_start, oob or halving.
+        search_budget_seconds (float): Halving budget, unlimited if <= 0.
+        search_budget_clock (str): Clock of the budget, wall or cpu.
+        split_seed (int | None): Split seed, from the trial store if None.
+        trial_store_path (str): SQLite trial store of grid fits, off if ''.
+        trial_lease_seconds (float): Seconds before a stale fit is reclaimed.
     """
 
     model_config = SettingsConfigDict(
@@ -27,6 +41,18 @@ class ModelSettings(BaseSettings):
 
     model_path: DirectoryPath
     model_name: str
+    registry_enabled: bool = False
+    model_version: str = ''
+    distillation_enabled: bool = False
+    distillation_r2_tolerance: float = 0.005
+    search_n_jobs: int = -1
+    forest_n_jobs: int = -1
+    search_mode: Literal['grid', 'warm_start', 'oob', 'halving'] = 'grid'
+    search_budget_seconds: float = 0
+    search_budget_clock: Literal['wall', 'cpu'] = 'wall'
+    split_seed: int | None = None
+    trial_store_path: str = ''
+    trial_lease_seconds: float = 300
 
 
 model_settings = ModelSettings()
@@ -2,7 +2,8 @@
 This module provides functionality for making predictions.
 
 It contains the ModelInferenceService class, which offers methods
-to load a model from a file, and to make predictions using the loaded model.
+to load a model from a file or from the model registry, and to make
+predictions using the loaded model.
 """
 
 import pickle as pk
@@ -11,6 +12,7 @@ from pathlib import Path
 from loguru import logger
 
 from config import model_settings
+from model import registry
 
 
 class ModelInferenceService:
@@ -19,11 +21,15 @@ class ModelInferenceService:
 
     This class provides functionalities to load a ML model from
     a specified path, and make predictions using the loaded model.
+    When a model version is configured, the model is looked up by
+    version, or by the `latest` or `pinned` alias, in the registry of
+    the model name instead.
 
     Attributes:
         model: ML model managed by this service. Initially set to None.
         model_path: Directory to extract the model from.
         model_name: Name of the saved model to use.
+        model_version: Registry version to use, empty for the model file.
 
     Methods:
         __init__: Constructor that initializes the ModelService.
@@ -36,6 +42,7 @@ class ModelInferenceService:
         self.model = None
         self.model_path = model_settings.model_path
         self.model_name = model_settings.model_name
+        self.model_version = model_settings.model_version
 
     def load_model(self) -> None:
         """
@@ -44,13 +51,15 @@ class ModelInferenceService:
         Raises:
             FileNotFoundError: If the model file not exist at specified dir.
         """
-        logger.info(
-            f'checking the existance of model config file at '
-            f'{self.model_path}/{self.model_name}',
-        )
+        if self.model_version:
+            model_path = registry.resolve_model(self.model_version)
+        else:
+            model_path = Path(
+                f'{self.model_path}/{self.model_name}',
+            )
 
-        model_path = Path(
-            f'{self.model_path}/{self.model_name}',
+        logger.info(
+            f'checking the existance of model config file at {model_path}',
         )
 
         if not model_path.exists():
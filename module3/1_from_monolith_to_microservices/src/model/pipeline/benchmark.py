@@ -0,0 +1,32 @@
+"""
+This module provides functionality for benchmarking a trained model.
+
+It includes a function to measure the prediction latency of a model,
+which is logged when the model is distilled and stored in its metadata
+when it is registered.
+"""
+
+import timeit
+
+import pandas as pd
+from sklearn.base import RegressorMixin
+
+LATENCY_CALLS = 20
+MILLISECONDS = 1e3
+
+
+def predict_latency(model: RegressorMixin, features: pd.DataFrame) -> float:
+    """
+    Measure the best prediction latency of a model.
+
+    Args:
+        model (RegressorMixin): The trained model.
+        features (pd.DataFrame): The rows to predict.
+
+    Returns:
+        float: The best latency of a prediction, in milliseconds.
+    """
+    timings = timeit.repeat(
+        lambda: model.predict(features), number=1, repeat=LATENCY_CALLS,
+    )
+    return min(timings) * MILLISECONDS
@@ -0,0 +1,144 @@
+"""
+This module provides the distillation of a trained forest.
+
+It includes a function to shrink a RandomForestRegressor to the
+smallest prefix of its trees whose out-of-bag R2 score stays within a
+tolerance of the full forest, and to log the latency gained against the
+accuracy lost. The prefix is chosen on the training set, so the test
+set still gives an unbiased score of the distilled forest.
+"""
+
+import copy
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import r2_score
+from sklearn.tree import DecisionTreeRegressor
+
+from model.pipeline.benchmark import predict_latency
+
+
+def distill_forest(
+    model: RandomForestRegressor,
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    r2_tolerance: float,
+) -> RandomForestRegressor:
+    """
+    Shrink a forest to the smallest prefix of trees within a tolerance.
+
+    The trees of a random forest are fitted independently, so any
+    prefix of them is a smaller random forest. The R2 score of every
+    prefix is computed from a single pass of each tree over the
+    training set, each row being predicted only by the trees which did
+    not draw it in their bootstrap sample.
+
+    Args:
+        model (RandomForestRegressor): The forest trained on the set.
+        X_train (pd.DataFrame): Training set features.
+        y_train (pd.Series): Training set target.
+        r2_tolerance (float): Largest allowed loss of R2 score.
+
+    Returns:
+        RandomForestRegressor: The smallest forest within the tolerance.
+
+    Raises:
+        ValueError: If the trees were not fitted on bootstrap samples
+            of the whole training set.
+    """
+    if not model.bootstrap or model.max_samples is not None:
+        raise ValueError('Distillation needs full bootstrap samples!')
+    logger.info(f'distilling the forest within an R2 loss of {r2_tolerance}')
+    prefix_scores = _prefix_scores(model, X_train.to_numpy(), y_train)
+    full_score = prefix_scores[-1]
+    n_trees = int(np.argmax(prefix_scores >= full_score - r2_tolerance)) + 1
+    distilled = copy.copy(model)
+    distilled.estimators_ = model.estimators_[:n_trees]
+    distilled.n_estimators = n_trees
+    distilled_score = prefix_scores[n_trees - 1]
+    logger.info(
+        f'distilled {model.n_estimators} -> {n_trees} trees, '
+        f'out-of-bag R2 {full_score:.4f} -> {distilled_score:.4f}',
+    )
+    _log_latency(model, distilled, X_train)
+    return distilled
+
+
+def _prefix_scores(
+    model: RandomForestRegressor,
+    features: np.ndarray,
+    target: pd.Series,
+) -> np.ndarray:
+    """
+    Compute the out-of-bag R2 score of every prefix of a forest.
+
+    The score of a prefix covers the rows left out of the bootstrap
+    sample of at least one of its trees.
+
+    Args:
+        model (RandomForestRegressor): The trained forest.
+        features (np.ndarray): Training set features.
+        target (pd.Series): Training set target.
+
+    Returns:
+        np.ndarray: The R2 score of the first 1, 2, ... trees.
+    """
+    out_of_bag = np.stack([
+        _out_of_bag(tree, len(target)) for tree in model.estimators_
+    ])
+    tree_predictions = np.stack([
+        tree.predict(features) for tree in model.estimators_
+    ])
+    prefix_sums = np.cumsum(tree_predictions * out_of_bag, axis=0)
+    prefix_counts = np.cumsum(out_of_bag, axis=0)
+    target = target.to_numpy()
+    prefix_scores = []
+    for sums, counts in zip(prefix_sums, prefix_counts):
+        covered = counts > 0
+        prefix_scores.append(
+            r2_score(target[covered], sums[covered] / counts[covered]),
+        )
+    return np.array(prefix_scores)
+
+
+def _out_of_bag(tree: DecisionTreeRegressor, n_samples: int) -> np.ndarray:
+    """
+    Find the rows left out of the bootstrap sample of a tree.
+
+    The forest draws the sample of every tree from the random state it
+    gives the tree, so the same draw is repeated here.
+
+    Args:
+        tree (DecisionTreeRegressor): A tree of the forest.
+        n_samples (int): Number of rows the forest was fitted on.
+
+    Returns:
+        np.ndarray: Whether each row was left out of the sample.
+    """
+    random_state = np.random.RandomState(tree.random_state)
+    sample = random_state.randint(0, n_samples, n_samples)
+    return np.bincount(sample, minlength=n_samples) == 0
+
+
+def _log_latency(
+    model: RandomForestRegressor,
+    distilled: RandomForestRegressor,
+    features: pd.DataFrame,
+) -> None:
+    """
+    Log the single-row prediction latency of both forests.
+
+    Args:
+        model (RandomForestRegressor): The full forest.
+        distilled (RandomForestRegressor): The distilled forest.
+        features (pd.DataFrame): Rows of features to predict.
+    """
+    single_row = features.iloc[:1]
+    latency = predict_latency(model, single_row)
+    distilled_latency = predict_latency(distilled, single_row)
+    logger.info(
+        f'single-row latency {latency:.2f} ms -> '
+        f'{distilled_latency:.2f} ms',
+    )
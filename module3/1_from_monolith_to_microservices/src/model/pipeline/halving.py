@@ -0,0 +1,244 @@
+"""
+This module provides a budgeted successive-halving search of the forest.
+
+It includes a function to evaluate many candidates on small forests and
+to promote only the most promising third of them to three times more
+trees in every round, growing the forests of the promoted candidates
+instead of refitting them, and the SearchBudget class, which bounds
+the wall-clock or CPU time of the search.
+"""
+
+import math
+import time
+from collections.abc import Iterator
+from typing import Literal
+
+from joblib import Parallel, delayed
+from loguru import logger
+from sklearn.base import RegressorMixin, clone
+from sklearn.model_selection import ParameterGrid
+
+from model.pipeline import warm_start
+
+ETA = 3
+MIN_TREES = 10
+
+
+class SearchBudget:
+    """
+    A wall-clock or CPU-time budget of a search.
+
+    The CPU time is the time of all threads of the process.
+
+    Attributes:
+        seconds: Seconds the search may take, unlimited if not positive.
+        clock: Clock the budget is measured on, wall or cpu.
+
+    Methods:
+        __init__: Constructor that initializes the SearchBudget.
+        spent: Returns the seconds spent since the budget was created.
+        exhausted: Returns whether the budget is spent.
+    """
+
+    def __init__(self, seconds: float, clock: Literal['wall', 'cpu']) -> None:
+        """
+        Initialize the SearchBudget, starting its clock.
+
+        Args:
+            seconds (float): Seconds the search may take.
+            clock (str): Clock the budget is measured on, wall or cpu.
+        """
+        self.seconds = seconds
+        self.clock = clock
+        self._started = self._now()
+
+    def spent(self) -> float:
+        """
+        Return the seconds spent since the budget was created.
+
+        Returns:
+            float: The seconds spent on the clock of the budget.
+        """
+        return self._now() - self._started
+
+    def exhausted(self) -> bool:
+        """
+        Return whether the budget is spent.
+
+        Returns:
+            bool: Whether a positive budget is spent.
+        """
+        return 0 < self.seconds <= self.spent()
+
+    def _now(self) -> float:
+        """
+        Read the clock of the budget.
+
+        Returns:
+            float: The current time on the clock, in seconds.
+        """
+        if self.clock == 'cpu':
+            return time.process_time()
+        return time.perf_counter()
+
+
+def halving_search(
+    estimator: RegressorMixin,
+    param_space: dict,
+    folds: list[tuple[tuple, tuple]],
+    budget: SearchBudget,
+) -> list[dict]:
+    """
+    Search a parameter space with budgeted successive halving.
+
+    The number of trees is the resource: every combination of the
+    other parameters starts on small forests, and after every round the
+    best third by mean R2 over the folds is promoted to three times
+    more trees, up to the largest `n_estimators` of the space. Forests
+    are warm-started per candidate and fold, so promoted candidates
+    only grow the missing trees; the fits share the forests in memory
+    and must run with the threading joblib backend.
+
+    Once the budget is spent no new candidate is started, and the
+    search ends with the round in progress.
+
+    Args:
+        estimator (RegressorMixin): The forest regressor to search.
+        param_space (dict): Values of every parameter.
+        folds (list[tuple[tuple, tuple]]): The cross-validation folds.
+        budget (SearchBudget): Time budget of the search.
+
+    Returns:
+        list[dict]: A trial per candidate and round, in search order.
+    """
+    candidates = list(ParameterGrid(warm_start.other_params(param_space)))
+    forests = [
+        [clone(estimator).set_params(**candidate) for _ in folds]
+        for candidate in candidates
+    ]
+    survivors = list(range(len(candidates)))
+    trials = []
+    max_trees = max(param_space[warm_start.N_ESTIMATORS])
+    for rung, forest_size in enumerate(_rung_sizes(max_trees, len(forests))):
+        rung_trials = _run_rung(
+            rung,
+            forest_size,
+            [(candidates[index], forests[index]) for index in survivors],
+            folds,
+            budget,
+        )
+        trials.extend(rung_trials)
+        if budget.exhausted():
+            logger.warning(f'search budget spent in round {rung}')
+            break
+        survivors = _promoted(survivors, rung_trials)
+    return trials
+
+
+def _run_rung(
+    rung: int,
+    forest_size: int,
+    candidates: list[tuple[dict, list]],
+    folds: list[tuple[tuple, tuple]],
+    budget: SearchBudget,
+) -> list[dict]:
+    """
+    Grow and score the forests of the candidates of a round.
+
+    Args:
+        rung (int): Number of the round.
+        forest_size (int): Number of trees of the round.
+        candidates (list): Parameters and fold forests of the candidates.
+        folds (list[tuple[tuple, tuple]]): The cross-validation folds.
+        budget (SearchBudget): Time budget of the search.
+
+    Returns:
+        list[dict]: The trials of the evaluated candidates, a prefix of
+            the candidates if the budget ran out.
+    """
+    n_candidates = len(candidates)
+    logger.info(
+        f'round {rung}: {n_candidates} candidates on {forest_size} trees',
+    )
+    fold_scores = Parallel()(
+        delayed(warm_start.grow_forest)(forest, forest_size, *fold)
+        for forest, fold in _rung_tasks(candidates, folds, budget)
+    )
+    n_folds = len(folds)
+    evaluated = candidates[:len(fold_scores) // n_folds]
+    return [
+        warm_start.make_trial(
+            rung,
+            {**candidate, warm_start.N_ESTIMATORS: forest_size},
+            fold_scores[position * n_folds:(position + 1) * n_folds],
+        )
+        for position, (candidate, _) in enumerate(evaluated)
+    ]
+
+
+def _rung_sizes(max_trees: int, n_candidates: int) -> list[int]:
+    """
+    Plan the number of trees of every round.
+
+    There are enough rounds to narrow the candidates down to a few,
+    as long as the first round keeps at least `MIN_TREES` trees.
+
+    Args:
+        max_trees (int): Number of trees of the last round.
+        n_candidates (int): Number of candidates of the first round.
+
+    Returns:
+        list[int]: The increasing number of trees of every round.
+    """
+    n_rungs = 1
+    while ETA ** n_rungs < n_candidates:
+        if max_trees // ETA ** n_rungs < MIN_TREES:
+            break
+        n_rungs += 1
+    return [
+        max_trees // ETA ** (n_rungs - 1 - rung) for rung in range(n_rungs)
+    ]
+
+
+def _rung_tasks(
+    candidates: list[tuple[dict, list]],
+    folds: list[tuple[tuple, tuple]],
+    budget: SearchBudget,
+) -> Iterator[tuple[RegressorMixin, tuple]]:
+    """
+    Yield the fits of a round while the budget lasts.
+
+    All folds of a candidate are yielded together, and at least the
+    first candidate of every round is.
+
+    Args:
+        candidates (list): Parameters and fold forests of the candidates.
+        folds (list[tuple[tuple, tuple]]): The cross-validation folds.
+        budget (SearchBudget): Time budget of the search.
+
+    Yields:
+        tuple[RegressorMixin, tuple]: A forest and its fold.
+    """
+    for position, (_, fold_forests) in enumerate(candidates):
+        if position and budget.exhausted():
+            return
+        yield from zip(fold_forests, folds)
+
+
+def _promoted(evaluated: list[int], rung_trials: list[dict]) -> list[int]:
+    """
+    Pick the best third of the candidates of a round.
+
+    Args:
+        evaluated (list[int]): Indices of the evaluated candidates.
+        rung_trials (list[dict]): Their trials, in the same order.
+
+    Returns:
+        list[int]: Indices of the promoted candidates, best first.
+    """
+    ranking = sorted(
+        zip(evaluated, rung_trials),
+        key=lambda evaluation: -evaluation[1]['mean_score'],
+    )
+    n_promoted = math.ceil(len(ranking) / ETA)
+    return [index for index, _ in ranking[:n_promoted]]
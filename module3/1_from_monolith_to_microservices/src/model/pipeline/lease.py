@@ -0,0 +1,78 @@
+"""
+This module provides the renewal of the leases of running trials.
+
+It includes the LeaseHeartbeat class, which renews a lease at a fixed
+interval in a background thread for as long as the work holding it
+runs, so that a slow fit is not mistaken for a crashed one and claimed
+again by another worker.
+"""
+
+import threading
+from collections.abc import Callable
+from typing import Any
+
+
+class LeaseHeartbeat(threading.Thread):
+    """
+    A background thread renewing a lease until its work is done.
+
+    It is used as a context manager around the work holding the lease,
+    and stops once the work is done or the lease could not be renewed.
+
+    Attributes:
+        interval: Seconds between two renewals.
+        renew: Renews the lease, returning whether it is still held.
+        renew_args: Arguments of every call to `renew`.
+
+    Methods:
+        __init__: Constructor that initializes the LeaseHeartbeat.
+        run: Renews the lease until stopped.
+        __enter__: Starts the renewals.
+        __exit__: Stops the renewals.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        renew: Callable[..., bool],
+        *renew_args: Any,
+    ) -> None:
+        """
+        Initialize the LeaseHeartbeat.
+
+        Args:
+            interval (float): Seconds between two renewals.
+            renew (Callable[..., bool]): Renews the lease.
+            renew_args (Any): Arguments of every call to `renew`.
+        """
+        super().__init__(name='lease-heartbeat', daemon=True)
+        self.interval = interval
+        self.renew = renew
+        self.renew_args = renew_args
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        """Renew the lease every interval until stopped or lost."""
+        while not self._stopped.wait(self.interval):
+            if not self.renew(*self.renew_args):
+                return
+
+    def __enter__(self) -> 'LeaseHeartbeat':
+        """
+        Start renewing the lease.
+
+        Returns:
+            LeaseHeartbeat: The started heartbeat.
+        """
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """
+        Stop renewing the lease.
+
+        Args:
+            exc_info (Any): The exception raised by the work, if any.
+        """
+        self._stopped.set()
+        self.join()
@@ -2,19 +2,26 @@
 This module creates the pipeline for building, training and saving ML model.
 
 It includes the process of data preparation, model training using
-RandomForestRegressor, hyperparameter tuning with GridSearchCV,
-model evaluation, and serialization of the trained model.
+RandomForestRegressor, parallel hyperparameter tuning with GridSearchCV,
+optional distillation to fewer trees, model evaluation, and
+serialization of the trained model, optionally into the versioned
+model registry.
 """
 
+import hashlib
 import pickle as pk
 
 import pandas as pd
 from loguru import logger
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import GridSearchCV, train_test_split
+from sklearn.model_selection import train_test_split
 
 from config import model_settings
+from model import registry
+from model.pipeline.benchmark import predict_latency
+from model.pipeline.distillation import distill_forest
 from model.pipeline.preparation import prepare_data
+from model.pipeline.search import search_forest, split_seed
 
 
 def build_model() -> None:
@@ -25,8 +32,11 @@ def build_model() -> None:
     It starts by preparing the data, followed by defining deature names
     and splitting the dataset into features and target variables.
     The dataset is then divided into training and testing sets.
-    The model's performance is evaluated on the test set, and
-    finally, the model is saved for future use.
+    If distillation is enabled, the model is shrunk to the fewest trees
+    within the out-of-bag R2 tolerance on the training set. The model's
+    performance is then evaluated on the test set, and finally, the
+    model is saved for future use, together with its metadata if the
+    registry is enabled.
 
     Return:
         None
@@ -56,12 +66,19 @@ def build_model() -> None:
         X_train,
         y_train,
     )
-    _evaluate_model(
+    if model_settings.distillation_enabled:
+        rf = distill_forest(
+            rf,
+            X_train,
+            y_train,
+            r2_tolerance=model_settings.distillation_r2_tolerance,
+        )
+    score = _evaluate_model(
         rf,
         X_test,
         y_test,
     )
-    _save_model(rf)
+    _save_model(rf, _model_metadata(rf, df, X_test, score))
 
 
 def _get_x_y(
@@ -91,6 +108,10 @@ def _split_train_test(
     """
     Split the data into training and testing sets.
 
+    The split is seeded by `split_seed`, or by the seed recorded in the
+    trial store, so that the runs resuming or sharing a search through
+    the store train on the same rows.
+
     Args:
         features (pd.DataFrame): Features dataset.
         target (pd.Series): Target variable.
@@ -103,6 +124,7 @@ def _split_train_test(
         features,
         target,
         test_size=0.2,  # noqa: WPS432
+        random_state=split_seed(),
     )
 
 
@@ -118,26 +140,10 @@ def _train_model(
         y_train (pd.Series): Training set target.
 
     Returns:
-        RandomForestRegressor: The best estimator after GridSearch.
+        RandomForestRegressor: The best estimator of the search.
     """
     logger.info('training a model with hyperparameters')
-    grid_space = {
-        'n_estimators': [100, 200, 300],
-        'max_depth': [3, 6, 9, 12],
-    }
-
-    logger.debug(f'grid_space = {grid_space}')
-    grid = GridSearchCV(
-        RandomForestRegressor(),
-        param_grid=grid_space,
-        cv=5,
-        scoring='r2',
-    )
-    model_grid = grid.fit(
-        X_train,
-        y_train,
-    )
-    return model_grid.best_estimator_
+    return search_forest(X_train, y_train)
 
 
 def _evaluate_model(
@@ -164,16 +170,54 @@ def _evaluate_model(
     return model_score
 
 
-def _save_model(model: RandomForestRegressor) -> None:
+def _model_metadata(
+    model: RandomForestRegressor,
+    dataframe: pd.DataFrame,
+    X_test: pd.DataFrame,
+    score: float,
+) -> dict:
+    """
+    Describe a trained model for the model registry.
+
+    Args:
+        model (RandomForestRegressor): The trained model.
+        dataframe (pd.DataFrame): The dataset the model was built from.
+        X_test (pd.DataFrame): Testing set features.
+        score (float): The model's score on the testing set.
+
+    Returns:
+        dict: The score, parameters, features, hash of the training
+            data and single-row latency of the model.
+    """
+    data_hash = hashlib.sha256(
+        pd.util.hash_pandas_object(dataframe).to_numpy().tobytes(),
+    ).hexdigest()
+    return {
+        'score': score,
+        'params': model.get_params(),
+        'features': list(X_test.columns),
+        'training_data_hash': data_hash,
+        'latency_ms': predict_latency(model, X_test.iloc[:1]),
+    }
+
+
+def _save_model(model: RandomForestRegressor, metadata: dict) -> None:
     """
     Save the trained model to a specified directory.
 
+    With the registry enabled, the model is registered as a new
+    immutable version instead of overwriting the model file.
+
     Args:
         model (RandomForestRegressor): The model to save.
+        metadata (dict): Metadata describing the model.
 
     Return:
         None
     """
+    if model_settings.registry_enabled:
+        registry.register_model(pk.dumps(model), metadata)
+        return
     model_path = f'{model_settings.model_path}/{model_settings.model_name}'
     logger.info(f'saving a model to a directory: {model_path}')
     with open(model_path, 'wb') as model_file:
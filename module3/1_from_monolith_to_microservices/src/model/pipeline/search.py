@@ -0,0 +1,262 @@
+"""
+This module provides the hyperparameter search of the forest.
+
+It includes a function to run the grid search of the
+RandomForestRegressor in parallel, with the fits of the candidates and
+folds spread over outer threads and the trees of every forest over
+inner threads, within a thread budget of the available cores. The wall
+time and CPU utilisation of every search are logged.
+
+The `grid` search mode fits every candidate with GridSearchCV, the
+`warm_start` mode grows the forest sizes of a candidate incrementally
+(`model.pipeline.warm_start`), the `oob` mode does the same on a single
+fold of all training data scored by the out-of-bag R2 of the forest,
+and the `halving` mode searches a larger space with budgeted successive
+halving (`model.pipeline.halving`). With a trial store, the `grid`
+mode records every fit in a SQLite file shared by the runs of the same
+search (`model.pipeline.trial_store`), which also shares the seed of
+their train/test split. The trials of every search are
+saved as a trace (`model.pipeline.search_trace`).
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import joblib
+import pandas as pd
+from loguru import logger
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import GridSearchCV
+
+from config import model_settings
+from model.pipeline import halving, search_trace, trial_store, warm_start
+
+GRID_SPACE = {  # noqa: WPS407
+    'n_estimators': [100, 200, 300],
+    'max_depth': [3, 6, 9, 12],
+}
+HALVING_SPACE = {  # noqa: WPS407
+    **GRID_SPACE,
+    'min_samples_leaf': [1, 3, 10],
+    'max_features': [1.0, 0.5],
+}
+CV_FOLDS = 5
+
+
+def search_forest(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+) -> RandomForestRegressor:
+    """
+    Find the best RandomForestRegressor with a parallel grid search.
+
+    The outer threads fit the candidate and fold combinations, and the
+    inner threads the trees of each forest. Forests release the GIL
+    while growing trees, so threads share the training data instead of
+    copying it to worker processes, and the CPU time of the process
+    accounts for all of them. The best candidate is then refitted alone,
+    with the trees of the forest spread over the whole thread budget.
+
+    Args:
+        X_train (pd.DataFrame): Training set features.
+        y_train (pd.Series): Training set target.
+
+    Returns:
+        RandomForestRegressor: The best estimator, refitted on all data.
+    """
+    outer_jobs, inner_jobs = thread_budget(
+        model_settings.search_n_jobs, model_settings.forest_n_jobs,
+    )
+    logger.debug(f'grid_space = {GRID_SPACE}')
+    estimator = RandomForestRegressor(n_jobs=inner_jobs)
+    timing = {'threads': outer_jobs * inner_jobs}
+    with timed_search(model_settings.search_mode, timing):
+        with joblib.parallel_backend('threading', n_jobs=outer_jobs):
+            trials = _search(estimator, X_train, y_train)
+    best_trial = _best_trial(trials)
+    logger.info(
+        f'best parameters {best_trial["params"]} '
+        f'with mean R2={best_trial["mean_score"]:.4f}',
+    )
+    search_trace.save_trace(trials, best_trial, timing, split_seed())
+    best_model = clone(estimator).set_params(
+        **best_trial['params'], n_jobs=timing['threads'],
+    )
+    best_model.fit(X_train, y_train)
+    return best_model.set_params(n_jobs=None)
+
+
+def _search(
+    estimator: RandomForestRegressor,
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+) -> list[dict]:
+    """
+    Run the search of the configured search mode.
+
+    Args:
+        estimator (RandomForestRegressor): The forest to search.
+        X_train (pd.DataFrame): Training set features.
+        y_train (pd.Series): Training set target.
+
+    Returns:
+        list[dict]: The trials of the search.
+    """
+    store_path = model_settings.trial_store_path
+    if model_settings.search_mode == 'grid' and not store_path:
+        return _grid_trials(estimator, X_train, y_train)
+    if model_settings.search_mode == 'oob':
+        return warm_start.warm_start_search(
+            clone(estimator).set_params(oob_score=True),
+            GRID_SPACE,
+            [((X_train, y_train), None)],
+        )
+    folds = warm_start.split_folds(CV_FOLDS, X_train, y_train)
+    if model_settings.search_mode == 'halving':
+        budget = halving.SearchBudget(
+            model_settings.search_budget_seconds,
+            model_settings.search_budget_clock,
+        )
+        return halving.halving_search(estimator, HALVING_SPACE, folds, budget)
+    if model_settings.search_mode == 'grid':
+        store = trial_store.TrialStore(
+            store_path,
+            trial_store.search_key(GRID_SPACE, CV_FOLDS, X_train, y_train),
+            model_settings.trial_lease_seconds,
+        )
+        return trial_store.stored_grid_search(
+            estimator, GRID_SPACE, folds, store,
+        )
+    return warm_start.warm_start_search(estimator, GRID_SPACE, folds)
+
+
+def _grid_trials(
+    estimator: RandomForestRegressor,
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+) -> list[dict]:
+    """
+    Fit every candidate of the grid with GridSearchCV.
+
+    Args:
+        estimator (RandomForestRegressor): The forest to search.
+        X_train (pd.DataFrame): Training set features.
+        y_train (pd.Series): Training set target.
+
+    Returns:
+        list[dict]: A trial per candidate, in the order of the grid.
+    """
+    grid = GridSearchCV(
+        estimator,
+        param_grid=GRID_SPACE,
+        cv=CV_FOLDS,
+        scoring='r2',
+        refit=False,
+    )
+    grid.fit(X_train, y_train)
+    cv_results = grid.cv_results_
+    return [
+        warm_start.make_trial(0, candidate, [
+            cv_results[f'split{fold}_test_score'][index]
+            for fold in range(CV_FOLDS)
+        ])
+        for index, candidate in enumerate(cv_results['params'])
+    ]
+
+
+def _best_trial(trials: list[dict]) -> dict:
+    """
+    Pick the best trial of the last round of a search.
+
+    The first trial wins a tie, like in GridSearchCV.
+
+    Args:
+        trials (list[dict]): The trials of the search.
+
+    Returns:
+        dict: The trial with the best mean R2 of the last round.
+    """
+    last_rung = max(trial['rung'] for trial in trials)
+    return max(
+        (trial for trial in trials if trial['rung'] == last_rung),
+        key=lambda trial: trial['mean_score'],
+    )
+
+
+def split_seed() -> int | None:
+    """
+    Get the seed of the train/test split.
+
+    Without `split_seed`, runs sharing a trial store use the seed
+    recorded in the store, so that a restarted or distributed search
+    splits the same training rows and resumes the recorded fits.
+
+    Returns:
+        int | None: The seed, None for a random split.
+    """
+    if model_settings.split_seed is not None:
+        return model_settings.split_seed
+    if not model_settings.trial_store_path:
+        return None
+    shared_seed = trial_store.shared_split_seed(
+        model_settings.trial_store_path,
+    )
+    logger.info(f'splitting with the seed {shared_seed} of the trial store')
+    return shared_seed
+
+
+def thread_budget(outer_jobs: int, inner_jobs: int) -> tuple[int, int]:
+    """
+    Cap the outer and inner parallelism to the available cores.
+
+    A value below 1 uses all cores for the outer level, and the cores
+    left per outer thread for the inner level. Their product never
+    exceeds the number of cores.
+
+    Args:
+        outer_jobs (int): Requested threads across candidate fits.
+        inner_jobs (int): Requested threads per forest.
+
+    Returns:
+        tuple[int, int]: The outer and inner number of threads.
+    """
+    cores = joblib.cpu_count()
+    outer_threads = cores if outer_jobs < 1 else min(outer_jobs, cores)
+    inner_budget = max(cores // outer_threads, 1)
+    inner_threads = inner_budget if inner_jobs < 1 else inner_jobs
+    inner_threads = min(inner_threads, inner_budget)
+    if (outer_threads, inner_threads) != (outer_jobs, inner_jobs):
+        logger.info(
+            f'{cores} cores: running {outer_threads} outer threads '
+            f'x {inner_threads} inner threads',
+        )
+    return outer_threads, inner_threads
+
+
+@contextmanager
+def timed_search(label: str, timing: dict) -> Iterator[None]:
+    """
+    Log the wall time and CPU utilisation of a search.
+
+    Args:
+        label (str): Name of the search.
+        timing (dict): Threads of the search, completed with its times.
+
+    Yields:
+        None: Control to the timed search.
+    """
+    threads = timing['threads']
+    started_wall = time.perf_counter()
+    started_cpu = time.process_time()
+    yield
+    wall_seconds = time.perf_counter() - started_wall
+    cpu_seconds = time.process_time() - started_cpu
+    timing.update(wall_seconds=wall_seconds, cpu_seconds=cpu_seconds)
+    utilisation = cpu_seconds / (wall_seconds * threads)
+    logger.info(
+        f'{label} search took {wall_seconds:.1f}s wall, '
+        f'{cpu_seconds:.1f}s CPU on {threads} threads '
+        f'({utilisation:.0%} utilisation)',
+    )
@@ -0,0 +1,251 @@
+"""
+This module provides the traces of the hyperparameter searches.
+
+It includes a function to save every trial of a search, with the
+chosen candidate, the budget, the timing and the seed of the train/test
+split of the search, as a JSON
+file next to the models:
+
+    <model_path>/search_traces/<model_name>_<search_mode>_<time>.json
+
+and functions to load the latest trace of a search mode and to compare
+the selection of a search with a reference search.
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+from loguru import logger
+from sklearn.ensemble import RandomForestRegressor
+
+from config import model_settings
+from model.pipeline import warm_start
+
+TIME_FORMAT = '%Y%m%dT%H%M%S'  # noqa: WPS323
+SEARCH_MODE = 'search_mode'
+BEST_TRIAL = 'best_trial'
+CANDIDATE_PARAMS = 'params'
+SPLIT_SEED = 'split_seed'
+N_ESTIMATORS = 'n_estimators'
+TRIALS = 'trials'
+
+
+def save_trace(
+    trials: list[dict],
+    best_trial: dict,
+    timing: dict,
+    split_seed: int | None,
+) -> Path:
+    """
+    Save the trace of a search.
+
+    Args:
+        trials (list[dict]): The trials of the search.
+        best_trial (dict): The chosen trial.
+        timing (dict): Threads, wall and CPU seconds of the search.
+        split_seed (int | None): Seed of the train/test split, if any.
+
+    Returns:
+        Path: The file of the trace.
+    """
+    created_at = datetime.now(timezone.utc)
+    search_mode = model_settings.search_mode
+    trace_time = created_at.strftime(TIME_FORMAT)
+    trace_name = f'{model_settings.model_name}_{search_mode}_{trace_time}'
+    trace_path = Path(model_settings.model_path) / 'search_traces' / (
+        f'{trace_name}.json'
+    )
+    trace_path.parent.mkdir(exist_ok=True)
+    trace_path.write_text(json.dumps(
+        {
+            SEARCH_MODE: search_mode,
+            'created_at': created_at.isoformat(),
+            'budget': {
+                'seconds': model_settings.search_budget_seconds,
+                'clock': model_settings.search_budget_clock,
+            },
+            'timing': timing,
+            SPLIT_SEED: split_seed,
+            BEST_TRIAL: best_trial,
+            TRIALS: trials,
+        },
+        indent=2,
+    ))
+    n_trials = len(trials)
+    logger.info(f'saved the trace of {n_trials} trials to {trace_path}')
+    return trace_path
+
+
+def latest_trace(search_mode: str) -> dict:
+    """
+    Load the latest trace of a search mode.
+
+    Args:
+        search_mode (str): The search mode.
+
+    Returns:
+        dict: The latest trace of the search mode.
+
+    Raises:
+        FileNotFoundError: If the search mode has no trace.
+    """
+    trace_paths = sorted(
+        (Path(model_settings.model_path) / 'search_traces').glob(
+            f'{model_settings.model_name}_{search_mode}_*.json',
+        ),
+    )
+    if not trace_paths:
+        raise FileNotFoundError(f'No trace of the {search_mode} search!')
+    return json.loads(trace_paths[-1].read_text())
+
+
+def compare_traces(trace: dict, reference: dict) -> dict:
+    """
+    Compare the selection of a search with a reference search.
+
+    Both searches must have searched the same training rows, so their
+    traces must record the same split seed. The candidates of both
+    searches are matched by their parameters. When either search is a
+    halving search, which varies the number of trees by round, the
+    number of trees is left out and each candidate is scored by its
+    best number of trees in its latest round. A parameter searched by
+    only one of the searches, such as `min_samples_leaf` in the halving
+    space, is set to its default in the candidates of the other, which
+    left it at that default.
+
+    Args:
+        trace (dict): Trace of the search to assess.
+        reference (dict): Trace of the reference search, such as grid.
+
+    Returns:
+        dict: The selections and CPU time of both searches, the score,
+            rank and regret of the selection under the reference, the
+            rank correlation of the scores of the matched candidates,
+            and the matched candidates with both scores.
+
+    Raises:
+        ValueError: If the split seeds are unknown or differ.
+    """
+    split_seed = trace.get(SPLIT_SEED)
+    if split_seed is None or split_seed != reference.get(SPLIT_SEED):
+        raise ValueError(
+            'Traces must record the same split seed, set SPLIT_SEED!',
+        )
+    param_names = _searched_params(trace) | _searched_params(reference)
+    trials = trace[TRIALS] + reference[TRIALS]
+    if not any(trial['rung'] for trial in trials):
+        param_names.add(N_ESTIMATORS)
+    scores = _trial_scores(trace, param_names)
+    reference_scores = _trial_scores(reference, param_names)
+    matched = [key for key in scores if key in reference_scores]
+    ranking = sorted(reference_scores, key=reference_scores.get, reverse=True)
+    selected = _params_key(trace[BEST_TRIAL][CANDIDATE_PARAMS], param_names)
+    report = {
+        SEARCH_MODE: trace[SEARCH_MODE],
+        'reference_mode': reference[SEARCH_MODE],
+        'selected': trace[BEST_TRIAL][CANDIDATE_PARAMS],
+        'reference_selected': reference[BEST_TRIAL][CANDIDATE_PARAMS],
+        'cpu_seconds': trace['timing']['cpu_seconds'],
+        'reference_cpu_seconds': reference['timing']['cpu_seconds'],
+        'rank_correlation': _rank_correlation(
+            [scores[key] for key in matched],
+            [reference_scores[key] for key in matched],
+        ),
+        'candidates': [
+            {
+                CANDIDATE_PARAMS: dict(key),
+                'score': scores[key],
+                'reference_score': reference_scores[key],
+            }
+            for key in matched
+        ],
+    }
+    selected_score = reference_scores.get(selected)
+    if selected_score is not None:
+        report.update(
+            reference_score_of_selected=selected_score,
+            reference_rank_of_selected=ranking.index(selected) + 1,
+            regret=reference_scores[ranking[0]] - selected_score,
+        )
+    return report
+
+
+def _rank_correlation(
+    scores: list[float],
+    reference_scores: list[float],
+) -> float | None:
+    """
+    Compute the Spearman correlation of the scores of two searches.
+
+    Args:
+        scores (list[float]): Scores of the matched candidates.
+        reference_scores (list[float]): Their reference scores.
+
+    Returns:
+        float | None: The rank correlation, None if undefined.
+    """
+    correlation = pd.Series(scores).corr(
+        pd.Series(reference_scores), method='spearman',
+    )
+    return None if pd.isna(correlation) else float(correlation)
+
+
+def _searched_params(trace: dict) -> set[str]:
+    """
+    Collect the names of the parameters searched besides the trees.
+
+    Args:
+        trace (dict): Trace of the search.
+
+    Returns:
+        set[str]: The parameter names of its candidates.
+    """
+    return {
+        name
+        for trial in trace[TRIALS]
+        for name in warm_start.other_params(trial[CANDIDATE_PARAMS])
+    }
+
+
+def _trial_scores(
+    trace: dict,
+    param_names: set[str],
+) -> dict[tuple, float]:
+    """
+    Collect the mean scores of the trials of a search.
+
+    Args:
+        trace (dict): Trace of the search.
+        param_names (set[str]): Parameters to key the candidates on.
+
+    Returns:
+        dict[tuple, float]: Best mean score of the latest round of every
+            candidate, keyed by its sorted parameters.
+    """
+    trials = sorted(trace[TRIALS], key=lambda trial: (
+        trial['rung'], trial['mean_score'],
+    ))
+    return {
+        _params_key(trial[CANDIDATE_PARAMS], param_names): trial['mean_score']
+        for trial in trials
+    }
+
+
+def _params_key(candidate: dict, param_names: set[str]) -> tuple:
+    """
+    Key a candidate independently of the order of its parameters.
+
+    Args:
+        candidate (dict): Parameters of the candidate.
+        param_names (set[str]): Parameters to key on, default if unset.
+
+    Returns:
+        tuple: The sorted parameters of the candidate.
+    """
+    default_params = RandomForestRegressor().get_params()
+    return tuple(sorted(
+        (name, candidate.get(name, default_params[name]))
+        for name in param_names
+    ))
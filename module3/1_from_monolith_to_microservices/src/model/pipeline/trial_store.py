@@ -0,0 +1,387 @@
+"""
+This module provides a shared, resumable store of search trials.
+
+It includes the TrialStore class, which records the fit of every
+candidate on every fold in a SQLite file, and a function to run a grid
+search through the store. Any number of threads, processes, and hosts
+sharing the file claim the pending fits one at a time, and a restarted
+search only runs the fits which are not done yet. A worker renews the
+lease of its fit while fitting it (`model.pipeline.lease`), and only
+records its score while it still holds the lease. The store also keeps
+the seed of the train/test split shared by the runs using it, so that
+they all search the same training rows.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import time
+
+import joblib
+import pandas as pd
+from loguru import logger
+from sklearn.base import RegressorMixin, clone
+from sklearn.model_selection import ParameterGrid
+
+from model.pipeline import lease, warm_start
+
+POLL_SECONDS = 5
+LOCK_TIMEOUT_SECONDS = 60
+SEED_BYTES = 4
+DONE = 'done'
+KEY_LENGTH = 16
+RENEWALS_PER_LEASE = 3
+
+
+class TrialStore:
+    """
+    A SQLite store of the fits of a search, shared across processes.
+
+    A fit is pending, running, or done with its score. A fit is claimed
+    in an immediate transaction, so no two workers claim the same fit,
+    and a running fit whose lease has expired, because its worker
+    crashed or was preempted, can be claimed again. The worker holding
+    a fit renews its lease while fitting it, and a score is only
+    recorded by the worker still holding the lease, so a fit claimed
+    again is not recorded twice. Every operation uses its own
+    connection, so a store can be used from any thread.
+
+    Attributes:
+        path: The SQLite file of the store.
+        search_key: Identity of the search, shared by its workers.
+        lease_seconds: Seconds after which a running fit is reclaimed.
+
+    Methods:
+        __init__: Constructor that initializes the TrialStore.
+        add: Adds the fits of a search, keeping the recorded ones.
+        claim: Claims a pending or expired fit.
+        renew: Renews the lease of a claimed fit.
+        complete: Records the score of a claimed fit.
+        scores: Returns the scores of the done fits.
+        remaining: Counts the fits which are not done.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        search_key: str,
+        lease_seconds: float,
+    ) -> None:
+        """
+        Initialize the TrialStore, creating its table if needed.
+
+        Args:
+            path (str): The SQLite file of the store.
+            search_key (str): Identity of the search.
+            lease_seconds (float): Seconds before a fit is reclaimed.
+        """
+        self.path = path
+        self.search_key = search_key
+        self.lease_seconds = lease_seconds
+        with _connect(self.path) as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS trials ('
+                'search_key TEXT, candidate TEXT, fold INTEGER, '
+                'status TEXT, worker TEXT, claimed_at REAL, score REAL, '
+                'PRIMARY KEY (search_key, candidate, fold))',
+            )
+
+    def add(self, candidates: list[str], n_folds: int) -> None:
+        """
+        Add the fits of a search, keeping the ones already recorded.
+
+        Args:
+            candidates (list[str]): The JSON parameters of every candidate.
+            n_folds (int): Number of folds of every candidate.
+        """
+        with _connect(self.path) as connection:
+            connection.executemany(
+                'INSERT OR IGNORE INTO trials (search_key, candidate, fold, '
+                "status) VALUES (?, ?, ?, 'pending')",
+                [
+                    (self.search_key, candidate, fold)
+                    for candidate in candidates
+                    for fold in range(n_folds)
+                ],
+            )
+
+    def claim(self, worker: str) -> tuple[str, int] | None:
+        """
+        Claim a pending fit, or a running fit whose lease has expired.
+
+        Args:
+            worker (str): Identity of the claiming worker.
+
+        Returns:
+            tuple[str, int] | None: The JSON parameters of the candidate
+                and the fold to fit, None if there is no fit to claim.
+        """
+        claimed_at = time.time()
+        with _connect(self.path) as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            trial = connection.execute(
+                'SELECT candidate, fold FROM trials WHERE search_key = ? '
+                "AND (status = 'pending' OR (status = 'running' "
+                'AND claimed_at < ?)) ORDER BY rowid LIMIT 1',
+                (self.search_key, claimed_at - self.lease_seconds),
+            ).fetchone()
+            if trial is not None:
+                connection.execute(
+                    "UPDATE trials SET status = 'running', worker = ?, "
+                    'claimed_at = ? WHERE search_key = ? AND candidate = ? '
+                    'AND fold = ?',
+                    (worker, claimed_at, self.search_key, *trial),
+                )
+            connection.execute('COMMIT')
+        return trial
+
+    def renew(self, candidate: str, fold: int, worker: str) -> bool:
+        """
+        Renew the lease of a fit claimed by a worker.
+
+        Args:
+            candidate (str): The JSON parameters of the candidate.
+            fold (int): The fold of the fit.
+            worker (str): Identity of the claiming worker.
+
+        Returns:
+            bool: Whether the worker still held the lease.
+        """
+        renewed_at = time.time()
+        with _connect(self.path) as connection:
+            return connection.execute(
+                'UPDATE trials SET claimed_at = ? WHERE search_key = ? '
+                "AND candidate = ? AND fold = ? AND status = 'running' "
+                'AND worker = ? AND claimed_at >= ?',
+                (
+                    renewed_at,
+                    self.search_key,
+                    candidate,
+                    fold,
+                    worker,
+                    renewed_at - self.lease_seconds,
+                ),
+            ).rowcount > 0
+
+    def complete(
+        self,
+        candidate: str,
+        fold: int,
+        worker: str,
+        score: float,
+    ) -> bool:
+        """
+        Record the score of a fit, if the worker still holds its lease.
+
+        Args:
+            candidate (str): The JSON parameters of the candidate.
+            fold (int): The fold of the fit.
+            worker (str): Identity of the claiming worker.
+            score (float): The R2 score of the fit on its fold.
+
+        Returns:
+            bool: Whether the score was recorded.
+        """
+        with _connect(self.path) as connection:
+            return connection.execute(
+                "UPDATE trials SET status = 'done', score = ? "
+                'WHERE search_key = ? AND candidate = ? AND fold = ? '
+                "AND status = 'running' AND worker = ? AND claimed_at >= ?",
+                (
+                    score,
+                    self.search_key,
+                    candidate,
+                    fold,
+                    worker,
+                    time.time() - self.lease_seconds,
+                ),
+            ).rowcount > 0
+
+    def scores(self) -> dict[tuple[str, int], float]:
+        """
+        Return the scores of the done fits.
+
+        Returns:
+            dict[tuple[str, int], float]: Score by candidate and fold.
+        """
+        with _connect(self.path) as connection:
+            done_trials = connection.execute(
+                'SELECT candidate, fold, score FROM trials '
+                'WHERE search_key = ? AND status = ?',
+                (self.search_key, DONE),
+            ).fetchall()
+        return {
+            (candidate, fold): score for candidate, fold, score in done_trials
+        }
+
+    def remaining(self) -> int:
+        """
+        Count the fits which are not done.
+
+        Returns:
+            int: The number of pending and running fits.
+        """
+        with _connect(self.path) as connection:
+            return connection.execute(
+                'SELECT COUNT(*) FROM trials '
+                'WHERE search_key = ? AND status != ?',
+                (self.search_key, DONE),
+            ).fetchone()[0]
+
+
+def shared_split_seed(path: str) -> int:
+    """
+    Get the split seed of a store, drawing and recording it if needed.
+
+    The first run to ask records a random seed, and every later run,
+    restarted or on another host, reuses it.
+
+    Args:
+        path (str): The SQLite file of the store.
+
+    Returns:
+        int: The seed of the train/test split.
+    """
+    drawn_seed = int.from_bytes(os.urandom(SEED_BYTES), 'little')
+    with _connect(path) as connection:
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS settings '
+            '(name TEXT PRIMARY KEY, setting INTEGER)',
+        )
+        connection.execute(
+            "INSERT OR IGNORE INTO settings VALUES ('split_seed', ?)",
+            (drawn_seed,),
+        )
+        return connection.execute(
+            "SELECT setting FROM settings WHERE name = 'split_seed'",
+        ).fetchone()[0]
+
+
+def search_key(
+    param_grid: dict,
+    n_folds: int,
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+) -> str:
+    """
+    Identify a search by its grid, its folds and its training data.
+
+    Args:
+        param_grid (dict): Values of every parameter.
+        n_folds (int): Number of folds.
+        X_train (pd.DataFrame): Training set features.
+        y_train (pd.Series): Training set target.
+
+    Returns:
+        str: The start of the SHA-256 hash of the search.
+    """
+    search_hash = hashlib.sha256(
+        json.dumps([param_grid, n_folds], sort_keys=True).encode(),
+    )
+    search_hash.update(pd.util.hash_pandas_object(X_train).to_numpy())
+    search_hash.update(pd.util.hash_pandas_object(y_train).to_numpy())
+    return search_hash.hexdigest()[:KEY_LENGTH]
+
+
+def stored_grid_search(
+    estimator: RegressorMixin,
+    param_grid: dict,
+    folds: list[tuple[tuple, tuple]],
+    store: TrialStore,
+) -> list[dict]:
+    """
+    Fit every candidate of a grid on every fold through a trial store.
+
+    As many worker threads as the active joblib backend allows claim
+    and fit the fits of the store until none is left, and then wait for
+    the fits still running in other processes.
+
+    Args:
+        estimator (RegressorMixin): The forest regressor to search.
+        param_grid (dict): Values of every parameter.
+        folds (list[tuple[tuple, tuple]]): The cross-validation folds.
+        store (TrialStore): The store of the fits of the search.
+
+    Returns:
+        list[dict]: A trial per candidate, in the order of the grid.
+    """
+    candidates = [
+        json.dumps(candidate, sort_keys=True)
+        for candidate in ParameterGrid(param_grid)
+    ]
+    store.add(candidates, len(folds))
+    n_remaining = store.remaining()
+    n_fits = len(candidates) * len(folds)
+    logger.info(
+        f'search {store.search_key}: {n_remaining} of {n_fits} fits '
+        f'left in {store.path}',
+    )
+    process = f'{socket.gethostname()}:{os.getpid()}'
+    joblib.Parallel()(
+        joblib.delayed(_work)(estimator, folds, store, f'{process}:{thread}')
+        for thread in range(joblib.effective_n_jobs(None))
+    )
+    fold_scores = store.scores()
+    return [
+        warm_start.make_trial(0, json.loads(candidate), [
+            fold_scores[candidate, fold] for fold in range(len(folds))
+        ])
+        for candidate in candidates
+    ]
+
+
+def _work(
+    estimator: RegressorMixin,
+    folds: list[tuple[tuple, tuple]],
+    store: TrialStore,
+    worker: str,
+) -> None:
+    """
+    Claim and fit the fits of a store until all of them are done.
+
+    Args:
+        estimator (RegressorMixin): The forest regressor to search.
+        folds (list[tuple[tuple, tuple]]): The cross-validation folds.
+        store (TrialStore): The store of the fits of the search.
+        worker (str): Identity of the worker, by host, process and thread.
+    """
+    while True:  # noqa: WPS457
+        trial = store.claim(worker)
+        if trial is None:
+            if not store.remaining():
+                return
+            time.sleep(POLL_SECONDS)
+            continue
+        candidate, fold = trial
+        forest = clone(estimator).set_params(**json.loads(candidate))
+        train, test = folds[fold]
+        heartbeat = lease.LeaseHeartbeat(
+            store.lease_seconds / RENEWALS_PER_LEASE,
+            store.renew,
+            candidate,
+            fold,
+            worker,
+        )
+        with heartbeat:
+            score = forest.fit(*train).score(*test)
+        if store.complete(candidate, fold, worker, score):
+            logger.info(f'fold {fold} of {candidate}: R2={score:.4f}')
+        else:
+            logger.warning(f'fold {fold} of {candidate}: lease lost')
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    """
+    Open a connection to a store in autocommit mode.
+
+    Args:
+        path (str): The SQLite file of the store.
+
+    Returns:
+        sqlite3.Connection: A connection to the store.
+    """
+    return sqlite3.connect(
+        path, timeout=LOCK_TIMEOUT_SECONDS, isolation_level=None,
+    )
@@ -0,0 +1,201 @@
+"""
+This module provides a warm-start search over the size of the forest.
+
+It includes a function to search the same grid as GridSearchCV while
+growing a single forest per fold and combination of the other
+parameters, scoring it after every requested number of trees instead
+of training every forest size from scratch, and the helpers to split
+the folds, grow a forest and record a trial shared with the
+successive-halving search.
+"""
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from loguru import logger
+from sklearn.base import RegressorMixin, clone
+from sklearn.model_selection import ParameterGrid, check_cv
+
+N_ESTIMATORS = 'n_estimators'
+
+
+def warm_start_search(
+    estimator: RegressorMixin,
+    param_grid: dict,
+    folds: list[tuple[tuple, tuple | None]],
+) -> list[dict]:
+    """
+    Search a grid reusing the trees across forest sizes.
+
+    The trees of a random forest are grown independently, so the forest
+    of 300 trees is the forest of 200 trees with 100 more. For every
+    fold and combination of the other parameters, one warm-started
+    forest is grown through the sorted `n_estimators` values and scored
+    on the fold after each. With a single fold without validation part
+    and an estimator computing its out-of-bag score, the candidates are
+    scored out of bag instead. The fits run in parallel with the active
+    joblib backend.
+
+    Args:
+        estimator (RegressorMixin): The forest regressor to search.
+        param_grid (dict): Values of every parameter.
+        folds (list): The folds, without validation part out of bag.
+
+    Returns:
+        list[dict]: A trial per candidate, in the order of the grid.
+    """
+    forest_sizes = sorted(param_grid[N_ESTIMATORS])
+    other_grid = ParameterGrid(other_params(param_grid))
+    n_forests = len(other_grid) * len(folds)
+    logger.info(f'growing {n_forests} warm-started forests to {forest_sizes}')
+    fold_scores = Parallel()(
+        delayed(_grown_scores)(
+            clone(estimator).set_params(**grid_params), forest_sizes, *fold,
+        )
+        for grid_params in other_grid
+        for fold in folds
+    )
+    fold_scores = np.reshape(
+        fold_scores, (len(other_grid), len(folds), len(forest_sizes)),
+    )
+    trials = {}
+    for params_index, grid_params in enumerate(other_grid):
+        for size_index, forest_size in enumerate(forest_sizes):
+            candidate = {**grid_params, N_ESTIMATORS: forest_size}
+            trials[_candidate_key(candidate)] = make_trial(
+                0, candidate, fold_scores[params_index, :, size_index],
+            )
+    return [
+        trials[_candidate_key(candidate)]
+        for candidate in ParameterGrid(param_grid)
+    ]
+
+
+def split_folds(
+    cv: int,
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+) -> list[tuple[tuple, tuple]]:
+    """
+    Split the training set into cross-validation folds.
+
+    Args:
+        cv (int): Number of folds, or a cross-validation splitter.
+        X_train (pd.DataFrame): Training set features.
+        y_train (pd.Series): Training set target.
+
+    Returns:
+        list[tuple[tuple, tuple]]: Features and target of the training
+            and validation part of every fold.
+    """
+    return [
+        (
+            (X_train.iloc[train], y_train.iloc[train]),
+            (X_train.iloc[test], y_train.iloc[test]),
+        )
+        for train, test in check_cv(cv).split(X_train, y_train)
+    ]
+
+
+def grow_forest(
+    forest: RegressorMixin,
+    forest_size: int,
+    train: tuple[pd.DataFrame, pd.Series],
+    test: tuple[pd.DataFrame, pd.Series] | None,
+) -> float:
+    """
+    Grow a warm-started forest to a number of trees and score it.
+
+    Without a validation fold, the forest is scored out of bag: every
+    tree only predicts the rows left out of its bootstrap sample.
+
+    Args:
+        forest (RegressorMixin): The forest, unfitted or smaller.
+        forest_size (int): Number of trees to grow the forest to.
+        train (tuple): Features and target of the training fold.
+        test (tuple | None): Features and target of the validation fold.
+
+    Returns:
+        float: The R2 score of the grown forest on the validation fold,
+            or its out-of-bag R2 score.
+    """
+    forest.set_params(warm_start=True, n_estimators=forest_size)
+    forest.fit(*train)
+    if test is None:
+        return forest.oob_score_
+    return forest.score(*test)
+
+
+def make_trial(rung: int, candidate: dict, fold_scores: list) -> dict:
+    """
+    Record the cross-validated evaluation of a candidate.
+
+    Args:
+        rung (int): Round of the search, 0 for exhaustive searches.
+        candidate (dict): Parameters of the candidate.
+        fold_scores (list): R2 score of the candidate on every fold.
+
+    Returns:
+        dict: The JSON-serializable trial with its mean score.
+    """
+    fold_scores = [float(score) for score in fold_scores]
+    return {
+        'rung': rung,
+        'params': candidate,
+        'fold_scores': fold_scores,
+        'mean_score': float(np.mean(fold_scores)),
+    }
+
+
+def other_params(param_grid: dict) -> dict:
+    """
+    Drop the number of trees from a grid.
+
+    Args:
+        param_grid (dict): Values of every parameter.
+
+    Returns:
+        dict: The same without `n_estimators`.
+    """
+    return {
+        name: param_value
+        for name, param_value in param_grid.items()
+        if name != N_ESTIMATORS
+    }
+
+
+def _grown_scores(
+    forest: RegressorMixin,
+    forest_sizes: list[int],
+    train: tuple[pd.DataFrame, pd.Series],
+    test: tuple[pd.DataFrame, pd.Series] | None,
+) -> list[float]:
+    """
+    Grow one forest through increasing sizes and score it at each.
+
+    Args:
+        forest (RegressorMixin): The unfitted forest regressor.
+        forest_sizes (list[int]): Increasing numbers of trees.
+        train (tuple): Features and target of the training fold.
+        test (tuple | None): Features and target of the validation fold.
+
+    Returns:
+        list[float]: The R2 score of the forest at every size.
+    """
+    return [
+        grow_forest(forest, forest_size, train, test)
+        for forest_size in forest_sizes
+    ]
+
+
+def _candidate_key(candidate: dict) -> tuple:
+    """
+    Key a candidate independently of the order of its parameters.
+
+    Args:
+        candidate (dict): Parameters of the candidate.
+
+    Returns:
+        tuple: The sorted parameters of the candidate.
+    """
+    return tuple(sorted(candidate.items()))
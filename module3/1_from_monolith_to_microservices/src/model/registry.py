@@ -0,0 +1,162 @@
+"""
+This module provides a file-based, versioned model registry.
+
+Every registered model is stored once, immutably, under its version
+together with its metadata. An index holds the `latest` and `pinned`
+aliases and the metadata of every version, so a model is found with a
+single lookup whether it is selected by alias or by version:
+
+    <model_path>/registry/<model_name>/index.json
+    <model_path>/registry/<model_name>/<version>/model
+    <model_path>/registry/<model_name>/<version>/metadata.json
+
+The version of a model is the start of the SHA-256 hash of its pickle,
+like the version reported by the inference API.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from loguru import logger
+
+from config import model_settings
+
+LATEST = 'latest'
+PINNED = 'pinned'
+MODEL_FILE = 'model'
+METADATA_FILE = 'metadata.json'
+INDEX_FILE = 'index.json'
+VERSIONS = 'versions'
+VERSION_LENGTH = 12
+
+
+def register_model(model_bytes: bytes, metadata: dict) -> str:
+    """
+    Store a pickled model and its metadata, and make it the latest.
+
+    Args:
+        model_bytes (bytes): The pickled model.
+        metadata (dict): Metadata describing the model.
+
+    Returns:
+        str: The version of the registered model.
+    """
+    version = hashlib.sha256(model_bytes).hexdigest()[:VERSION_LENGTH]
+    version_dir = registry_path() / version
+    if version_dir.exists():
+        logger.info(f'model version {version} is already registered')
+        metadata = json.loads((version_dir / METADATA_FILE).read_text())
+    else:
+        logger.info(f'registering model version {version} at {version_dir}')
+        metadata = {
+            'version': version,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'size_bytes': len(model_bytes),
+            **metadata,
+        }
+        _write_version(version_dir, model_bytes, metadata)
+
+    index = read_index()
+    index[VERSIONS][version] = metadata
+    index[LATEST] = version
+    _write_index(index)
+    return version
+
+
+def pin_model(version: str) -> None:
+    """
+    Pin a registered version, or unpin with an empty version.
+
+    Args:
+        version (str): The version to pin.
+
+    Raises:
+        KeyError: If the version is not registered.
+    """
+    index = read_index()
+    if version and version not in index[VERSIONS]:
+        raise KeyError(f'model version {version} is not registered')
+    index[PINNED] = version or None
+    _write_index(index)
+    logger.info(f'pinned model version: {index[PINNED]}')
+
+
+def resolve_model(selector: str) -> Path:
+    """
+    Find the model file of a version or alias.
+
+    Args:
+        selector (str): `latest`, `pinned` or a model version.
+
+    Returns:
+        Path: The model file of the selected version.
+
+    Raises:
+        FileNotFoundError: If no model matches the selector.
+    """
+    index = read_index()
+    version = index[selector] if selector in {LATEST, PINNED} else selector
+    if version not in index[VERSIONS]:
+        raise FileNotFoundError(f'No registered model for {selector}!')
+    return registry_path() / version / MODEL_FILE
+
+
+def read_index() -> dict:
+    """
+    Read the index of the registry.
+
+    Returns:
+        dict: The aliases and the versions of the registry.
+    """
+    index_path = registry_path() / INDEX_FILE
+    if not index_path.exists():
+        return {LATEST: None, PINNED: None, VERSIONS: {}}
+    return json.loads(index_path.read_text())
+
+
+def registry_path() -> Path:
+    """
+    Get the directory of the registry of the configured model.
+
+    Returns:
+        Path: The directory of the registry.
+    """
+    return Path(model_settings.model_path) / 'registry' / (
+        model_settings.model_name
+    )
+
+
+def _write_version(
+    version_dir: Path,
+    model_bytes: bytes,
+    metadata: dict,
+) -> None:
+    """
+    Write the directory of a version atomically.
+
+    Args:
+        version_dir (Path): The directory of the version.
+        model_bytes (bytes): The pickled model.
+        metadata (dict): Metadata describing the model.
+    """
+    staging_dir = version_dir.with_name(f'.{version_dir.name}.tmp')
+    staging_dir.mkdir(parents=True, exist_ok=True)
+    (staging_dir / MODEL_FILE).write_bytes(model_bytes)
+    (staging_dir / METADATA_FILE).write_text(json.dumps(metadata, indent=2))
+    os.replace(staging_dir, version_dir)
+
+
+def _write_index(index: dict) -> None:
+    """
+    Replace the index of the registry atomically.
+
+    Args:
+        index (dict): The aliases and the versions of the registry.
+    """
+    index_path = registry_path() / INDEX_FILE
+    staging_path = index_path.with_suffix('.tmp')
+    staging_path.write_text(json.dumps(index, indent=2))
+    os.replace(staging_path, index_path)
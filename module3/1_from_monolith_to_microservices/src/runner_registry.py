@@ -0,0 +1,43 @@
+"""
+Main application script for managing the model registry.
+
+This script lists the registered versions of the configured model
+with their metadata, or pins one of them, so the inference services
+configured with MODEL_VERSION=pinned serve it. The registry index is
+written as JSON through the report logger, to stdout and the log file.
+
+Usage:
+    python runner_registry.py list
+    python runner_registry.py pin <version>
+    python runner_registry.py pin ''
+"""
+
+import argparse
+import json
+
+from loguru import logger
+
+from config import report_logger
+from model import registry
+
+
+@logger.catch
+def main():
+    """
+    Run the application.
+
+    List the registry index, or pin the version given on the
+    command line.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('command', choices=['list', 'pin'])
+    parser.add_argument('version', nargs='?', default='')
+    arguments = parser.parse_args()
+
+    if arguments.command == 'pin':
+        registry.pin_model(arguments.version)
+    report_logger.info(json.dumps(registry.read_index(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Main application script for comparing hyperparameter searches.
+
+This script loads the latest saved traces of two search modes of the
+configured model, and reports how the selection of the first one
+scores under the second one, for instance how the out-of-bag selection
+scores under 5-fold cross-validation, with the CPU time of both. The
+report is written as JSON through the report logger.
+
+Usage:
+    python runner_search_report.py oob grid
+"""
+
+import argparse
+import json
+
+from loguru import logger
+
+from config import report_logger
+from model.pipeline import search_trace
+
+
+@logger.catch
+def main():
+    """
+    Run the application.
+
+    Compare the latest traces of the search modes given on the
+    command line.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('search_mode')
+    parser.add_argument('reference_mode')
+    arguments = parser.parse_args()
+
+    report = search_trace.compare_traces(
+        search_trace.latest_trace(arguments.search_mode),
+        search_trace.latest_trace(arguments.reference_mode),
+    )
+    report_logger.info(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+"""
+Test configuration of the model builder.
+
+The modules of the builder import each other from the `src` directory,
+which the tests therefore put on the import path.
+"""
+
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / 'src'
+
+sys.path.insert(0, str(SRC_DIR))
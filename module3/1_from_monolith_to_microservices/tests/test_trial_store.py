@@ -0,0 +1,115 @@
+"""Tests of the shared store of search trials and of its leases."""
+
+import time
+
+import pytest
+
+from model.pipeline.lease import LeaseHeartbeat
+from model.pipeline.trial_store import TrialStore, shared_split_seed
+
+CANDIDATES = ('{"max_depth": 2}', '{"max_depth": 4}')
+N_FOLDS = 2
+LEASE_SECONDS = 0.3
+
+
+@pytest.fixture
+def store(tmp_path) -> TrialStore:
+    """
+    Provide a store with the fits of two candidates on two folds.
+
+    Args:
+        tmp_path: The temporary directory of the test.
+
+    Returns:
+        TrialStore: The store, with every fit pending.
+    """
+    trial_store = TrialStore(
+        str(tmp_path / 'trials.sqlite'), 'search', LEASE_SECONDS,
+    )
+    trial_store.add(list(CANDIDATES), N_FOLDS)
+    return trial_store
+
+
+@pytest.fixture
+def single_fit_store(store) -> TrialStore:
+    """
+    Provide a store, sharing a file with `store`, with a single fit.
+
+    Args:
+        store: The store whose file to share.
+
+    Returns:
+        TrialStore: The store, with its fit pending.
+    """
+    trial_store = TrialStore(store.path, 'single', LEASE_SECONDS)
+    trial_store.add(list(CANDIDATES[:1]), 1)
+    return trial_store
+
+
+def test_claims_every_fit_once(store):
+    """Workers claim every pending fit exactly once."""
+    claims = [store.claim(f'worker-{index}') for index in range(4)]
+
+    assert sorted(claims) == [
+        (candidate, fold)
+        for candidate in CANDIDATES
+        for fold in range(N_FOLDS)
+    ]
+    assert store.claim('worker-4') is None
+    assert store.remaining() == 4
+
+
+def test_add_keeps_recorded_fits(store):
+    """Adding the fits of a restarted search keeps the done ones."""
+    candidate, fold = store.claim('worker')
+    store.complete(candidate, fold, 'worker', 0.5)
+
+    store.add(list(CANDIDATES), N_FOLDS)
+
+    assert store.scores() == {(candidate, fold): 0.5}
+    assert store.remaining() == 3
+
+
+def test_expired_lease_is_reclaimed(single_fit_store):
+    """A fit is claimed again once its lease expires, and only then."""
+    trial = single_fit_store.claim('stale')
+    assert single_fit_store.claim('other') is None
+
+    time.sleep(LEASE_SECONDS * 2)
+
+    assert single_fit_store.claim('other') == trial
+
+
+def test_stale_worker_cannot_complete(single_fit_store):
+    """Only the worker holding the lease records the score of a fit."""
+    candidate, fold = single_fit_store.claim('stale')
+    time.sleep(LEASE_SECONDS * 2)
+    single_fit_store.claim('owner')
+
+    assert not single_fit_store.complete(candidate, fold, 'stale', 0.1)
+    assert not single_fit_store.renew(candidate, fold, 'stale')
+    assert single_fit_store.complete(candidate, fold, 'owner', 0.9)
+    assert single_fit_store.scores() == {(candidate, fold): 0.9}
+    assert single_fit_store.remaining() == 0
+
+
+def test_heartbeat_keeps_lease(single_fit_store):
+    """A fit renewed while running is not claimed again."""
+    candidate, fold = single_fit_store.claim('owner')
+
+    heartbeat = LeaseHeartbeat(
+        LEASE_SECONDS / 3, single_fit_store.renew, candidate, fold, 'owner',
+    )
+    with heartbeat:
+        time.sleep(LEASE_SECONDS * 2)
+        assert single_fit_store.claim('other') is None
+
+    assert not heartbeat.is_alive()
+    assert single_fit_store.complete(candidate, fold, 'owner', 0.7)
+
+
+def test_split_seed_is_shared(tmp_path):
+    """Every run sharing a store gets the seed drawn by the first one."""
+    path = str(tmp_path / 'trials.sqlite')
+
+    assert shared_split_seed(path) == shared_split_seed(path)
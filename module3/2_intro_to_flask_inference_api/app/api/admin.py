@@ -0,0 +1,37 @@
+"""
+Admin API module.
+
+This module contains endpoints to manage the running inference service.
+
+Endpoints:
+    - POST /admin/reload:
+        Reloads the model from its file. The new model is loaded and
+        warmed up while the current one keeps serving, and then swapped
+        in at once. Returns the version of the serving model and whether
+        it changed. Under the pre-fork server this only reloads the
+        worker handling the call; use the model file watcher to reload
+        all workers.
+"""
+
+from flask import Blueprint
+
+from services.serving import model_inference_service
+
+
+bp = Blueprint('admin', __name__, url_prefix='/admin')
+
+
+@bp.post('/reload')
+def reload_model():
+    """
+    Reload the model from its file.
+
+    Returns:
+        dict: Whether a new model was loaded, and the serving version.
+    """
+    reloaded = model_inference_service.load_model()
+
+    return {
+        'reloaded': reloaded,
+        'model_version': model_inference_service.loaded_model.version,
+    }
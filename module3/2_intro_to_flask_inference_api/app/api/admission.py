@@ -0,0 +1,101 @@
+"""
+Admission control hooks for the prediction API.
+
+This module admits prediction requests through the AdmissionController
+before they are handled, and frees their slot once they are finished,
+including streamed responses. The deadline of an admitted request is
+checked again right before inference, so a request which outlived it
+while waiting or being parsed is not scored for nothing.
+
+Requests which are not admitted get a fast response:
+    - HTTP status 503 with a `Retry-After` header, if all slots are
+      taken and the wait queue is full.
+    - HTTP status 504, if the deadline sent in the `X-Request-Deadline`
+      header, as a UNIX timestamp in seconds, has passed.
+    - HTTP status 400, if the deadline header is not a number.
+"""
+
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+
+import flask
+from werkzeug.exceptions import BadRequest, GatewayTimeout, ServiceUnavailable
+
+from config import serving_settings
+from services import admission
+from services.serving import admission_controller
+
+DEADLINE_HEADER = 'X-Request-Deadline'
+
+
+def admit_request() -> None:
+    """
+    Admit the current request, or reject it.
+
+    A rejected request gets the HTTP error of `rejection_errors`.
+    """
+    deadline = request_deadline(flask.request.headers)
+    with rejection_errors():
+        admission_controller.acquire(deadline)
+    flask.g.admitted = True
+    flask.g.deadline = deadline
+
+
+def release_request(_=None) -> None:
+    """Free the slot of the finished request, if it was admitted."""
+    if flask.g.pop('admitted', False):
+        admission_controller.release()
+
+
+def enforce_deadline() -> None:
+    """
+    Reject the current request if its deadline passed since admission.
+
+    A late request gets the HTTP error of `rejection_errors`.
+    """
+    with rejection_errors():
+        admission.check_deadline(flask.g.get('deadline'))
+
+
+@contextmanager
+def rejection_errors() -> Iterator[None]:
+    """
+    Turn the rejections of admission control into HTTP errors.
+
+    Yields:
+        None: While admission control runs.
+
+    Raises:
+        ServiceUnavailable: If the service is overloaded.
+        GatewayTimeout: If the deadline of the request has passed.
+    """
+    try:
+        yield
+    except admission.OverloadedError as error:
+        raise ServiceUnavailable(
+            retry_after=serving_settings.admission_retry_after,
+        ) from error
+    except admission.DeadlineExceededError as error:
+        raise GatewayTimeout('Request deadline exceeded') from error
+
+
+def request_deadline(headers: Mapping[str, str]) -> float | None:
+    """
+    Read the deadline of a request from its headers.
+
+    Args:
+        headers (Mapping[str, str]): The headers of the request.
+
+    Returns:
+        float | None: UNIX time of the deadline, if one was sent.
+
+    Raises:
+        BadRequest: If the deadline is not a number.
+    """
+    deadline = headers.get(DEADLINE_HEADER)
+    if deadline is None:
+        return None
+    try:
+        return float(deadline)
+    except ValueError as error:
+        raise BadRequest('Bad deadline') from error
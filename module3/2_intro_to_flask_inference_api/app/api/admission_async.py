@@ -0,0 +1,47 @@
+"""
+Admission control hooks for the async prediction API.
+
+This module applies the admission control of the prediction API
+(`api.admission`) to the async server, with the same AdmissionController
+and the same responses. Without it, the event loop would accept
+requests without bound and queue their predictions on the executor
+long after their clients gave up. Waiting for a free slot blocks, so
+it runs in a thread, keeping the event loop free.
+"""
+
+import asyncio
+
+import quart
+
+from api.admission import rejection_errors, request_deadline
+from services import admission
+from services.serving import admission_controller
+
+
+async def admit_request() -> None:
+    """
+    Admit the current request, or reject it.
+
+    A rejected request gets the HTTP error of `rejection_errors`.
+    """
+    deadline = request_deadline(quart.request.headers)
+    with rejection_errors():
+        await asyncio.to_thread(admission_controller.acquire, deadline)
+    quart.g.admitted = True
+    quart.g.deadline = deadline
+
+
+async def release_request(_=None) -> None:
+    """Free the slot of the finished request, if it was admitted."""
+    if quart.g.pop('admitted', False):
+        admission_controller.release()
+
+
+def enforce_deadline() -> None:
+    """
+    Reject the current request if its deadline passed since admission.
+
+    A late request gets the HTTP error of `rejection_errors`.
+    """
+    with rejection_errors():
+        admission.check_deadline(quart.g.get('deadline'))
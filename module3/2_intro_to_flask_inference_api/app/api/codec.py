@@ -0,0 +1,194 @@
+"""
+Fast request decoding for the prediction API.
+
+This module converts parsed request payloads straight into feature
+rows and numpy feature matrices. The fast path only accepts JSON
+integers within the int64 range for every Apartment field, which the
+Apartment schema would accept unchanged; anything else falls back to
+validation with the Apartment schema, so the accepted inputs and the
+resulting features are the same on both paths.
+
+Batches can be sent as an array of apartments, or in a columnar form:
+an object with one array per Apartment field.
+"""
+
+from collections.abc import Mapping
+from typing import NamedTuple
+
+import numpy as np
+
+from api.validation import INT64, fits_int64, validate_apartments
+from schema.apartment import Apartment
+
+FEATURE_NAMES = tuple(Apartment.model_fields)
+MAX_DIGITS = len(str(INT64.max))
+
+
+class BatchInput(NamedTuple):
+    """
+    A decoded batch of apartments.
+
+    Attributes:
+        size: Number of items in the batch.
+        indices: Index of every valid item, in the order of the matrix.
+        matrix: Feature rows of the valid items.
+        errors: Validation errors of the invalid items.
+    """
+
+    size: int
+    indices: list[int]
+    matrix: np.ndarray
+    errors: list[dict]
+
+
+def decode_row(apartment: object) -> list[int] | None:
+    """
+    Convert a parsed apartment to a feature row, if all fields are ints.
+
+    Args:
+        apartment (object): A parsed JSON item.
+
+    Returns:
+        list[int] | None: The feature row, or None if the item has to
+            be validated with the Apartment schema.
+    """
+    if not isinstance(apartment, dict):
+        return None
+    try:
+        features = [apartment[name] for name in FEATURE_NAMES]
+    except KeyError:
+        return None
+    if set(map(type, features)) != {int}:
+        return None
+    return features if fits_int64(features) else None
+
+
+def decode_args(args: Mapping[str, str]) -> list[int] | None:
+    """
+    Convert query parameters to a feature row, if all are plain digits.
+
+    Longer numbers than the int64 range can hold are left to the schema
+    before being parsed, so huge values get a validation error instead
+    of the digit limit or the overflow of Python and numpy.
+
+    Args:
+        args (Mapping[str, str]): The query parameters of the request.
+
+    Returns:
+        list[int] | None: The feature row, or None if the parameters
+            have to be validated with the Apartment schema.
+    """
+    features = [args.get(name, '') for name in FEATURE_NAMES]
+    if not all(map(str.isascii, features)):
+        return None
+    if not all(map(str.isdigit, features)):
+        return None
+    if max(map(len, features)) > MAX_DIGITS:
+        return None
+    input_row = list(map(int, features))
+    return input_row if fits_int64(input_row) else None
+
+
+def decode_batch(body: object) -> BatchInput:
+    """
+    Convert a parsed batch to a feature matrix and validation errors.
+
+    Args:
+        body (object): A JSON array of apartments, or an object with
+            one array per Apartment field.
+
+    Returns:
+        BatchInput: The feature matrix of the valid items, with their
+            indices, and the validation errors of the invalid items.
+
+    Raises:
+        ValueError: If the body is neither of the batch forms.
+    """
+    if isinstance(body, dict):
+        matrix = _decode_columns(body)
+        if matrix is not None:
+            batch_size = len(matrix)
+            return BatchInput(batch_size, list(range(batch_size)), matrix, [])
+        body = _columns_to_items(body)
+    if not isinstance(body, list):
+        raise ValueError('Expected a JSON array or an object of arrays')
+
+    input_rows, errors = _decode_items(body)
+    indices = sorted(input_rows)
+    matrix = np.array(
+        [input_rows[row_index] for row_index in indices], dtype=np.int64,
+    ).reshape(-1, len(FEATURE_NAMES))
+    return BatchInput(len(body), indices, matrix, errors)
+
+
+def _decode_items(apartments: list) -> tuple[dict[int, list], list[dict]]:
+    """
+    Convert parsed apartments to feature rows and validation errors.
+
+    Args:
+        apartments (list): The parsed JSON items.
+
+    Returns:
+        tuple: Feature rows of the valid items keyed by their index,
+            and the validation errors of the invalid items.
+    """
+    input_rows = {}
+    fallback_items = []
+    for index, apartment in enumerate(apartments):
+        input_row = decode_row(apartment)
+        if input_row is None:
+            fallback_items.append((index, apartment))
+        else:
+            input_rows[index] = input_row
+    validated_rows, errors = validate_apartments(fallback_items)
+    input_rows.update(validated_rows)
+    return input_rows, errors
+
+
+def _decode_columns(columns: dict) -> np.ndarray | None:
+    """
+    Convert a columnar batch to a matrix, if all values are ints.
+
+    Args:
+        columns (dict): One array per Apartment field.
+
+    Returns:
+        np.ndarray | None: The feature matrix, or None if the items have
+            to be validated with the Apartment schema.
+    """
+    features = [columns.get(name) for name in FEATURE_NAMES]
+    if not all(isinstance(feature, list) for feature in features):
+        return None
+    if len({len(feature) for feature in features}) != 1:
+        return None
+    int_columns = [set(map(type, feature)) <= {int} for feature in features]
+    if not all(int_columns):
+        return None
+    if not all(map(fits_int64, features)):
+        return None
+    return np.array(features, dtype=np.int64).T.reshape(
+        -1, len(FEATURE_NAMES),
+    )
+
+
+def _columns_to_items(columns: dict) -> list[dict]:
+    """
+    Convert a columnar batch to a list of apartments.
+
+    Args:
+        columns (dict): One array per field.
+
+    Returns:
+        list[dict]: One apartment per position in the arrays.
+
+    Raises:
+        ValueError: If the values are not arrays of the same length.
+    """
+    if not all(isinstance(column, list) for column in columns.values()):
+        raise ValueError('Expected an object of arrays')
+    if len({len(column) for column in columns.values()}) > 1:
+        raise ValueError('Expected arrays of the same length')
+    return [
+        dict(zip(columns.keys(), apartment))
+        for apartment in zip(*columns.values())
+    ]
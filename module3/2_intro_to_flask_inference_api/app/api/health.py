@@ -0,0 +1,60 @@
+"""
+Health API module.
+
+This module contains the probes of the load balancer. They bypass
+admission control, so an overloaded process is not mistaken for a
+dead one.
+
+Endpoints:
+    - GET /health/live:
+        Returns HTTP status 200 as long as the process serves requests.
+
+    - GET /health/ready:
+        Returns HTTP status 200 once the serving model has been warmed
+        up until the latency of its synthetic predictions settled, or
+        the warm-up gave up after `warmup_max_seconds`, and HTTP status
+        503 while it is still warming up. Once ready, the process stays
+        ready while a reloaded model warms up, since the previous model
+        keeps serving meanwhile. The body reports the serving version
+        and the warm-up rounds, latencies and outcome.
+"""
+
+from flask import Blueprint
+
+from services.serving import model_inference_service
+
+
+bp = Blueprint('health', __name__, url_prefix='/health')
+
+
+@bp.get('/live')
+def get_liveness():
+    """
+    Return the liveness of the process.
+
+    Returns:
+        dict: The liveness status.
+    """
+    return {'status': 'alive'}
+
+
+@bp.get('/ready')
+def get_readiness():
+    """
+    Return the readiness of the serving model.
+
+    Returns:
+        tuple: The readiness and warm-up of the model, and the status.
+    """
+    loaded_model = model_inference_service.loaded_model
+    warmup = loaded_model.warmup
+    ready = warmup is not None and warmup.ready
+    report = warmup and warmup.report
+    readiness = {
+        'ready': ready,
+        'model_version': loaded_model.version,
+        'warmup_rounds': report and report.rounds,
+        'warmup_latencies_ms': report and report.latencies_ms,
+        'warmup_settled': report and report.settled,
+    }
+    return readiness, 200 if ready else 503  # noqa: WPS432
@@ -0,0 +1,75 @@
+"""
+JSON provider of the Flask application.
+
+This module replaces Flask's default JSON serialization with orjson,
+which also serializes numpy arrays and scalars directly, and records
+the time spent serializing responses.
+"""
+
+import orjson
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+from services.metrics import stage_latency
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """A timed JSON provider encoding and decoding with orjson."""
+
+    def dumps(self, payload: object, **kwargs) -> str:
+        """
+        Serialize data as JSON.
+
+        Args:
+            payload (object): The data to serialize.
+            kwargs: Ignored options of the default provider.
+
+        Returns:
+            str: The JSON document.
+        """
+        return self._encode(payload).decode()
+
+    def loads(self, document: str | bytes, **kwargs) -> object:
+        """
+        Deserialize data from JSON.
+
+        Args:
+            document (str | bytes): The JSON document.
+            kwargs: Ignored options of the default provider.
+
+        Returns:
+            object: The deserialized data.
+        """
+        return orjson.loads(document)
+
+    def response(self, *args, **kwargs) -> Response:
+        """
+        Serialize the given data into a JSON response.
+
+        Args:
+            args: A single value or several values to serialize as a list.
+            kwargs: Keys and values to serialize as an object.
+
+        Returns:
+            Response: The JSON response.
+        """
+        with stage_latency.time('serialization'):
+            return self._app.response_class(
+                self._encode(self._prepare_response_obj(args, kwargs)),
+                mimetype=self.mimetype,
+            )
+
+    def _encode(self, payload: object) -> bytes:
+        """
+        Serialize data as JSON with orjson.
+
+        Args:
+            payload (object): The data to serialize.
+
+        Returns:
+            bytes: The JSON document.
+        """
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(payload, default=self.default, option=option)
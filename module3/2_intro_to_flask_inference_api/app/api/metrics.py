@@ -0,0 +1,64 @@
+"""
+Metrics API module.
+
+This module contains the endpoint exposing the metrics of the inference
+service, and the hooks recording the per-request metrics.
+
+Endpoints:
+    - GET /metrics:
+        Returns all metrics in the Prometheus text exposition format:
+        latency histograms of the validation, inference and
+        serialization stages, the batch size histogram, the number of
+        predictions per model version, the number of requests per
+        endpoint and status code, and the number of in-flight requests.
+"""
+
+from flask import Blueprint, Response, request
+
+from services import metrics
+
+
+bp = Blueprint('metrics', __name__)
+
+
+@bp.get('/metrics')
+def get_metrics():
+    """
+    Return all metrics in the Prometheus text format.
+
+    Returns:
+        Response: The text exposition of all metrics.
+    """
+    return Response(
+        metrics.registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
+
+@bp.before_app_request
+def track_request_start() -> None:
+    """Count the request as in flight."""
+    metrics.requests_in_flight.inc()
+
+
+@bp.after_app_request
+def track_request_status(response: Response) -> Response:
+    """
+    Count the handled request by endpoint and status code.
+
+    Args:
+        response (Response): The response to the request.
+
+    Returns:
+        Response: The unchanged response.
+    """
+    metrics.requests_total.inc(
+        request.endpoint or 'unknown', str(response.status_code),
+    )
+    return response
+
+
+@bp.teardown_app_request
+def track_request_end(_=None) -> None:
+    """Count the request as no longer in flight."""
+    metrics.requests_in_flight.dec()
@@ -0,0 +1,78 @@
+"""
+Model selection for the prediction API.
+
+Prediction requests are served by the configured model, unless they
+select another one with the `X-Model-Name` header, the `X-Model-Version`
+header, or both. A version is a registry version or the `latest` or
+`pinned` alias, and an empty version selects the plain model file.
+Selected models are loaded on first use and kept in the model pool,
+except the configured model, which is always served by its own service.
+
+Requests selecting a model which does not exist get HTTP status 404,
+and requests whose name or version is not a plain file name get HTTP
+status 400.
+"""
+
+from pathlib import PurePath
+
+import flask
+
+from services.model_inference import ModelInferenceService
+from services.serving import model_inference_service, model_pool
+
+NAME_HEADER = 'X-Model-Name'
+VERSION_HEADER = 'X-Model-Version'
+
+
+def selected_service() -> ModelInferenceService:
+    """
+    Get the inference service of the model selected by the request.
+
+    Returns:
+        ModelInferenceService: The service serving the selected model.
+    """
+    headers = flask.request.headers
+    model_name = headers.get(NAME_HEADER)
+    model_version = headers.get(VERSION_HEADER)
+    if model_name is None and model_version is None:
+        return model_inference_service
+    model_name = model_name or model_inference_service.model_name
+    if model_version is None:
+        model_version = model_inference_service.model_version
+    selected_model = (model_name, model_version)
+    if selected_model == _configured_model():
+        return model_inference_service
+    if not _is_file_name(model_name) or not _is_file_name(model_version):
+        flask.abort(code=400, description='Bad model')  # noqa: WPS432
+    try:
+        return model_pool.get(model_name, model_version)
+    except FileNotFoundError as error:
+        flask.abort(code=404, description=str(error))  # noqa: WPS432
+
+
+def _configured_model() -> tuple[str, str]:
+    """
+    Get the name and version of the configured model.
+
+    Returns:
+        tuple[str, str]: The name and the version of the model.
+    """
+    return (
+        model_inference_service.model_name,
+        model_inference_service.model_version,
+    )
+
+
+def _is_file_name(selector: str) -> bool:
+    """
+    Tell whether a selector can only name a file in its directory.
+
+    Args:
+        selector (str): A model name or version.
+
+    Returns:
+        bool: Whether the selector is empty or a plain file name.
+    """
+    return not selector or (
+        PurePath(selector).name == selector and selector not in {'.', '..'}
+    )
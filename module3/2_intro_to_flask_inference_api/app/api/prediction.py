@@ -17,16 +17,44 @@ Endpoints:
         contain JSON data that matches the schema defined in the
         Apartment class.
         Returns HTTP status 400 if input parameters are invalid.
+
+    - POST /pred/batch:
+        Returns predictions for a list of apartments provided as a JSON
+        array in the request body, or in columnar form as a JSON object
+        with one array per field of the Apartment class. All valid items
+        are scored with a single model call; invalid items are reported
+        by their index in the `errors` list and get a `null` prediction.
+        Returns HTTP status 400 if the request body is neither form.
+
+Every response includes the version of the model which served it.
+Inputs consisting of plain integers are decoded straight into feature
+rows and matrices (`api.codec`); all other inputs are validated with the
+Apartment class. When request coalescing is enabled, single-apartment
+predictions are queued and scored together with other concurrent
+requests. All requests pass admission control first (`api.admission`),
+which checks their deadline again right before inference, and can
+select another model than the configured one by name and version
+(`api.model_selection`). When shadow scoring is enabled, a
+sample of the predictions of the configured model is scored again by
+a candidate model in the background (`services.shadow`).
 """
 
+import time
+
 from flask import Blueprint, abort, request
 from pydantic import ValidationError
 
+from api import admission, codec, model_selection
+from api.validation import fits_int64
 from schema.apartment import Apartment
-from services import model_inference_service
+from services.metrics import stage_latency
+from services.model_inference import ModelInferenceService, Prediction
+from services import serving
 
 
 bp = Blueprint('prediction', __name__, url_prefix='/pred')
+bp.before_request(admission.admit_request)
+bp.teardown_request(admission.release_request)
 
 
 @bp.get('/')
@@ -35,18 +63,20 @@ def get_prediction():
     Return a prediction based on the query parameters.
 
     Returns:
-        dict: A dictionary containing the prediction result.
+        dict: A dictionary containing the prediction result and the
+            version of the model which made it.
     """
-    try:
-        apartment_features = Apartment(**request.args)
-    except ValidationError:
-        abort(code=400, description='Bad input params')  # noqa: WPS432
+    with stage_latency.time('validation'):
+        input_row = codec.decode_args(request.args)
+        if input_row is None:
+            input_row = _validate_apartment(request.args.to_dict())
 
-    prediction = model_inference_service.predict(
-        list(apartment_features.model_dump().values()),
-    )
+    prediction = _predict(input_row)
 
-    return {'prediction': prediction}
+    return {
+        'prediction': prediction.predictions,
+        'model_version': prediction.model_version,
+    }
 
 
 @bp.post('/')
@@ -55,15 +85,123 @@ def get_prediction_post():
     Return a prediction based on the JSON data.
 
     Returns:
-        dict: A dictionary containing the prediction result.
+        dict: A dictionary containing the prediction result and the
+            version of the model which made it.
+    """
+    with stage_latency.time('validation'):
+        apartment = request.json
+        input_row = codec.decode_row(apartment)
+        if input_row is None:
+            input_row = _validate_apartment(apartment)
+
+    prediction = _predict(input_row)
+
+    return {
+        'prediction': prediction.predictions,
+        'model_version': prediction.model_version,
+    }
+
+
+@bp.post('/batch')
+def get_prediction_batch():
+    """
+    Return predictions for a list of apartments.
+
+    Returns:
+        dict: A dictionary containing the predictions aligned with the
+            input items, and the validation errors of the rejected items.
+    """
+    with stage_latency.time('validation'):
+        try:
+            batch = codec.decode_batch(request.json)
+        except ValueError as error:
+            abort(code=400, description=str(error))  # noqa: WPS432
+
+    predictions = [None for _ in range(batch.size)]
+    model_version = None
+    if batch.indices:
+        admission.enforce_deadline()
+        inference_service = model_selection.selected_service()
+        started = time.perf_counter()
+        prediction = inference_service.predict_batch(batch.matrix)
+        _shadow(inference_service, batch.matrix, prediction, started)
+        scored = zip(batch.indices, prediction.predictions)
+        for index, row_prediction in scored:
+            predictions[index] = row_prediction
+        model_version = prediction.model_version
+
+    return {
+        'predictions': predictions,
+        'errors': batch.errors,
+        'model_version': model_version,
+    }
+
+
+def _validate_apartment(apartment: object) -> list:
+    """
+    Validate an apartment against the Apartment schema.
+
+    Like batch items, apartments with a feature out of the int64 range
+    are rejected.
+
+    Args:
+        apartment (object): The raw apartment from the request.
+
+    Returns:
+        list: The feature row of the apartment.
     """
     try:
-        apartment_features = Apartment(**request.json)
+        apartment_features = Apartment.model_validate(apartment)
     except ValidationError:
         abort(code=400, description='Bad input params')  # noqa: WPS432
+    input_row = list(apartment_features.model_dump().values())
+    if not fits_int64(input_row):
+        abort(code=400, description='Bad input params')  # noqa: WPS432
+    return input_row
+
+
+def _predict(input_parameters: list) -> Prediction:
+    """
+    Make a single prediction, coalesced with others if enabled.
+
+    Only predictions of the configured model are coalesced.
 
-    prediction = model_inference_service.predict(
-        list(apartment_features.model_dump().values()),
-    )
+    Args:
+        input_parameters (list): The input data for making a prediction.
 
-    return {'prediction': prediction}
+    Returns:
+        Prediction: The prediction result from the model.
+    """
+    admission.enforce_deadline()
+    inference_service = model_selection.selected_service()
+    started = time.perf_counter()
+    if inference_service is serving.model_inference_service:
+        if serving.prediction_batcher is not None:
+            prediction = serving.prediction_batcher.predict(input_parameters)
+        else:
+            prediction = inference_service.predict(input_parameters)
+        _shadow(inference_service, [input_parameters], prediction, started)
+        return prediction
+    return inference_service.predict(input_parameters)
+
+
+def _shadow(
+    inference_service: ModelInferenceService,
+    input_matrix: list,
+    prediction: Prediction,
+    started: float,
+) -> None:
+    """
+    Submit predictions of the configured model to shadow scoring.
+
+    Args:
+        inference_service (ModelInferenceService): Predicting service.
+        input_matrix (list): The scored rows.
+        prediction (Prediction): The predictions.
+        started (float): Performance counter when the scoring started.
+    """
+    if serving.shadow_scorer is None:
+        return
+    if inference_service is serving.model_inference_service:
+        latency = time.perf_counter() - started
+        serving.shadow_scorer.submit(input_matrix, prediction, latency)
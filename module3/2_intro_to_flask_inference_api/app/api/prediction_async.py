@@ -0,0 +1,131 @@
+"""
+Async prediction API module.
+
+This module contains the endpoints of the prediction API
+(`api.prediction`) for the async server. Requests are handled on the
+event loop, while the predictions run on the bounded executor of the
+AsyncInferenceService.
+
+Endpoints:
+    - GET /pred/:
+        Returns a prediction for apartment price based on the query
+        parameters provided in the request.
+        Returns HTTP status 400 if input parameters are invalid.
+
+    - POST /pred/:
+        Returns a prediction for apartment price based on the JSON
+        data provided in the request body.
+        Returns HTTP status 400 if input parameters are invalid.
+
+    - POST /pred/batch:
+        Returns predictions for a list of apartments provided as a JSON
+        array in the request body, with the validation errors of the
+        invalid items.
+        Returns HTTP status 400 if the request body is not a JSON array.
+
+Requests pass the same admission control as on the WSGI application
+(`api.admission_async`), which checks their deadline again right before
+inference.
+"""
+
+from pydantic import ValidationError
+from quart import Blueprint, abort, request
+
+from api import admission_async
+from api.validation import validate_apartments
+from schema.apartment import Apartment
+from services.metrics import stage_latency
+from services.serving import async_inference_service
+
+
+bp = Blueprint('prediction_async', __name__, url_prefix='/pred')
+bp.before_request(admission_async.admit_request)
+bp.teardown_request(admission_async.release_request)
+
+
+@bp.get('/')
+async def get_prediction():
+    """
+    Return a prediction based on the query parameters.
+
+    Returns:
+        dict: A dictionary containing the prediction result and the
+            version of the model which made it.
+    """
+    with stage_latency.time('validation'):
+        apartment = request.args.to_dict()
+        try:
+            apartment_features = Apartment.model_validate(apartment)
+        except ValidationError:
+            abort(code=400, description='Bad input params')  # noqa: WPS432
+
+    admission_async.enforce_deadline()
+    prediction = await async_inference_service.predict(
+        list(apartment_features.model_dump().values()),
+    )
+
+    return {
+        'prediction': prediction.predictions,
+        'model_version': prediction.model_version,
+    }
+
+
+@bp.post('/')
+async def get_prediction_post():
+    """
+    Return a prediction based on the JSON data.
+
+    Returns:
+        dict: A dictionary containing the prediction result and the
+            version of the model which made it.
+    """
+    with stage_latency.time('validation'):
+        try:
+            apartment_features = Apartment.model_validate(
+                await request.get_json(),
+            )
+        except ValidationError:
+            abort(code=400, description='Bad input params')  # noqa: WPS432
+
+    admission_async.enforce_deadline()
+    prediction = await async_inference_service.predict(
+        list(apartment_features.model_dump().values()),
+    )
+
+    return {
+        'prediction': prediction.predictions,
+        'model_version': prediction.model_version,
+    }
+
+
+@bp.post('/batch')
+async def get_prediction_batch():
+    """
+    Return predictions for a list of apartments.
+
+    Returns:
+        dict: A dictionary containing the predictions aligned with the
+            input items, and the validation errors of the rejected items.
+    """
+    apartments = await request.get_json()
+    if not isinstance(apartments, list):
+        abort(code=400, description='Expected a JSON array')  # noqa: WPS432
+
+    input_rows, errors = validate_apartments(enumerate(apartments))
+    predictions = {}
+    model_version = None
+    if input_rows:
+        admission_async.enforce_deadline()
+        prediction = await async_inference_service.predict_batch(
+            list(input_rows.values()),
+        )
+        predictions = dict(zip(input_rows.keys(), prediction.predictions))
+        model_version = prediction.model_version
+
+    return {
+        'predictions': [
+            predictions.get(index) for index in range(len(apartments))
+        ],
+        'errors': errors,
+        'model_version': model_version,
+    }
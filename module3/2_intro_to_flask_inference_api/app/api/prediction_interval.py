@@ -0,0 +1,124 @@
+"""
+Prediction interval API module.
+
+This module contains an endpoint to predict apartment prices together
+with the spread of the trees of the forest.
+
+Endpoints:
+    - POST /pred/interval:
+        Accepts the same list or columnar JSON body as `/pred/batch`.
+        Returns the mean prediction, the standard deviation of the tree
+        outputs and the requested quantiles of the tree outputs of every
+        item, all computed from a single traversal of the forest.
+        Quantiles are given as a comma-separated `quantiles` query
+        parameter, the configured ones if omitted. Invalid items are
+        reported by their index in the `errors` list and get `null`
+        values.
+        Returns HTTP status 400 if the body is neither form, if a
+        quantile is not a number in [0, 1], or if the model is not
+        a forest.
+
+The request passes admission control first (`api.admission`), which
+checks its deadline again right before inference, and can select
+another model than the configured one by name and version
+(`api.model_selection`).
+"""
+
+from flask import Blueprint, abort, request
+
+from api import admission, codec, model_selection
+from config import serving_settings
+from services.metrics import stage_latency
+from services.prediction_intervals import PredictionInterval, predict_interval
+
+
+bp = Blueprint('prediction_interval', __name__, url_prefix='/pred')
+bp.before_request(admission.admit_request)
+bp.teardown_request(admission.release_request)
+
+
+@bp.post('/interval')
+def get_prediction_interval():
+    """
+    Return predictions with the spread of the trees of the forest.
+
+    Returns:
+        dict: The mean, deviation and quantiles aligned with the input
+            items, and the validation errors of the rejected items.
+    """
+    with stage_latency.time('validation'):
+        quantiles = _parse_quantiles(request.args.get('quantiles'))
+        try:
+            batch = codec.decode_batch(request.json)
+        except ValueError as error:
+            abort(code=400, description=str(error))  # noqa: WPS432
+
+    if not batch.indices:
+        return _aligned_interval(batch, quantiles, None)
+    admission.enforce_deadline()
+    loaded_model = model_selection.selected_service().loaded_model
+    try:
+        interval = predict_interval(loaded_model, batch.matrix, quantiles)
+    except ValueError:
+        abort(code=400, description='Model is not a forest')  # noqa: WPS432
+    return _aligned_interval(batch, quantiles, interval)
+
+
+def _aligned_interval(
+    batch: codec.BatchInput,
+    quantiles: tuple[float, ...],
+    interval: PredictionInterval | None,
+) -> dict:
+    """
+    Align the interval of the valid items with all input items.
+
+    Args:
+        batch (codec.BatchInput): The decoded request body.
+        quantiles (tuple[float, ...]): The requested quantiles.
+        interval (PredictionInterval | None): Interval of valid items.
+
+    Returns:
+        dict: The response, with `null` values for invalid items.
+    """
+    means = [None for _ in range(batch.size)]
+    stds = [None for _ in range(batch.size)]
+    item_quantiles = {
+        str(quantile): [None for _ in range(batch.size)]
+        for quantile in quantiles
+    }
+    if interval is not None:
+        for position, index in enumerate(batch.indices):
+            means[index] = interval.mean[position]
+            stds[index] = interval.std[position]
+            for quantile in quantiles:
+                item_quantiles[str(quantile)][index] = (
+                    interval.quantiles[quantile][position]
+                )
+    return {
+        'mean': means,
+        'std': stds,
+        'quantiles': item_quantiles,
+        'errors': batch.errors,
+        'model_version': interval and interval.model_version,
+    }
+
+
+def _parse_quantiles(quantiles_arg: str | None) -> tuple[float, ...]:
+    """
+    Parse the comma-separated quantiles of the request.
+
+    Args:
+        quantiles_arg (str | None): The `quantiles` query parameter.
+
+    Returns:
+        tuple[float, ...]: The quantiles, the configured ones if omitted.
+    """
+    if quantiles_arg is None:
+        return serving_settings.interval_quantiles
+    try:
+        quantiles = tuple(float(part) for part in quantiles_arg.split(','))
+    except ValueError:
+        quantiles = ()
+    if not quantiles or not all(0 <= quantile <= 1 for quantile in quantiles):
+        abort(code=400, description='Invalid quantiles')  # noqa: WPS432
+    return quantiles
@@ -0,0 +1,168 @@
+"""
+Streaming prediction API module.
+
+This module contains an endpoint to score large numbers of apartments
+without holding the whole request or response in memory.
+
+Endpoints:
+    - POST /pred/stream:
+        Reads newline-delimited JSON apartments from the request body
+        as it arrives, scores them in fixed-size chunks and streams one
+        JSON line back per input line, in input order. A line is either
+        `{"index": ..., "prediction": ..., "model_version": ...}` or,
+        for invalid input, `{"index": ..., "detail": [...]}`, where
+        `index` is the zero-based line number. Blank lines are skipped.
+        The body is read through a buffer, rather than byte by byte by
+        the line iterator of the raw input stream. Lines are decoded
+        like the items of `/pred/batch`, with the JSON provider of the
+        application and the codec (`api.codec`), and get the same
+        validation errors.
+        The request passes admission control first (`api.admission`),
+        its deadline is checked again before the response starts, and
+        it holds its slot until the whole response is streamed. It can
+        select another model than the configured one by name and
+        version (`api.model_selection`).
+"""
+
+import io
+from collections.abc import Iterable, Iterator
+from itertools import islice
+
+import numpy as np
+from flask import Blueprint, Response, json, request, stream_with_context
+
+from api import admission, codec, model_selection
+from config import serving_settings
+from services.model_inference import ModelInferenceService
+
+INDEX = 'index'
+
+bp = Blueprint('prediction_stream', __name__, url_prefix='/pred')
+bp.before_request(admission.admit_request)
+bp.teardown_request(admission.release_request)
+
+
+@bp.post('/stream')
+def get_prediction_stream():
+    """
+    Stream predictions for newline-delimited JSON apartments.
+
+    Returns:
+        Response: Streamed newline-delimited JSON predictions.
+    """
+    admission.enforce_deadline()
+    inference_service = model_selection.selected_service()
+    lines = (
+        (index, line)
+        for index, line in enumerate(io.BufferedReader(request.stream))
+        if line.strip()
+    )
+    return Response(
+        stream_with_context(_score_stream(inference_service, lines)),
+        mimetype='application/x-ndjson',
+    )
+
+
+def _score_stream(
+    inference_service: ModelInferenceService,
+    lines: Iterable[tuple[int, bytes]],
+) -> Iterator[str]:
+    """
+    Score the input lines chunk by chunk.
+
+    Args:
+        inference_service (ModelInferenceService): Service to score with.
+        lines (Iterable[tuple[int, bytes]]): Numbered non-blank lines.
+
+    Yields:
+        str: The output lines of one chunk.
+    """
+    lines = iter(lines)
+    chunk = list(islice(lines, serving_settings.stream_chunk_size))
+    while chunk:
+        yield _score_chunk(inference_service, chunk)
+        chunk = list(islice(lines, serving_settings.stream_chunk_size))
+
+
+def _score_chunk(
+    inference_service: ModelInferenceService,
+    chunk: list[tuple[int, bytes]],
+) -> str:
+    """
+    Validate and score one chunk of input lines with a single predict.
+
+    Args:
+        inference_service (ModelInferenceService): Service to score with.
+        chunk (list[tuple[int, bytes]]): Input lines with their number.
+
+    Returns:
+        str: One JSON line per input line, in input order.
+    """
+    apartments, output = _parse_chunk(chunk)
+    line_numbers = [line_index for line_index, _ in apartments]
+    batch = codec.decode_batch([apartment for _, apartment in apartments])
+    for error in batch.errors:
+        line_index = line_numbers[error[INDEX]]
+        output[line_index] = {**error, INDEX: line_index}
+    if batch.indices:
+        output.update(_predict_rows(
+            inference_service,
+            [line_numbers[position] for position in batch.indices],
+            batch.matrix,
+        ))
+
+    encoded = (json.dumps(output[line_index]) for line_index, _ in chunk)
+    return ''.join(f'{output_line}\n' for output_line in encoded)
+
+
+def _parse_chunk(chunk: list[tuple[int, bytes]]) -> tuple[list, dict]:
+    """
+    Parse the JSON of every line of a chunk.
+
+    Args:
+        chunk (list[tuple[int, bytes]]): Input lines with their number.
+
+    Returns:
+        tuple: Parsed items paired with their line number, and the
+            output lines of the lines which are not valid JSON.
+    """
+    apartments = []
+    output = {}
+    for index, line in chunk:
+        try:
+            apartments.append((index, json.loads(line)))
+        except ValueError:
+            output[index] = {
+                INDEX: index,
+                'detail': [{'loc': [], 'msg': 'Invalid JSON'}],
+            }
+    return apartments, output
+
+
+def _predict_rows(
+    inference_service: ModelInferenceService,
+    line_numbers: list[int],
+    input_matrix: np.ndarray,
+) -> dict[int, dict]:
+    """
+    Score validated rows with a single predict.
+
+    Args:
+        inference_service (ModelInferenceService): Service to score with.
+        line_numbers (list[int]): Line number of every row.
+        input_matrix (np.ndarray): Feature rows of the valid lines.
+
+    Returns:
+        dict[int, dict]: Output lines keyed by line number.
+    """
+    prediction = inference_service.predict_batch(input_matrix)
+    return {
+        index: {
+            INDEX: index,
+            'prediction': row_prediction,
+            'model_version': prediction.model_version,
+        }
+        for index, row_prediction in zip(
+            line_numbers, prediction.predictions,
+        )
+    }
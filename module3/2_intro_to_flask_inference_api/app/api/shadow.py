@@ -0,0 +1,35 @@
+"""
+Shadow scoring API module.
+
+This module contains an endpoint exposing the comparison of a candidate
+model with the live model on sampled live traffic (`services.shadow`).
+
+Endpoints:
+    - GET /stats/shadow:
+        Returns the versions of both models, the number of compared,
+        dropped and failed requests, the mean and largest prediction
+        deltas, candidate minus live, and the mean latencies of both
+        models.
+        Returns HTTP status 404 if shadow scoring is disabled.
+"""
+
+from flask import Blueprint, abort
+
+from services.serving import shadow_scorer
+
+
+bp = Blueprint('shadow', __name__, url_prefix='/stats')
+
+
+@bp.get('/shadow')
+def get_shadow_stats():
+    """
+    Return the report of the shadow scoring of the candidate model.
+
+    Returns:
+        dict: Prediction deltas and latencies of both models.
+    """
+    if shadow_scorer is None:
+        abort(code=404, description='Shadowing is disabled')  # noqa: WPS432
+
+    return shadow_scorer.snapshot()
@@ -0,0 +1,63 @@
+"""
+Stats API module.
+
+This module contains endpoints exposing the internal statistics of
+the inference service.
+
+Endpoints:
+    - GET /stats/batching:
+        Returns the batch size and queueing delay distributions of the
+        request coalescing layer.
+        Returns HTTP status 404 if request coalescing is disabled.
+
+    - GET /stats/cache:
+        Returns the size, hits, misses and evictions of the prediction
+        cache of the model inference service.
+
+    - GET /stats/models:
+        Returns the memory budget and usage of the model pool, and the
+        models resident in it from least to most recently used.
+"""
+
+from flask import Blueprint, abort
+
+from services import serving
+
+
+bp = Blueprint('stats', __name__, url_prefix='/stats')
+
+
+@bp.get('/batching')
+def get_batching_stats():
+    """
+    Return the statistics of the request coalescing layer.
+
+    Returns:
+        dict: Batch size and queueing delay distributions.
+    """
+    if serving.prediction_batcher is None:
+        abort(code=404, description='Coalescing is disabled')  # noqa: WPS432
+
+    return serving.prediction_batcher.stats.snapshot()
+
+
+@bp.get('/cache')
+def get_cache_stats():
+    """
+    Return the statistics of the prediction cache.
+
+    Returns:
+        dict: Size, max size, hits, misses and evictions of the cache.
+    """
+    return serving.model_inference_service.cache.snapshot()
+
+
+@bp.get('/models')
+def get_model_pool_stats():
+    """
+    Return the statistics of the model pool.
+
+    Returns:
+        dict: Memory budget and usage, and the resident models.
+    """
+    return serving.model_pool.snapshot()
@@ -0,0 +1,99 @@
+"""
+Validation helpers for the prediction API.
+
+This module validates raw request items against the Apartment schema
+and converts validation errors into JSON-serializable details. Batch
+items are also rejected if a feature does not fit in the int64 feature
+matrix of a batch.
+"""
+
+from collections.abc import Iterable
+
+import numpy as np
+from pydantic import ValidationError
+
+from schema.apartment import Apartment
+from services.metrics import stage_latency
+
+INT64 = np.iinfo(np.int64)
+
+
+def validate_apartments(
+    apartments: Iterable[tuple[int, object]],
+) -> tuple[dict[int, list], list[dict]]:
+    """
+    Validate every item of a batch against the Apartment schema.
+
+    Args:
+        apartments (Iterable[tuple[int, object]]): Raw items from the
+            request body, paired with their index.
+
+    Returns:
+        tuple: Feature rows of the valid items keyed by their index,
+            and the validation errors of the invalid items.
+    """
+    input_rows = {}
+    errors = []
+    with stage_latency.time('validation'):
+        for index, apartment in apartments:
+            try:
+                apartment_features = Apartment.model_validate(apartment)
+            except ValidationError as error:
+                errors.append({
+                    'index': index, 'detail': error_details(error),
+                })
+                continue
+            features = apartment_features.model_dump()
+            if fits_int64(features.values()):
+                input_rows[index] = list(features.values())
+            else:
+                errors.append({
+                    'index': index, 'detail': _overflow_details(features),
+                })
+    return input_rows, errors
+
+
+def fits_int64(features: Iterable[int]) -> bool:
+    """
+    Check whether integer features fit in a 64-bit integer.
+
+    Args:
+        features (Iterable[int]): The integer features of an item.
+
+    Returns:
+        bool: Whether every feature is within the int64 range.
+    """
+    return all(INT64.min <= feature <= INT64.max for feature in features)
+
+
+def error_details(error: ValidationError) -> list[dict]:
+    """
+    Convert a validation error into a JSON-serializable list.
+
+    Args:
+        error (ValidationError): The error raised by the Apartment schema.
+
+    Returns:
+        list[dict]: Location and message of every failed field.
+    """
+    return [
+        {'loc': list(detail['loc']), 'msg': detail['msg']}
+        for detail in error.errors()
+    ]
+
+
+def _overflow_details(features: dict[str, int]) -> list[dict]:
+    """
+    Describe the features which do not fit in a 64-bit integer.
+
+    Args:
+        features (dict[str, int]): The validated features of an item.
+
+    Returns:
+        list[dict]: Location and message of every out-of-range field.
+    """
+    return [
+        {'loc': [name], 'msg': 'Input should fit in a 64-bit integer'}
+        for name, feature in features.items()
+        if not fits_int64([feature])
+    ]
@@ -0,0 +1,55 @@
+"""
+Async Application Entry Point.
+
+This module serves the prediction API as an ASGI application.
+
+Usage:
+    The Quart application is created here, and the async prediction
+    blueprint (`api.prediction_async.bp`) is registered with it. Running
+    this module serves it with hypercorn, where a single process keeps
+    many keep-alive connections open on its event loop while the
+    predictions run on the executor of the AsyncInferenceService.
+    The stage latencies it records are exposed in the Prometheus text
+    format on GET /metrics, like on the WSGI application.
+"""
+
+import asyncio
+
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
+from quart import Quart, Response
+
+from api import prediction_async
+from config import serving_settings
+from services import metrics
+from services.serving import async_inference_service
+
+
+app = Quart(__name__)
+app.register_blueprint(prediction_async.bp)
+
+
+@app.get('/metrics')
+async def get_metrics() -> Response:
+    """
+    Return all metrics in the Prometheus text format.
+
+    Returns:
+        Response: The text exposition of all metrics.
+    """
+    return Response(
+        metrics.registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
+
+@app.after_serving
+async def shutdown_executor() -> None:
+    """Stop the prediction executor when the server shuts down."""
+    async_inference_service.shutdown()
+
+
+if __name__ == '__main__':
+    config = Config()
+    config.bind = [serving_settings.server_bind]
+    asyncio.run(serve(app, config))
@@ -0,0 +1,92 @@
+"""
+Benchmark of the sklearn and compiled inference engines.
+
+It loads the configured model, checks that the compiled forest returns
+bit-identical predictions on random apartments and compares the
+latency per call of both engines for single rows and small batches.
+
+Usage:
+    cd app; python -m benchmarks.forest_engine
+"""
+
+import pickle as pk
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+from config import model_settings
+from services.compiled_forest import CompiledForest
+
+BATCH_SIZES = (1, 8, 64)
+CHECK_ROWS = 10000
+CALLS = 20
+REPEATS = 5
+MILLISECONDS = 1e3
+SEED = 42
+FEATURE_RANGES = (
+    (20, 300),
+    (1900, 2030),
+    (0, 6),
+    (0, 100),
+    (0, 2),
+    (0, 2),
+    (0, 2),
+    (0, 2),
+    (0, 2),
+)
+
+
+def random_apartments(size: int) -> np.ndarray:
+    """
+    Draw random apartments within plausible feature ranges.
+
+    Args:
+        size (int): Number of apartments.
+
+    Returns:
+        np.ndarray: The feature matrix of the apartments.
+    """
+    generator = np.random.default_rng(SEED)
+    return np.column_stack([
+        generator.integers(low, high, size)
+        for low, high in FEATURE_RANGES
+    ]).astype(np.float64)
+
+
+def _report(label: str, function, input_matrix: np.ndarray) -> None:
+    """
+    Print the best time per call of an engine.
+
+    Args:
+        label (str): Name of the benchmarked engine and batch.
+        function: The predict function to benchmark.
+        input_matrix (np.ndarray): The rows to score per call.
+    """
+    best = min(timeit.repeat(
+        lambda: function(input_matrix), number=CALLS, repeat=REPEATS,
+    ))
+    per_call = best / CALLS * MILLISECONDS
+    print(f'{label:<32}{per_call:>12.3f} ms')  # noqa: WPS421
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    model_path = Path(model_settings.model_path) / model_settings.model_name
+    estimator = pk.loads(model_path.read_bytes())
+    compiled = CompiledForest.from_estimator(estimator)
+
+    apartments = random_apartments(CHECK_ROWS)
+    identical = np.array_equal(
+        estimator.predict(apartments), compiled.predict(apartments),
+    )
+    print(f'bit-identical on {CHECK_ROWS} rows: {identical}')  # noqa: WPS421
+
+    for batch_size in BATCH_SIZES:
+        batch = apartments[:batch_size]
+        _report(f'{batch_size} rows, sklearn', estimator.predict, batch)
+        _report(f'{batch_size} rows, compiled', compiled.predict, batch)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark of the request decoding and response encoding paths.
+
+It compares, per request and with a row sum standing in for the model
+predict, the original
+path of the prediction API (json, Apartment validation, model_dump,
+list conversion and the json encoder) with the fast path (orjson,
+`api.codec` and orjson with numpy support), for single apartments,
+batches of apartments and columnar batches.
+
+Usage:
+    cd app; python -m benchmarks.request_codec
+"""
+
+import json
+import timeit
+from types import MappingProxyType
+
+import numpy as np
+import orjson
+
+from api import codec
+from schema.apartment import Apartment
+
+APARTMENT = MappingProxyType({
+    'area': 85,
+    'constraction_year': 2015,
+    'bedrooms': 2,
+    'garden_area': 20,
+    'balcony_present': 1,
+    'parking_present': 1,
+    'furnished': 0,
+    'garage_present': 0,
+    'storage_present': 1,
+})
+BATCH_SIZE = 1000
+SINGLE_CALLS = 10000
+BATCH_CALLS = 20
+REPEATS = 5
+MICROSECONDS = 1e6
+
+
+def current_single(body: bytes) -> bytes:
+    """
+    Decode and encode a single apartment as the original API did.
+
+    Args:
+        body (bytes): The JSON request body.
+
+    Returns:
+        bytes: The JSON response body.
+    """
+    apartment_features = Apartment(**json.loads(body))
+    input_row = list(apartment_features.model_dump().values())
+    prediction = np.asarray([input_row], dtype=np.float64).sum(axis=1)
+    prediction = prediction.tolist()
+    return json.dumps({'prediction': prediction}).encode()
+
+
+def fast_single(body: bytes) -> bytes:
+    """
+    Decode and encode a single apartment with the fast path.
+
+    Args:
+        body (bytes): The JSON request body.
+
+    Returns:
+        bytes: The JSON response body.
+    """
+    input_row = codec.decode_row(orjson.loads(body))
+    prediction = np.asarray([input_row], dtype=np.float64).sum(axis=1)
+    return orjson.dumps(
+        {'prediction': prediction}, option=orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+def current_batch(body: bytes) -> bytes:
+    """
+    Decode and encode a batch as the original API did.
+
+    Args:
+        body (bytes): The JSON request body.
+
+    Returns:
+        bytes: The JSON response body.
+    """
+    input_matrix = [
+        list(Apartment(**apartment).model_dump().values())
+        for apartment in json.loads(body)
+    ]
+    predictions = np.array(input_matrix, dtype=np.float64).sum(axis=1)
+    return json.dumps({'predictions': predictions.tolist()}).encode()
+
+
+def fast_batch(body: bytes) -> bytes:
+    """
+    Decode and encode a batch or a columnar batch with the fast path.
+
+    Args:
+        body (bytes): The JSON request body.
+
+    Returns:
+        bytes: The JSON response body.
+    """
+    batch = codec.decode_batch(orjson.loads(body))
+    predictions = batch.matrix.sum(axis=1, dtype=np.float64)
+    return orjson.dumps(
+        {'predictions': predictions}, option=orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+def _report(label: str, function, body: bytes, number: int) -> None:
+    """
+    Print the best time per call of a decoding path.
+
+    Args:
+        label (str): Name of the benchmarked path.
+        function: The path to benchmark.
+        body (bytes): The JSON request body to decode.
+        number (int): Number of calls per measurement.
+    """
+    best = min(timeit.repeat(
+        lambda: function(body), number=number, repeat=REPEATS,
+    ))
+    per_call = best / number * MICROSECONDS
+    print(f'{label:<32}{per_call:>12.1f} us')  # noqa: WPS421
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    single = orjson.dumps(dict(APARTMENT))
+    batch = orjson.dumps([dict(APARTMENT) for _ in range(BATCH_SIZE)])
+    columnar = orjson.dumps({
+        name: [feature_value for _ in range(BATCH_SIZE)]
+        for name, feature_value in APARTMENT.items()
+    })
+    _report('single, current path', current_single, single, SINGLE_CALLS)
+    _report('single, fast path', fast_single, single, SINGLE_CALLS)
+    _report('batch, current path', current_batch, batch, BATCH_CALLS)
+    _report('batch, fast path', fast_batch, batch, BATCH_CALLS)
+    _report('columnar batch, fast path', fast_batch, columnar, BATCH_CALLS)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,3 @@
 from .logger import configure_logging
 from .model import model_settings
+from .serving import serving_settings
@@ -17,6 +17,7 @@ class ModelSettings(BaseSettings):
         model_config (SettingsConfigDict): Model config, loaded from .env file.
         model_path (DirectoryPath): Filesystem path to the model.
         model_name (str): Name of the ML model.
+        model_version (str): Registry version, latest or pinned to serve.
     """
 
     model_config = SettingsConfigDict(
@@ -27,6 +28,7 @@ class ModelSettings(BaseSettings):
 
     model_path: DirectoryPath
     model_name: str
+    model_version: str = ''
 
 
 model_settings = ModelSettings()
@@ -0,0 +1,93 @@
+"""
+This module sets up the serving configuration.
+
+It utilizes Pydantic's BaseSettings for configuration management,
+allowing settings to be read from environment variables and a .env file.
+"""
+
+from typing import Literal
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ServingSettings(BaseSettings):
+    """
+    Serving configuration settings for the application.
+
+    Attributes:
+        model_config (SettingsConfigDict): Model config, loaded from .env file.
+        batching_enabled (bool): Whether to coalesce concurrent requests.
+        batching_window_ms (float): Time to wait for a batch to fill, in ms.
+        batching_max_size (int): Largest number of rows in one batch.
+        prediction_cache_size (int): Size of the LRU prediction cache.
+        model_pool_max_mb (int): Memory budget of the pooled models, in MB.
+        shadow_enabled (bool): Whether to compare a candidate model.
+        shadow_model_name (str): Name of the candidate, empty for the same.
+        shadow_model_version (str): Registry version of the candidate.
+        shadow_sample_rate (float): Fraction of the requests to compare.
+        shadow_queue_size (int): Largest number of queued comparisons.
+        inference_engine (str): Evaluator of the forest, sklearn or compiled.
+        interval_quantiles (tuple): Default quantiles of the intervals.
+        warmup_max_rounds (int): Most synthetic rounds of a model warm-up.
+        warmup_batch_size (int): Rows of the batch of every warm-up round.
+        warmup_window (int): Rounds compared to detect settled latency.
+        warmup_tolerance (float): Relative change of a settled latency.
+        warmup_max_seconds (float): Warm-up time before ready regardless.
+        warmup_on_load (bool): Whether to warm the first model up on load.
+        bucket_index_enabled (bool): Whether to cache per threshold bucket.
+        stream_chunk_size (int): Rows scored at once by streaming requests.
+        model_watch_interval (float): Seconds between model file checks.
+        admission_max_concurrency (int): Concurrent requests, 0 for no limit.
+        admission_max_queue (int): Requests waiting for a free slot.
+        admission_queue_timeout (float): Longest wait for a slot, in s.
+        admission_retry_after (int): Retry-After of rejected requests, in s.
+        async_executor (str): Kind of executor running async predictions.
+        async_executor_workers (int): Size of the async executor.
+        server_bind (str): Address the production server listens on.
+        server_workers (int): Number of forked worker processes.
+        server_threads (int): Number of request threads per worker.
+        server_max_requests (int): Requests before a worker is recycled.
+        server_max_requests_jitter (int): Random spread of the recycling.
+    """
+
+    model_config = SettingsConfigDict(
+        env_file='config/.env',
+        env_file_encoding='utf-8',
+        extra='ignore',
+    )
+
+    batching_enabled: bool = False
+    batching_window_ms: float = 2
+    batching_max_size: int = 64
+    prediction_cache_size: int = 4096
+    model_pool_max_mb: int = 1024
+    shadow_enabled: bool = False
+    shadow_model_name: str = ''
+    shadow_model_version: str = ''
+    shadow_sample_rate: float = 0.1
+    shadow_queue_size: int = 1024
+    inference_engine: Literal['sklearn', 'compiled'] = 'sklearn'
+    interval_quantiles: tuple[float, ...] = (0.05, 0.5, 0.95)
+    warmup_max_rounds: int = 100
+    warmup_batch_size: int = 32
+    warmup_window: int = 5
+    warmup_tolerance: float = 0.2
+    warmup_max_seconds: float = 60
+    warmup_on_load: bool = True
+    bucket_index_enabled: bool = False
+    stream_chunk_size: int = 1024
+    model_watch_interval: float = 0
+    admission_max_concurrency: int = 0
+    admission_max_queue: int = 64
+    admission_queue_timeout: float = 1
+    admission_retry_after: int = 1
+    async_executor: Literal['thread', 'process'] = 'thread'
+    async_executor_workers: int = 4
+    server_bind: str = '127.0.0.1:8000'
+    server_workers: int = 4
+    server_threads: int = 4
+    server_max_requests: int = 10000
+    server_max_requests_jitter: int = 1000
+
+
+serving_settings = ServingSettings()
@@ -0,0 +1,72 @@
+"""
+Convert a pickled forest into a memory-mappable forest artifact.
+
+The artifact keeps the version of the pickle, so both files are served
+as the same model version. Point MODEL_NAME at the artifact to serve it.
+With --compact, the forest is re-encoded with the narrowest safe dtypes
+and the size saving and largest prediction deviation are reported.
+The compact forest predicts slightly differently, so its artifact gets
+its own version, the content hash of its arrays.
+
+Usage:
+    cd app; python convert_model.py model/rf_db_v3 model/rf_db_v3.forest
+
+    or `make convert CONVERT_MODEL=model/rf_db_v3 CONVERT_FLAGS=--compact`.
+"""
+
+import argparse
+import pickle as pk
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from services.compiled_forest import CompiledForest
+from services import forest_compaction
+from services.forest_artifact import save_forest
+from services.model_files import content_version
+
+
+def main() -> None:
+    """Convert the pickle given on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('source', type=Path, help='pickled forest')
+    parser.add_argument('target', type=Path, help='artifact to write')
+    parser.add_argument(
+        '--compact', action='store_true', help='use the narrowest dtypes',
+    )
+    arguments = parser.parse_args()
+
+    model_bytes = arguments.source.read_bytes()
+    forest = CompiledForest.from_estimator(pk.loads(model_bytes))
+    version = content_version(model_bytes)
+    if arguments.compact:
+        forest = _compact(forest)
+        version = content_version(b''.join(
+            np.ascontiguousarray(array).tobytes() for array in forest.arrays
+        ))
+    save_forest(forest, version, arguments.target)
+    logger.info(f'wrote forest artifact {arguments.target} version {version}')
+
+
+def _compact(forest: CompiledForest) -> CompiledForest:
+    """
+    Compact a forest, reporting the saving and the deviation.
+
+    Args:
+        forest (CompiledForest): The forest to compact.
+
+    Returns:
+        CompiledForest: The compact forest.
+    """
+    compact_forest = forest_compaction.compact(forest)
+    size = forest_compaction.forest_size(forest)
+    compact_size = forest_compaction.forest_size(compact_forest)
+    deviation = forest_compaction.max_deviation(forest, compact_forest)
+    logger.info(f'forest arrays: {size} -> {compact_size} bytes')
+    logger.info(f'largest deviation: {deviation:.3g}')
+    return compact_forest
+
+
+if __name__ == '__main__':
+    main()
@@ -5,17 +5,34 @@ This module serves as the entry point for the Flask application.
 
 Usage:
     The Flask application is created and initialized here.
-    The prediction blueprint (`api.prediction.bp`) is registered
-    with the application.
+    The prediction blueprints (`api.prediction.bp`,
+    `api.prediction_stream.bp` and `api.prediction_interval.bp`), the
+    stats blueprint (`api.stats.bp`), the shadow scoring blueprint
+    (`api.shadow.bp`), the admin blueprint (`api.admin.bp`), the health
+    blueprint (`api.health.bp`) and the metrics blueprint
+    (`api.metrics.bp`) are registered with the application, which
+    serializes JSON with the timed orjson provider
+    (`api.json_provider.FastJSONProvider`).
 """
 
 from flask import Flask
 
-from api.prediction import bp
+from api import admin, metrics, prediction, prediction_stream, shadow, stats
+from api.health import bp as health_bp
+from api.json_provider import FastJSONProvider
+from api.prediction_interval import bp as prediction_interval_bp
 
 
 app = Flask(__name__)
-app.register_blueprint(bp)
+app.json = FastJSONProvider(app)
+app.register_blueprint(prediction.bp)
+app.register_blueprint(prediction_stream.bp)
+app.register_blueprint(prediction_interval_bp)
+app.register_blueprint(stats.bp)
+app.register_blueprint(shadow.bp)
+app.register_blueprint(admin.bp)
+app.register_blueprint(health_bp)
+app.register_blueprint(metrics.bp)
 
 if __name__ == '__main__':
     app.run(debug=True)  # noqa: S201
@@ -0,0 +1,165 @@
+"""
+Production Application Entry Point.
+
+This module serves the Flask application with a pre-forking
+gunicorn server.
+
+Usage:
+    The application, and with it the model, is imported once in the
+    master process, with `warmup_on_load` turned off first: a warm-up
+    thread of the master would only compete with the workers for the
+    CPU, and would not survive the fork anyway. The heap is then frozen
+    so the garbage collector does not touch the objects of the loaded
+    forest, and the workers forked afterwards keep sharing those pages
+    copy-on-write. Every worker warms the model up in the background,
+    reporting not ready until it is warm, and reports its resident
+    (RSS) and proportional (PSS) memory when it starts and when it
+    exits.
+"""
+
+import gc
+import os
+from pathlib import Path
+
+from gunicorn.app.base import BaseApplication
+from loguru import logger
+
+from config import serving_settings
+from services.warmup import ModelWarmup
+
+
+class InferenceApplication(BaseApplication):
+    """
+    A gunicorn application serving an already loaded Flask app.
+
+    Attributes:
+        application: The WSGI application to serve.
+        service: The inference service of the application.
+        options: Gunicorn settings to apply.
+    """
+
+    def __init__(self, application, service, options: dict) -> None:
+        """
+        Initialize the InferenceApplication.
+
+        Args:
+            application: The WSGI application to serve.
+            service: The inference service of the application.
+            options (dict): Gunicorn settings to apply.
+        """
+        self.application = application
+        self.service = service
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        """Apply the gunicorn settings."""
+        for option_name, option_value in self.options.items():
+            self.cfg.set(option_name, option_value)
+
+    def load(self):
+        """
+        Return the application to serve in the workers.
+
+        Returns:
+            The WSGI application.
+        """
+        return self.application
+
+
+def memory_usage(pid: int) -> dict[str, int]:
+    """
+    Read the resident and proportional memory of a process.
+
+    Args:
+        pid (int): Id of the process.
+
+    Returns:
+        dict[str, int]: RSS and PSS of the process, in kB.
+    """
+    smaps_rollup = Path(f'/proc/{pid}/smaps_rollup')
+    if not smaps_rollup.exists():
+        return {}
+    usage = {}
+    for line in smaps_rollup.read_text().splitlines():
+        field, _, amount = line.partition(':')
+        if field in {'Rss', 'Pss'}:
+            usage[field.lower()] = int(amount.split()[0])
+    return usage
+
+
+def _init_worker(worker) -> None:
+    """
+    Warm up the model in a freshly forked worker.
+
+    The master does not warm the model up, so each worker runs the
+    warm-up in the background, and its readiness probe answers 503
+    until it is warm. Later reloads of the worker warm up again.
+
+    Args:
+        worker: The gunicorn worker to initialize.
+    """
+    serving_settings.warmup_on_load = True
+    service = worker.app.service
+    loaded_model = service.loaded_model
+    warmup = ModelWarmup(loaded_model.estimator)
+    service.loaded_model = loaded_model._replace(  # noqa: WPS437
+        warmup=warmup,
+    )
+    warmup.start()
+    _report_memory(worker)
+
+
+def _report_memory(worker) -> None:
+    """
+    Log the memory usage of a worker.
+
+    Args:
+        worker: The gunicorn worker to report on.
+    """
+    usage = memory_usage(worker.pid)
+    logger.info(f'worker {worker.pid} memory (kB): {usage}')
+
+
+def _report_exit_memory(_, worker) -> None:
+    """
+    Log the memory usage of a worker which is about to exit.
+
+    Args:
+        worker: The gunicorn worker to report on.
+    """
+    _report_memory(worker)
+
+
+def main() -> None:
+    """Load the application, freeze the heap and start the workers."""
+    serving_settings.warmup_on_load = False
+    from run import app  # noqa: WPS433
+    from services.serving import model_inference_service  # noqa: WPS433
+
+    gc.collect()
+    gc.freeze()
+    usage = memory_usage(os.getpid())
+    logger.info(
+        f'starting {serving_settings.server_workers} workers, '
+        f'master memory (kB): {usage}',
+    )
+    InferenceApplication(
+        app,
+        model_inference_service,
+        {
+            'bind': serving_settings.server_bind,
+            'workers': serving_settings.server_workers,
+            'threads': serving_settings.server_threads,
+            'max_requests': serving_settings.server_max_requests,
+            'max_requests_jitter': (
+                serving_settings.server_max_requests_jitter
+            ),
+            'post_worker_init': _init_worker,
+            'worker_exit': _report_exit_memory,
+        },
+    ).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,7 @@
+from .admission import AdmissionController
+from .async_inference import AsyncInferenceService
+from .batching import PredictionBatcher
 from .model_inference import ModelInferenceService
-
-
-model_inference_service = ModelInferenceService()
-model_inference_service.load_model()
+from .model_pool import ModelPool
+from .model_watcher import ModelWatcher
+from .shadow import ShadowScorer
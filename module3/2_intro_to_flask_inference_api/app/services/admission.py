@@ -0,0 +1,138 @@
+"""
+This module provides admission control for the inference service.
+
+It contains the AdmissionController class, which bounds the number of
+requests running concurrently and the number of requests waiting for
+a free slot, and drops requests whose deadline has already passed,
+together with the errors it raises when a request is not admitted. The
+deadline is checked again right before inference with `check_deadline`,
+since an admitted request can still outlive it while being parsed.
+"""
+
+import threading
+import time
+
+from services.metrics import requests_shed_total
+
+
+class RequestRejectedError(Exception):
+    """Base class of the reasons for not admitting a request."""
+
+
+class OverloadedError(RequestRejectedError):
+    """Raised when all slots are taken and the wait queue is full."""
+
+
+class DeadlineExceededError(RequestRejectedError):
+    """Raised when the deadline of a request passed before inference."""
+
+
+class AdmissionController:
+    """
+    A concurrency limit with a bounded wait queue and deadlines.
+
+    A request first tries to take a free slot; if there is none, it
+    waits in the queue for at most the queue timeout, or until its
+    deadline. A max concurrency of zero disables the limit, so only
+    deadlines are enforced.
+
+    Attributes:
+        max_concurrency: Largest number of requests running at once.
+        max_queue: Largest number of requests waiting for a slot.
+        queue_timeout: Longest time a request waits for a slot, in s.
+
+    Methods:
+        __init__: Constructor that initializes the AdmissionController.
+        acquire: Admits a request or raises why it is rejected.
+        release: Frees the slot of a finished request.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: float,
+    ) -> None:
+        """
+        Initialize the AdmissionController.
+
+        Args:
+            max_concurrency (int): Largest number of concurrent requests.
+            max_queue (int): Largest number of waiting requests.
+            queue_timeout (float): Longest wait for a slot, in seconds.
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max(max_concurrency, 1))
+        self._waiting = 0
+        self._waiting_lock = threading.Lock()
+
+    def acquire(self, deadline: float | None = None) -> None:
+        """
+        Admit a request, waiting in the queue for a slot if needed.
+
+        Args:
+            deadline (float | None): UNIX time after which the result of
+                the request is no longer needed.
+
+        Raises:
+            OverloadedError: If no slot became free in time.
+            DeadlineExceededError: If the deadline passed before admission.
+        """
+        check_deadline(deadline)
+        if self.max_concurrency <= 0:
+            return
+        if self._slots.acquire(blocking=False):
+            return
+        if not self._wait_for_slot(deadline):
+            check_deadline(deadline)
+            requests_shed_total.inc('overloaded')
+            raise OverloadedError('Too many requests')
+        try:
+            check_deadline(deadline)
+        except DeadlineExceededError:
+            self._slots.release()
+            raise
+
+    def release(self) -> None:
+        """Free the slot of a finished request."""
+        if self.max_concurrency > 0:
+            self._slots.release()
+
+    def _wait_for_slot(self, deadline: float | None) -> bool:
+        """
+        Wait in the queue for a free slot.
+
+        Args:
+            deadline (float | None): UNIX time after which to stop waiting.
+
+        Returns:
+            bool: Whether a slot was taken.
+        """
+        with self._waiting_lock:
+            if self._waiting >= self.max_queue:
+                return False
+            self._waiting += 1
+        timeout = self.queue_timeout
+        if deadline is not None:
+            timeout = min(timeout, max(deadline - time.time(), 0))
+        acquired = self._slots.acquire(timeout=timeout)
+        with self._waiting_lock:
+            self._waiting -= 1
+        return acquired
+
+
+def check_deadline(deadline: float | None) -> None:
+    """
+    Reject a request whose deadline has passed.
+
+    Args:
+        deadline (float | None): UNIX time of the deadline, if any.
+
+    Raises:
+        DeadlineExceededError: If the deadline has passed.
+    """
+    if deadline is not None and deadline <= time.time():
+        requests_shed_total.inc('deadline_exceeded')
+        raise DeadlineExceededError('Request deadline exceeded')
@@ -0,0 +1,133 @@
+"""
+This module provides non-blocking predictions for async servers.
+
+It contains the AsyncInferenceService class, which runs the CPU-bound
+predictions of a ModelInferenceService on a bounded thread or process
+pool, so the event loop of an async server stays free for I/O.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent import futures
+
+from services.model_inference import ModelInferenceService, Prediction
+
+_forked_services = {}
+
+
+class AsyncInferenceService:
+    """
+    An awaitable front of the ModelInferenceService.
+
+    With a thread executor all threads share the model, and sklearn
+    releases the GIL while traversing the trees. With a process executor
+    the workers are forked from the serving process and inherit its
+    loaded model copy-on-write, but each one keeps its own prediction
+    cache and does not see later model reloads.
+
+    Attributes:
+        executor: The pool running the predictions.
+
+    Methods:
+        __init__: Constructor that initializes the AsyncInferenceService.
+        predict: Makes a prediction in the executor.
+        predict_batch: Makes predictions for many rows in the executor.
+        shutdown: Stops the executor.
+    """
+
+    def __init__(
+        self,
+        inference_service: ModelInferenceService,
+        executor_kind: str,
+        max_workers: int,
+    ) -> None:
+        """
+        Initialize the AsyncInferenceService.
+
+        Args:
+            inference_service (ModelInferenceService): Service to offload.
+            executor_kind (str): Either `thread` or `process`.
+            max_workers (int): Largest number of concurrent predictions.
+        """
+        self._inference_service = inference_service
+        self.executor = _create_executor(
+            inference_service, executor_kind, max_workers,
+        )
+
+    async def predict(self, input_parameters: list) -> Prediction:
+        """
+        Make a prediction without blocking the event loop.
+
+        Args:
+            input_parameters (list): The input data for making a prediction.
+
+        Returns:
+            Prediction: The prediction result from the model.
+        """
+        return await self.predict_batch([input_parameters])
+
+    async def predict_batch(self, input_matrix: list[list]) -> Prediction:
+        """
+        Make predictions for several rows without blocking the event loop.
+
+        Args:
+            input_matrix (list[list]): Rows of input data, one per item.
+
+        Returns:
+            Prediction: The prediction results, in the order of the rows.
+        """
+        loop = asyncio.get_running_loop()
+        if isinstance(self.executor, futures.ProcessPoolExecutor):
+            return await loop.run_in_executor(
+                self.executor, _predict_batch_in_process, input_matrix,
+            )
+        return await loop.run_in_executor(
+            self.executor,
+            self._inference_service.predict_batch,
+            input_matrix,
+        )
+
+    def shutdown(self) -> None:
+        """Stop the executor once the running predictions are done."""
+        self.executor.shutdown(wait=True)
+
+
+def _create_executor(
+    inference_service: ModelInferenceService,
+    executor_kind: str,
+    max_workers: int,
+) -> futures.Executor:
+    """
+    Create the pool running the predictions.
+
+    Args:
+        inference_service (ModelInferenceService): Service to offload.
+        executor_kind (str): Either `thread` or `process`.
+        max_workers (int): Largest number of concurrent predictions.
+
+    Returns:
+        futures.Executor: A thread or a forking process pool.
+    """
+    if executor_kind == 'process':
+        _forked_services['inference'] = inference_service
+        return futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('fork'),
+        )
+    return futures.ThreadPoolExecutor(
+        max_workers=max_workers,
+        thread_name_prefix='inference',
+    )
+
+
+def _predict_batch_in_process(input_matrix: list[list]) -> Prediction:
+    """
+    Make predictions with the service inherited by a forked worker.
+
+    Args:
+        input_matrix (list[list]): Rows of input data, one per item.
+
+    Returns:
+        Prediction: The prediction results, in the order of the rows.
+    """
+    return _forked_services['inference'].predict_batch(input_matrix)
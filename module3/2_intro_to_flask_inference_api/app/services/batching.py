@@ -0,0 +1,242 @@
+"""
+This module provides request coalescing in front of the model.
+
+It contains the PredictionBatcher class, which gathers single-row
+prediction requests arriving from concurrent threads within a short
+window, scores them as one matrix and hands each caller its own result.
+The BatchingStats class keeps track of batch sizes and queueing delays.
+"""
+
+import queue
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import Future
+
+from loguru import logger
+
+from services.model_inference import ModelInferenceService, Prediction
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+QUEUE_DELAY_BUCKETS_MS = (0.1, 0.5, 1, 2, 5, 10, 25, 50, 100)
+
+
+class BatchingStats:
+    """
+    Thread-safe statistics of the batches scored by a PredictionBatcher.
+
+    Attributes:
+        batch_size_counts: Number of batches per batch size bucket.
+        queue_delay_counts: Number of requests per queueing delay bucket.
+        batches: Total number of scored batches.
+        requests: Total number of scored requests.
+        queue_delay_ms_sum: Sum of all queueing delays, in milliseconds.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self._lock = threading.Lock()
+        self.batch_size_counts = _empty_buckets(BATCH_SIZE_BUCKETS)
+        self.queue_delay_counts = _empty_buckets(QUEUE_DELAY_BUCKETS_MS)
+        self.batches = 0
+        self.requests = 0
+        self.queue_delay_ms_sum = 0
+
+    def record(self, queue_delays_ms: list[float]) -> None:
+        """
+        Record one scored batch.
+
+        Args:
+            queue_delays_ms (list[float]): Queueing delay of every request
+                in the batch, in milliseconds.
+        """
+        batch_size = len(queue_delays_ms)
+        with self._lock:
+            self.batches += 1
+            self.requests += batch_size
+            self.batch_size_counts[
+                bisect_left(BATCH_SIZE_BUCKETS, batch_size)
+            ] += 1
+            for delay in queue_delays_ms:
+                self.queue_delay_counts[
+                    bisect_left(QUEUE_DELAY_BUCKETS_MS, delay)
+                ] += 1
+            self.queue_delay_ms_sum += sum(queue_delays_ms)
+
+    def snapshot(self) -> dict:
+        """
+        Return a consistent copy of the statistics.
+
+        Returns:
+            dict: Batch size and queueing delay distributions, keyed by
+                the upper bound of each bucket, and the totals.
+        """
+        with self._lock:
+            return {
+                'batches': self.batches,
+                'requests': self.requests,
+                'queue_delay_ms_sum': self.queue_delay_ms_sum,
+                'batch_size': _as_buckets(
+                    BATCH_SIZE_BUCKETS, self.batch_size_counts,
+                ),
+                'queue_delay_ms': _as_buckets(
+                    QUEUE_DELAY_BUCKETS_MS, self.queue_delay_counts,
+                ),
+            }
+
+
+class PredictionBatcher:
+    """
+    A coalescing layer in front of the ModelInferenceService.
+
+    Callers block in `predict` while a background thread collects
+    requests until either the batching window has passed since the first
+    queued request or the batch is full, and then runs one matrix predict.
+
+    Attributes:
+        stats: Batch size and queueing delay statistics.
+
+    Methods:
+        __init__: Constructor that initializes the PredictionBatcher.
+        predict: Queues a single row and waits for its prediction.
+    """
+
+    def __init__(
+        self,
+        inference_service: ModelInferenceService,
+        window_ms: float,
+        max_size: int,
+    ) -> None:
+        """
+        Initialize the PredictionBatcher.
+
+        Args:
+            inference_service (ModelInferenceService): Service to score with.
+            window_ms (float): Batching window, in milliseconds.
+            max_size (int): Largest number of rows in one batch.
+        """
+        self.stats = BatchingStats()
+        self._inference_service = inference_service
+        self._window = window_ms / 1000
+        self._max_size = max_size
+        self._queue = queue.SimpleQueue()
+        self._worker_lock = threading.Lock()
+        self._worker = None
+
+    def predict(self, input_parameters: list) -> Prediction:
+        """
+        Make a prediction as part of the next batch.
+
+        Args:
+            input_parameters (list): The input data for making a prediction.
+
+        Returns:
+            Prediction: The prediction result from the model.
+        """
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((input_parameters, future, time.perf_counter()))
+        return future.result()
+
+    def _ensure_worker(self) -> None:
+        """Start the batching thread, also after the process was forked."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name='prediction-batcher',
+                    daemon=True,
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        """Collect and score batches forever."""
+        logger.info('starting up prediction batcher')
+        while True:  # noqa: WPS457
+            self._score(self._collect())
+
+    def _collect(self) -> list[tuple]:
+        """
+        Wait for the next batch of requests.
+
+        Requests that are already queued when the window has passed
+        still join the batch, so a backlog is drained in full batches.
+
+        Returns:
+            list[tuple]: Queued rows with their futures and enqueue times.
+        """
+        batch = [self._queue.get()]
+        deadline = batch[0][2] + self._window
+        while len(batch) < self._max_size:
+            timeout = max(deadline - time.perf_counter(), 0)
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _score(self, batch: list[tuple]) -> None:
+        """
+        Score a batch and resolve the futures of its callers.
+
+        Args:
+            batch (list[tuple]): Queued rows with their futures.
+        """
+        rows, futures, enqueued_at = zip(*batch)
+        started = time.perf_counter()
+        self.stats.record([
+            (started - enqueued) * 1000 for enqueued in enqueued_at
+        ])
+        try:
+            batch_prediction = self._inference_service.predict_batch(
+                list(rows),
+            )
+        except Exception as error:
+            _fail(futures, error)
+            return
+        for future, prediction in zip(futures, batch_prediction.predictions):
+            future.set_result(
+                Prediction([prediction], batch_prediction.model_version),
+            )
+
+
+def _fail(futures: tuple[Future, ...], error: Exception) -> None:
+    """
+    Propagate a failed batch to every caller waiting on it.
+
+    Args:
+        futures (tuple[Future, ...]): Futures of the callers in the batch.
+        error (Exception): The error raised while scoring the batch.
+    """
+    for future in futures:
+        future.set_exception(error)
+
+
+def _empty_buckets(bounds: tuple) -> list[int]:
+    """
+    Create zeroed counts for the given bucket bounds.
+
+    Args:
+        bounds (tuple): Upper bounds of all buckets but the last.
+
+    Returns:
+        list[int]: One zero count per bucket, including the `+Inf` one.
+    """
+    return [0 for _ in range(len(bounds) + 1)]
+
+
+def _as_buckets(bounds: tuple, counts: list[int]) -> dict[str, int]:
+    """
+    Label bucket counts with their upper bounds.
+
+    Args:
+        bounds (tuple): Upper bounds of all buckets but the last.
+        counts (list[int]): Count of every bucket.
+
+    Returns:
+        dict[str, int]: Counts keyed by upper bound, the last one `+Inf`.
+    """
+    labels = [str(bound) for bound in bounds] + ['+Inf']
+    return dict(zip(labels, counts))
@@ -0,0 +1,145 @@
+"""
+This module provides a threshold-bucket index over the feature domain.
+
+It contains the BucketIndex class, which collects the split thresholds
+of a fitted forest per feature and maps feature values to the interval
+between two consecutive thresholds they fall in.
+"""
+
+from typing import Any
+
+import numpy as np
+from loguru import logger
+
+from services.compiled_forest import CompiledForest
+
+CODE_DTYPE = np.int32
+
+
+class BucketIndex:
+    """
+    Index of the threshold buckets of a fitted forest.
+
+    A forest only compares each feature to a finite set of split
+    thresholds, so all rows whose features fall in the same buckets
+    take the same path through every tree and get the same prediction.
+    Keying predictions on the bucket combination of a row instead of
+    its exact values lets one cached prediction serve the whole region.
+
+    Buckets follow the routing of scikit-learn: features are rounded to
+    float32 and a value equal to a threshold belongs to the bucket left
+    of it.
+
+    Attributes:
+        thresholds: Sorted distinct split thresholds of each feature.
+
+    Methods:
+        __init__: Constructor that initializes the BucketIndex.
+        from_estimator: Collects the thresholds of a fitted forest.
+        from_forest: Collects the thresholds of a compiled forest.
+        codes: Computes the bucket of every feature of every row.
+        keys: Computes a hashable bucket key per row.
+    """
+
+    def __init__(self, thresholds: list[np.ndarray]) -> None:
+        """
+        Initialize the BucketIndex.
+
+        Args:
+            thresholds (list[np.ndarray]): Sorted distinct split
+                thresholds of each feature.
+        """
+        self.thresholds = thresholds
+
+    @classmethod
+    def from_estimator(cls, estimator: Any) -> 'BucketIndex':
+        """
+        Collect the split thresholds of a fitted forest regressor.
+
+        Args:
+            estimator (Any): A fitted forest regressor.
+
+        Returns:
+            BucketIndex: The index of the thresholds of the forest.
+        """
+        trees = [tree.tree_ for tree in estimator.estimators_]
+        return _from_splits(
+            np.concatenate([tree.feature for tree in trees]),
+            np.concatenate([tree.threshold for tree in trees]),
+            estimator.n_features_in_,
+        )
+
+    @classmethod
+    def from_forest(cls, forest: CompiledForest) -> 'BucketIndex':
+        """
+        Collect the split thresholds of a compiled forest.
+
+        Args:
+            forest (CompiledForest): A compiled forest.
+
+        Returns:
+            BucketIndex: The index of the thresholds of the forest.
+        """
+        arrays = forest.arrays
+        is_split = arrays.children_left != np.arange(len(arrays.feature))
+        return _from_splits(
+            arrays.feature[is_split],
+            arrays.threshold[is_split],
+            forest.n_features_in_,
+        )
+
+    def codes(self, input_matrix: Any) -> np.ndarray:
+        """
+        Compute the bucket of every feature of every row.
+
+        Args:
+            input_matrix (Any): Rows of input data, one per item.
+
+        Returns:
+            np.ndarray: The bucket codes, with the shape of the input.
+        """
+        input_matrix = np.asarray(input_matrix, dtype=np.float32)
+        input_matrix = input_matrix.astype(np.float64)
+        bucket_codes = np.empty(input_matrix.shape, dtype=CODE_DTYPE)
+        for feature_index, splits in enumerate(self.thresholds):
+            bucket_codes[:, feature_index] = np.searchsorted(
+                splits, input_matrix[:, feature_index], side='left',
+            )
+        return bucket_codes
+
+    def keys(self, input_matrix: Any) -> list[bytes]:
+        """
+        Compute a hashable bucket key per row.
+
+        Args:
+            input_matrix (Any): Rows of input data, one per item.
+
+        Returns:
+            list[bytes]: The bucket keys, in the order of the rows.
+        """
+        return [row_codes.tobytes() for row_codes in self.codes(input_matrix)]
+
+
+def _from_splits(
+    feature: np.ndarray,
+    threshold: np.ndarray,
+    n_features: int,
+) -> BucketIndex:
+    """
+    Build a bucket index from the splits of a forest.
+
+    Args:
+        feature (np.ndarray): Feature tested by each split node.
+        threshold (np.ndarray): Threshold of each split node.
+        n_features (int): Number of features of the input rows.
+
+    Returns:
+        BucketIndex: The index of the thresholds of the splits.
+    """
+    thresholds = [
+        np.unique(threshold[feature == feature_index])
+        for feature_index in range(n_features)
+    ]
+    bucket_counts = [len(splits) + 1 for splits in thresholds]
+    logger.info(f'threshold buckets per feature: {bucket_counts}')
+    return BucketIndex(thresholds)
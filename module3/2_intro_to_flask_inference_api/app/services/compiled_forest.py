@@ -0,0 +1,264 @@
+"""
+This module provides an array-compiled random forest evaluator.
+
+It contains the CompiledForest class, which flattens the trees of a
+fitted scikit-learn forest regressor into contiguous numpy arrays and
+walks all trees at once, without the input validation, joblib dispatch
+and per-tree Python calls of the estimator's own `predict`. The
+LazyCompiledForest class compiles a forest only when first needed.
+"""
+
+import threading
+from typing import Any, NamedTuple
+
+import numpy as np
+
+LEAF = -1
+
+
+class ForestArrays(NamedTuple):
+    """
+    The nodes of all trees of a forest, concatenated in tree order.
+
+    Attributes:
+        feature: Feature tested by each node, 0 for leaves.
+        threshold: Split threshold of each node.
+        children_left: Node to go to when the feature is <= threshold.
+        children_right: Node to go to when the feature is > threshold.
+        outputs: Output of each node, only meaningful for leaves.
+        roots: Index of the root node of each tree.
+    """
+
+    feature: np.ndarray
+    threshold: np.ndarray
+    children_left: np.ndarray
+    children_right: np.ndarray
+    outputs: np.ndarray
+    roots: np.ndarray
+
+
+class CompiledForest:
+    """
+    A random forest regressor compiled into flat node arrays.
+
+    A node is addressed by a single index into the forest arrays and
+    every tree starts at its root offset. Leaves point to themselves as
+    both children, so walking a fixed number of levels leaves every
+    tree at its leaf whatever its depth.
+
+    Predictions are bit-identical to the estimator: features are
+    rounded to float32 and compared to the float64 thresholds like
+    scikit-learn does, and tree outputs are summed sequentially in tree
+    order before being divided by the number of trees.
+
+    The arrays may also use narrower dtypes, see `forest_compaction`:
+    features are then compared in the dtype of the thresholds and tree
+    outputs are still summed in float64.
+
+    Attributes:
+        arrays: The node arrays of the forest.
+        max_depth: Number of levels of the deepest tree.
+
+    Methods:
+        __init__: Constructor that initializes the CompiledForest.
+        from_estimator: Compiles a fitted forest regressor.
+        predict: Makes predictions for a feature matrix.
+        tree_outputs: Computes the leaf output of every tree.
+    """
+
+    def __init__(
+        self,
+        arrays: ForestArrays,
+        max_depth: int,
+        n_features: int,
+    ) -> None:
+        """
+        Initialize the CompiledForest from its node arrays.
+
+        Args:
+            arrays (ForestArrays): The node arrays of the forest.
+            max_depth (int): Number of levels of the deepest tree.
+            n_features (int): Number of features of the input rows.
+        """
+        self.arrays = arrays
+        self.max_depth = max_depth
+        # Number of input features, named as on the estimator.
+        self.n_features_in_ = n_features  # noqa: WPS120
+
+    @classmethod
+    def from_estimator(cls, estimator: Any) -> 'CompiledForest':
+        """
+        Compile the trees of a fitted forest regressor.
+
+        Args:
+            estimator (Any): A fitted single-output forest regressor,
+                such as a RandomForestRegressor.
+
+        Returns:
+            CompiledForest: The compiled forest.
+        """
+        trees = [tree.tree_ for tree in estimator.estimators_]
+        max_depth = max(tree.max_depth for tree in trees)
+        return cls(_forest_arrays(trees), max_depth, estimator.n_features_in_)
+
+    def predict(self, input_matrix: Any) -> np.ndarray:
+        """
+        Make predictions for a feature matrix.
+
+        Args:
+            input_matrix (Any): Rows of input data, one per item.
+
+        Returns:
+            np.ndarray: The predictions, one per row.
+        """
+        return average_trees(self.tree_outputs(input_matrix))
+
+    def tree_outputs(self, input_matrix: Any) -> np.ndarray:
+        """
+        Compute the leaf output of every tree for a feature matrix.
+
+        All trees are walked together in a single vectorized traversal.
+
+        Args:
+            input_matrix (Any): Rows of input data, one per item.
+
+        Returns:
+            np.ndarray: The leaf outputs, one row per item and one
+                column per tree, in tree order.
+        """
+        arrays = self.arrays
+        input_matrix = np.asarray(input_matrix, dtype=np.float32)
+        input_matrix = input_matrix.astype(arrays.threshold.dtype)
+        rows = np.arange(len(input_matrix))[:, np.newaxis]
+        nodes = np.broadcast_to(
+            arrays.roots, (len(input_matrix), len(arrays.roots)),
+        )
+        for _ in range(self.max_depth):
+            features = input_matrix[rows, arrays.feature[nodes]]
+            nodes = np.where(
+                features <= arrays.threshold[nodes],
+                arrays.children_left[nodes],
+                arrays.children_right[nodes],
+            )
+        return arrays.outputs[nodes]
+
+
+class LazyCompiledForest:
+    """
+    The compiled form of a model, compiled on first use.
+
+    A model served as a CompiledForest already is used as is; other
+    forests are compiled once, on the first call to `get`, so models
+    which never need their compiled form do not hold a copy of it.
+
+    Attributes:
+        estimator: The model to compile.
+
+    Methods:
+        __init__: Constructor that initializes the LazyCompiledForest.
+        get: Returns the compiled forest, compiling it if needed.
+        nbytes: Size of the compiled copy, 0 until compiled or if shared.
+    """
+
+    def __init__(self, estimator: Any) -> None:
+        """
+        Initialize the LazyCompiledForest.
+
+        Args:
+            estimator (Any): The model to compile.
+        """
+        self.estimator = estimator
+        self._forest = None
+        if isinstance(estimator, CompiledForest):
+            self._forest = estimator
+        self._lock = threading.Lock()
+
+    def get(self) -> CompiledForest:
+        """
+        Return the compiled forest, compiling it on first use.
+
+        Returns:
+            CompiledForest: The compiled forest of the model.
+
+        Raises:
+            ValueError: If the model is not a forest.
+        """
+        with self._lock:
+            if self._forest is None:
+                if getattr(self.estimator, 'estimators_', None) is None:
+                    raise ValueError('Model is not a forest')
+                self._forest = CompiledForest.from_estimator(self.estimator)
+            return self._forest
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Size of the compiled copy of the model.
+
+        Returns:
+            int: The size of its node arrays in bytes, 0 if the model is
+                not compiled yet or is served compiled.
+        """
+        forest = self._forest
+        if forest is None or forest is self.estimator:
+            return 0
+        return sum(array.nbytes for array in forest.arrays)
+
+
+def average_trees(tree_outputs: np.ndarray) -> np.ndarray:
+    """
+    Average the tree outputs of every row like scikit-learn does.
+
+    Args:
+        tree_outputs (np.ndarray): Leaf outputs, one column per tree.
+
+    Returns:
+        np.ndarray: The predictions, one per row.
+    """
+    tree_sums = np.cumsum(tree_outputs, axis=1, dtype=np.float64)
+    return tree_sums[:, -1] / tree_outputs.shape[1]
+
+
+def _forest_arrays(trees: list) -> ForestArrays:
+    """
+    Concatenate the nodes of fitted scikit-learn trees.
+
+    Args:
+        trees (list): The fitted tree structures, in forest order.
+
+    Returns:
+        ForestArrays: The node arrays of the forest.
+    """
+    node_counts = [tree.node_count for tree in trees]
+    roots = np.cumsum([0] + node_counts[:-1])
+    children = [
+        _self_looping_children(tree, root)
+        for tree, root in zip(trees, roots)
+    ]
+    feature = np.concatenate([tree.feature for tree in trees])
+    return ForestArrays(
+        feature=np.maximum(feature, 0).astype(np.intp),
+        threshold=np.concatenate([tree.threshold for tree in trees]),
+        children_left=np.concatenate([left for left, _ in children]),
+        children_right=np.concatenate([right for _, right in children]),
+        outputs=np.concatenate([tree.value[:, 0, 0] for tree in trees]),
+        roots=roots.astype(np.intp),
+    )
+
+
+def _self_looping_children(tree: Any, root: int) -> tuple:
+    """
+    Offset the children of a tree, making its leaves point to themselves.
+
+    Args:
+        tree (Any): A fitted scikit-learn tree structure.
+        root (int): Index of the root of the tree in the forest arrays.
+
+    Returns:
+        tuple: The left and right children in the forest arrays.
+    """
+    nodes = np.arange(tree.node_count)
+    is_leaf = tree.children_left == LEAF
+    children_left = np.where(is_leaf, nodes, tree.children_left) + root
+    children_right = np.where(is_leaf, nodes, tree.children_right) + root
+    return children_left.astype(np.intp), children_right.astype(np.intp)
@@ -0,0 +1,169 @@
+"""
+This module provides a memory-mappable artifact format for forests.
+
+An artifact is a single file made of a magic string, the length of a
+JSON header, the JSON header itself and the node arrays of a
+CompiledForest, each starting at an aligned offset. The header holds
+the model version, the shape of the forest and the dtype, shape and
+offset of every array, relative to the first aligned offset after the
+header.
+
+Loading an artifact maps the file read-only instead of deserializing
+it, so it is near-instant and every process serving the same file
+shares its pages through the page cache. Artifacts are written to a
+staging file and renamed over the target, so processes still mapping a
+previous artifact keep reading its unchanged pages.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from services.compiled_forest import CompiledForest, ForestArrays
+
+MAGIC = b'RFARRAY1'
+HEADER_LENGTH_BYTES = 8
+PREFIX_LENGTH = len(MAGIC) + HEADER_LENGTH_BYTES
+ALIGNMENT = 64
+
+
+def is_forest_artifact(path: Path) -> bool:
+    """
+    Tell whether a file is a forest artifact.
+
+    Args:
+        path (Path): The model file.
+
+    Returns:
+        bool: Whether the file starts with the artifact magic string.
+    """
+    with open(path, 'rb') as model_file:
+        return model_file.read(len(MAGIC)) == MAGIC
+
+
+def read_header(path: Path) -> dict:
+    """
+    Read the JSON header of a forest artifact.
+
+    Args:
+        path (Path): The artifact file.
+
+    Returns:
+        dict: The header of the artifact.
+    """
+    header, _ = _read_header(path)
+    return header
+
+
+def load_forest(path: Path) -> CompiledForest:
+    """
+    Map a forest artifact read-only into memory.
+
+    Args:
+        path (Path): The artifact file.
+
+    Returns:
+        CompiledForest: The forest, backed by the mapped file.
+    """
+    header, data_start = _read_header(path)
+    mapped = np.memmap(path, dtype=np.uint8, mode='r')
+    arrays = {
+        name: np.frombuffer(
+            mapped,
+            dtype=layout['dtype'],
+            count=int(np.prod(layout['shape'])),
+            offset=data_start + layout['offset'],
+        ).reshape(layout['shape'])
+        for name, layout in header['arrays'].items()
+    }
+    return CompiledForest(
+        ForestArrays(**arrays), header['max_depth'], header['n_features'],
+    )
+
+
+def save_forest(forest: CompiledForest, version: str, path: Path) -> None:
+    """
+    Write a compiled forest as an artifact, replacing it atomically.
+
+    Args:
+        forest (CompiledForest): The forest to write.
+        version (str): Version of the model, stored in the header.
+        path (Path): The artifact file to write.
+    """
+    arrays = dict(zip(ForestArrays._fields, forest.arrays))  # noqa: WPS437
+    layouts = _layouts(arrays)
+    header = {
+        'version': version,
+        'max_depth': forest.max_depth,
+        'n_features': forest.n_features_in_,
+        'arrays': layouts,
+    }
+    header_bytes = json.dumps(header).encode()
+    data_start = _aligned(PREFIX_LENGTH + len(header_bytes))
+    staging_path = path.with_name(f'.{path.name}.tmp')
+    with open(staging_path, 'wb') as artifact_file:
+        artifact_file.write(MAGIC)
+        artifact_file.write(
+            len(header_bytes).to_bytes(HEADER_LENGTH_BYTES, 'little'),
+        )
+        artifact_file.write(header_bytes)
+        for layout, contiguous in zip(layouts.values(), arrays.values()):
+            artifact_file.seek(data_start + layout['offset'])
+            artifact_file.write(np.ascontiguousarray(contiguous).tobytes())
+    os.replace(staging_path, path)
+
+
+def _layouts(arrays: dict) -> dict:
+    """
+    Lay out arrays one after the other at aligned offsets.
+
+    Args:
+        arrays (dict): The arrays to lay out, by name.
+
+    Returns:
+        dict: The dtype, shape and offset of each array, by name.
+    """
+    layouts = {}
+    data_offset = 0
+    for name, array in arrays.items():
+        layouts[name] = {
+            'dtype': array.dtype.str,
+            'shape': list(array.shape),
+            'offset': data_offset,
+        }
+        data_offset = _aligned(data_offset + array.nbytes)
+    return layouts
+
+
+def _read_header(path: Path) -> tuple[dict, int]:
+    """
+    Read the JSON header of a forest artifact and where its data starts.
+
+    Args:
+        path (Path): The artifact file.
+
+    Returns:
+        tuple: The header and the offset of the arrays in the file.
+    """
+    with open(path, 'rb') as artifact_file:
+        artifact_file.seek(len(MAGIC))
+        header_length = int.from_bytes(
+            artifact_file.read(HEADER_LENGTH_BYTES), 'little',
+        )
+        header = json.loads(artifact_file.read(header_length))
+    return header, _aligned(PREFIX_LENGTH + header_length)
+
+
+def _aligned(offset: int) -> int:
+    """
+    Round an offset up to the alignment of the arrays.
+
+    Args:
+        offset (int): A byte offset.
+
+    Returns:
+        int: The next aligned offset.
+    """
+    return -(-offset // ALIGNMENT) * ALIGNMENT
@@ -0,0 +1,101 @@
+"""
+This module provides the compaction of compiled forests.
+
+It re-encodes the node arrays of a CompiledForest with the narrowest
+safe dtypes: the smallest integer type holding every feature and node
+index, float32 thresholds and float32 leaf outputs.
+"""
+
+import numpy as np
+
+from services.compiled_forest import CompiledForest, ForestArrays
+
+
+def compact(forest: CompiledForest) -> CompiledForest:
+    """
+    Re-encode a compiled forest with the narrowest safe dtypes.
+
+    Thresholds are rounded down to the largest float32 not above them.
+    Features are compared as float32, so a feature is below a rounded
+    threshold exactly when it is below the original one and every row
+    takes the same path as before. Only the rounding of the leaf
+    outputs to float32 changes the predictions, by at most
+    `max_deviation`.
+
+    Args:
+        forest (CompiledForest): The forest to compact.
+
+    Returns:
+        CompiledForest: The compact forest.
+    """
+    arrays = forest.arrays
+    index_dtype = np.min_scalar_type(-len(arrays.feature))
+    compact_arrays = ForestArrays(
+        feature=arrays.feature.astype(
+            np.min_scalar_type(-forest.n_features_in_),
+        ),
+        threshold=_round_down(arrays.threshold),
+        children_left=arrays.children_left.astype(index_dtype),
+        children_right=arrays.children_right.astype(index_dtype),
+        outputs=arrays.outputs.astype(np.float32),
+        roots=arrays.roots.astype(index_dtype),
+    )
+    return CompiledForest(
+        compact_arrays, forest.max_depth, forest.n_features_in_,
+    )
+
+
+def max_deviation(
+    forest: CompiledForest,
+    compact_forest: CompiledForest,
+) -> float:
+    """
+    Bound the deviation of the predictions of a compact forest.
+
+    Both forests route every row to the same leaves, so a prediction
+    deviates by the mean of the rounding errors of its leaves, which is
+    at most the mean of the largest rounding error of each tree.
+
+    Args:
+        forest (CompiledForest): The original forest.
+        compact_forest (CompiledForest): The compact forest.
+
+    Returns:
+        float: The largest possible absolute deviation of a prediction.
+    """
+    errors = np.abs(
+        forest.arrays.outputs - compact_forest.arrays.outputs,
+    )
+    tree_errors = np.maximum.reduceat(errors, forest.arrays.roots)
+    return float(tree_errors.mean())
+
+
+def forest_size(forest: CompiledForest) -> int:
+    """
+    Compute the size of the node arrays of a compiled forest.
+
+    Args:
+        forest (CompiledForest): A compiled forest.
+
+    Returns:
+        int: The size of the node arrays, in bytes.
+    """
+    return sum(array.nbytes for array in forest.arrays)
+
+
+def _round_down(thresholds: np.ndarray) -> np.ndarray:
+    """
+    Round thresholds down to the largest float32 not above them.
+
+    Args:
+        thresholds (np.ndarray): The float64 thresholds.
+
+    Returns:
+        np.ndarray: The float32 thresholds.
+    """
+    rounded = thresholds.astype(np.float32)
+    too_large = rounded.astype(np.float64) > thresholds
+    rounded[too_large] = np.nextafter(
+        rounded[too_large], np.float32(-np.inf),
+    )
+    return rounded
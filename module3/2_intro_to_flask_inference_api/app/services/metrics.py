@@ -0,0 +1,385 @@
+"""
+This module provides low-overhead Prometheus metrics.
+
+It contains Counter, Gauge and Histogram classes which record into
+per-thread shards, so recording never takes a lock, and a registry
+rendering all metrics in the Prometheus text exposition format. The
+metrics of the inference service are defined at the bottom.
+
+Every process keeps its own metrics; under the pre-fork server each
+worker reports its own values. The shards of finished threads, such as
+the per-request threads of the development server, are folded into a
+retired total, so the shards stay bounded by the live threads.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1,
+)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 1024, 4096)
+
+
+class Metric:
+    """
+    Base class of the metrics, holding one shard per recording thread.
+
+    Attributes:
+        name: Name of the metric.
+        documentation: Help text of the metric.
+        label_names: Names of the labels of the metric.
+    """
+
+    kind = 'untyped'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+    ) -> None:
+        """
+        Initialize the metric.
+
+        Args:
+            name (str): Name of the metric.
+            documentation (str): Help text of the metric.
+            label_names (tuple[str, ...]): Names of the labels.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._local = threading.local()
+        self._shards = {}
+        self._retired = {}
+        self._shards_lock = threading.Lock()
+
+    def render(self) -> list[str]:
+        """
+        Render the metric in the Prometheus text format.
+
+        Returns:
+            list[str]: The lines describing the metric.
+        """
+        lines = self._header()
+        for label_values, amount in sorted(self._merged().items()):
+            labels = self._labels(label_values)
+            lines.append(f'{self.name}{labels} {amount}')
+        return lines
+
+    def _header(self) -> list[str]:
+        """
+        Render the help and type lines of the metric.
+
+        Returns:
+            list[str]: The header lines of the metric.
+        """
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.kind}',
+        ]
+
+    def _shard(self) -> dict:
+        """
+        Return the shard of the calling thread, creating it on first use.
+
+        Returns:
+            dict: Recorded values of this thread, keyed by label values.
+        """
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = {}
+            self._local.shard = shard
+            with self._shards_lock:
+                for dead_shard in _pop_dead(self._shards):
+                    self._add_shard(self._retired, dead_shard)
+                self._shards[threading.current_thread()] = shard
+        return shard
+
+    def _merged(self) -> dict:
+        """
+        Sum the retired total and the shards of the live threads.
+
+        Returns:
+            dict: Recorded values keyed by label values.
+        """
+        merged = {}
+        with self._shards_lock:
+            for dead_shard in _pop_dead(self._shards):
+                self._add_shard(self._retired, dead_shard)
+            self._add_shard(merged, self._retired)
+            shards = list(self._shards.values())
+        for shard in shards:
+            self._add_shard(merged, shard)
+        return merged
+
+    def _add_shard(self, total: dict, shard: dict) -> None:
+        """
+        Add the values of a shard to a total.
+
+        Args:
+            total (dict): The total to add to, keyed by label values.
+            shard (dict): Recorded values keyed by label values.
+        """
+        for label_values, amount in list(shard.items()):
+            total[label_values] = total.get(label_values, 0) + amount
+
+    def _labels(
+        self,
+        label_values: tuple,
+        extra: tuple[tuple[str, str], ...] = (),
+    ) -> str:
+        """
+        Format label values in the Prometheus text format.
+
+        Args:
+            label_values (tuple): Values of the labels of the metric.
+            extra (tuple[tuple[str, str], ...]): Additional labels.
+
+        Returns:
+            str: The formatted labels, empty if there are none.
+        """
+        pairs = [*zip(self.label_names, label_values), *extra]
+        if not pairs:
+            return ''
+        quoted = [f'{name}="{label}"' for name, label in pairs]
+        formatted = ','.join(quoted)
+        return f'{{{formatted}}}'
+
+
+class Counter(Metric):
+    """A monotonically increasing count."""
+
+    kind = 'counter'
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        """
+        Increase the counter.
+
+        Args:
+            label_values (str): Values of the labels of the metric.
+            amount (float): Amount to add.
+        """
+        shard = self._shard()
+        shard[label_values] = shard.get(label_values, 0) + amount
+
+
+class Gauge(Counter):
+    """A value which goes up and down, such as in-flight requests."""
+
+    kind = 'gauge'
+
+    def dec(self, *label_values: str) -> None:
+        """
+        Decrease the gauge by one.
+
+        Args:
+            label_values (str): Values of the labels of the metric.
+        """
+        self.inc(*label_values, amount=-1)
+
+
+class Histogram(Metric):
+    """
+    A distribution of observed values over fixed buckets.
+
+    Attributes:
+        buckets: Upper bounds of the buckets, without `+Inf`.
+    """
+
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: tuple[float, ...],
+        label_names: tuple[str, ...] = (),
+    ) -> None:
+        """
+        Initialize the histogram.
+
+        Args:
+            name (str): Name of the metric.
+            documentation (str): Help text of the metric.
+            buckets (tuple[float, ...]): Upper bounds of the buckets.
+            label_names (tuple[str, ...]): Names of the labels.
+        """
+        super().__init__(name, documentation, label_names)
+        self.buckets = buckets
+
+    def observe(self, observed: float, *label_values: str) -> None:
+        """
+        Record an observed value.
+
+        Args:
+            observed (float): The value to record.
+            label_values (str): Values of the labels of the metric.
+        """
+        shard = self._shard()
+        counts = shard.get(label_values)
+        if counts is None:
+            counts = [0 for _ in range(len(self.buckets) + 2)]
+            shard[label_values] = counts
+        counts[bisect_left(self.buckets, observed)] += 1
+        counts[-1] += observed
+
+    @contextmanager
+    def time(self, *label_values: str) -> Iterator[None]:
+        """
+        Observe the duration of the enclosed block, in seconds.
+
+        Args:
+            label_values (str): Values of the labels of the metric.
+
+        Yields:
+            None: Control to the timed block.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *label_values)
+
+    def render(self) -> list[str]:
+        """
+        Render the histogram in the Prometheus text format.
+
+        Returns:
+            list[str]: The lines describing the histogram.
+        """
+        lines = self._header()
+        for label_values, counts in sorted(self._merged().items()):
+            lines.extend(self._render_series(label_values, counts))
+        return lines
+
+    def _add_shard(self, total: dict, shard: dict) -> None:
+        """
+        Add the bucket counts and sums of a shard to a total.
+
+        Args:
+            total (dict): The total to add to, keyed by label values.
+            shard (dict): Bucket counts and sum, keyed by label values.
+        """
+        for label_values, counts in list(shard.items()):
+            series = total.setdefault(label_values, [0 for _ in counts])
+            for index, amount in enumerate(list(counts)):
+                series[index] += amount
+
+    def _render_series(self, label_values: tuple, counts: list) -> list[str]:
+        """
+        Render the buckets, sum and count of one label combination.
+
+        Args:
+            label_values (tuple): Values of the labels of the metric.
+            counts (list): Bucket counts followed by the sum.
+
+        Returns:
+            list[str]: The lines describing the series.
+        """
+        lines = []
+        cumulative = 0
+        bounds = [*(str(bound) for bound in self.buckets), '+Inf']
+        for bound, amount in zip(bounds, counts[:-1]):
+            cumulative += amount
+            labels = self._labels(label_values, (('le', bound),))
+            lines.append(f'{self.name}_bucket{labels} {cumulative}')
+        labels = self._labels(label_values)
+        total = counts[-1]
+        lines.append(f'{self.name}_sum{labels} {total}')
+        lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    """
+    A collection of metrics rendered together.
+
+    Methods:
+        __init__: Constructor that initializes the MetricsRegistry.
+        register: Adds a metric to the registry.
+        render: Renders all metrics in the Prometheus text format.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty MetricsRegistry."""
+        self._metrics = []
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Add a metric to the registry.
+
+        Args:
+            metric (Metric): The metric to add.
+
+        Returns:
+            Metric: The added metric.
+        """
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text format.
+
+        Returns:
+            str: The text exposition of all metrics.
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join([*lines, ''])
+
+
+def _pop_dead(shards: dict[threading.Thread, dict]) -> list[dict]:
+    """
+    Remove the shards of the threads which have finished.
+
+    A finished thread no longer records, so its shard is complete.
+
+    Args:
+        shards (dict[threading.Thread, dict]): Shards keyed by thread.
+
+    Returns:
+        list[dict]: The removed shards.
+    """
+    dead_threads = [thread for thread in shards if not thread.is_alive()]
+    return [shards.pop(thread) for thread in dead_threads]
+
+
+registry = MetricsRegistry()
+
+stage_latency = registry.register(Histogram(
+    'inference_stage_duration_seconds',
+    'Time spent per request handling stage.',
+    LATENCY_BUCKETS,
+    label_names=('stage',),
+))
+batch_size = registry.register(Histogram(
+    'inference_batch_size',
+    'Number of rows per model predict call.',
+    BATCH_SIZE_BUCKETS,
+))
+predictions_total = registry.register(Counter(
+    'inference_predictions_total',
+    'Number of predicted rows per model version.',
+    label_names=('model_version',),
+))
+requests_total = registry.register(Counter(
+    'inference_requests_total',
+    'Number of handled requests per endpoint and status code.',
+    label_names=('endpoint', 'status'),
+))
+requests_in_flight = registry.register(Gauge(
+    'inference_requests_in_flight',
+    'Number of requests currently being handled.',
+))
+requests_shed_total = registry.register(Counter(
+    'inference_requests_shed_total',
+    'Number of requests rejected by admission control per reason.',
+    label_names=('reason',),
+))
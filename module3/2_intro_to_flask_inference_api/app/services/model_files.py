@@ -0,0 +1,52 @@
+"""
+This module provides functionality for reading model files.
+
+Models are stored either as pickles, versioned by a hash of their
+content, or as memory-mappable forest artifacts, which carry the
+version of the pickle they were converted from in their header.
+"""
+
+import hashlib
+import pickle as pk
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+from services import forest_artifact
+
+MODEL_VERSION_LENGTH = 12
+
+
+def content_version(model_bytes: bytes) -> str:
+    """
+    Compute the version of a model from the content of its pickle.
+
+    Args:
+        model_bytes (bytes): The pickled model.
+
+    Returns:
+        str: The version of the model.
+    """
+    return hashlib.sha256(model_bytes).hexdigest()[:MODEL_VERSION_LENGTH]
+
+
+def open_model(model_path: Path) -> tuple[str, Callable[[], Any]]:
+    """
+    Read the version of a model file and how to load its model.
+
+    Forest artifacts store their version in their header, so only
+    pickles are read in full before the model is loaded.
+
+    Args:
+        model_path (Path): The model file.
+
+    Returns:
+        tuple: The model version and a function loading the model.
+    """
+    if forest_artifact.is_forest_artifact(model_path):
+        header = forest_artifact.read_header(model_path)
+        return header['version'], partial(
+            forest_artifact.load_forest, model_path,
+        )
+    model_bytes = model_path.read_bytes()
+    return content_version(model_bytes), partial(pk.loads, model_bytes)
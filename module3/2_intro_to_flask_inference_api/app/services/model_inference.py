@@ -5,12 +5,54 @@ It contains the ModelInferenceService class, which offers methods
 to load a model from a file, and to make predictions using the loaded model.
 """
 
-import pickle as pk
+import threading
 from pathlib import Path
+from typing import Any, NamedTuple
 
+import numpy as np
 from loguru import logger
 
-from config import model_settings
+from config import model_settings, serving_settings
+from services import metrics, model_registry
+from services.bucket_index import BucketIndex
+from services.compiled_forest import CompiledForest, LazyCompiledForest
+from services.model_files import open_model
+from services.prediction_cache import PredictionCache
+from services.warmup import ModelWarmup
+
+
+class LoadedModel(NamedTuple):
+    """
+    A loaded ML model together with its version.
+
+    Attributes:
+        estimator: The deserialized ML model.
+        version: Content hash of the model file.
+        bucket_index: Threshold buckets of the model, if enabled.
+        size: Size of the model file, in bytes.
+        warmup: Warm-up of the model, and whether it is ready.
+        compiled_forest: The model as a compiled forest, compiled lazily.
+    """
+
+    estimator: Any
+    version: str
+    bucket_index: BucketIndex | None = None
+    size: int = 0
+    warmup: ModelWarmup | None = None
+    compiled_forest: LazyCompiledForest | None = None
+
+
+class Prediction(NamedTuple):
+    """
+    Predictions together with the version of the model which made them.
+
+    Attributes:
+        predictions: The prediction results, one per input row.
+        model_version: Version of the model which served the prediction.
+    """
+
+    predictions: list
+    model_version: str
 
 
 class ModelInferenceService:
@@ -19,52 +61,132 @@ class ModelInferenceService:
 
     This class provides functionalities to load a ML model from
     a specified path, and make predictions using the loaded model.
+    Predictions are memoized in an LRU cache keyed on the model version
+    and the feature values, or the threshold buckets of the feature
+    values when the bucket index is enabled, so that a single entry
+    serves every row routed the same way through the forest. Inputs can
+    be lists or numpy arrays.
+
+    A model is fully loaded and warmed up, until the latency of
+    synthetic predictions has settled, before it replaces the previous
+    one in a single assignment, so `load_model` can be called
+    again while serving to hot reload a new model file without any
+    request seeing a half-loaded model. If the latency has not settled
+    within `warmup_max_rounds` rounds, the warm-up continues in the
+    background, while the readiness probe keeps reporting ready. The
+    first model has no previous one to keep serving, so it is warmed up
+    in the background from the start, unless `warmup_on_load` is off,
+    and the readiness probe reports it as not ready until it is warm.
+
+    When a model version is configured, the model file is looked up in
+    the model registry by version, or by the `latest` or `pinned` alias,
+    instead of being read from the model name.
+
+    Model files are either pickles or forest artifacts. Artifacts are
+    mapped read-only into a CompiledForest instead of being
+    deserialized. With the `compiled` inference engine, pickled forests
+    are compiled into flat arrays on load as well, and scored with
+    bit-identical predictions at a fraction of the per-call overhead.
+    Prediction intervals need the compiled form of the forest, which is
+    compiled on the first interval request of a model, or shared with
+    the served model when it is compiled already.
 
     Attributes:
-        model: ML model managed by this service. Initially set to None.
+        loaded_model: ML model managed by this service. Initially None.
         model_path: Directory to extract the model from.
         model_name: Name of the saved model to use.
+        model_version: Registry version to use, empty for the model file.
+        cache: LRU cache of the predictions made by the loaded model.
 
     Methods:
         __init__: Constructor that initializes the ModelService.
         load_model: Loads the model from file.
         predict: Makes a prediction using the loaded model.
+        predict_batch: Makes predictions for many rows in one model call.
+        model_source: Gets the file whose changes can change the model.
     """
 
-    def __init__(self) -> None:
-        """Initialize the ModelInferenceService."""
-        self.model = None
+    def __init__(
+        self,
+        model_name: str | None = None,
+        model_version: str | None = None,
+    ) -> None:
+        """
+        Initialize the ModelInferenceService.
+
+        Args:
+            model_name (str | None): Name of the saved model to use,
+                the configured one if None.
+            model_version (str | None): Registry version to use, the
+                configured one if None.
+        """
+        self.loaded_model = None
         self.model_path = model_settings.model_path
-        self.model_name = model_settings.model_name
+        self.model_name = model_name or model_settings.model_name
+        if model_version is None:
+            model_version = model_settings.model_version
+        self.model_version = model_version
+        self.cache = PredictionCache(serving_settings.prediction_cache_size)
+        self._load_lock = threading.Lock()
 
-    def load_model(self) -> None:
+    def load_model(self) -> bool:
         """
         Load the model from a specified path.
 
+        The model is only swapped in if the version of the file differs
+        from the currently loaded model.
+
+        Returns:
+            bool: Whether a new model version was loaded.
+
         Raises:
             FileNotFoundError: If the model file not exist at specified dir.
         """
+        model_path = self._model_file()
         logger.info(
-            f'checking the existance of model config file at '
-            f'{self.model_path}/{self.model_name}',
-        )
-
-        model_path = Path(
-            f'{self.model_path}/{self.model_name}',
+            f'checking the existance of model config file at {model_path}',
         )
 
         if not model_path.exists():
             raise FileNotFoundError('Model file does not exist!')
 
-        logger.info(
-            f'model {self.model_name} exists! -> '
-            'loading model configuration file',
-        )
+        with self._load_lock:
+            model_version, read_estimator = open_model(model_path)
+            if self.loaded_model is not None:
+                if self.loaded_model.version == model_version:
+                    logger.info(f'model {model_version} is already loaded')
+                    return False
+
+            logger.info(
+                f'model {self.model_name} exists! -> '
+                'loading model configuration file',
+            )
+            estimator = read_estimator()
+            served_estimator = _compile(estimator)
+            previous_model = self.loaded_model
+            warmup = ModelWarmup(
+                served_estimator, previous_model and previous_model.warmup,
+            )
+            if previous_model is not None:
+                logger.info(f'warming up model version {model_version}')
+                warmup.warm_up()
+            self.loaded_model = LoadedModel(
+                served_estimator,
+                model_version,
+                _index(estimator),
+                model_path.stat().st_size,
+                warmup,
+                LazyCompiledForest(served_estimator),
+            )
+            self.cache.clear()
+            if previous_model is not None or serving_settings.warmup_on_load:
+                if not warmup.warm:
+                    warmup.start()
 
-        with open(model_path, 'rb') as model_file:
-            self.model = pk.load(model_file)
+        logger.info(f'serving model version {model_version}')
+        return True
 
-    def predict(self, input_parameters: list) -> list:
+    def predict(self, input_parameters: list | np.ndarray) -> Prediction:
         """
         Make a prediction using the loaded model.
 
@@ -72,10 +194,129 @@ class ModelInferenceService:
         was loaded using a pickle file.
 
         Args:
-            input_parameters (list): The input data for making a prediction.
+            input_parameters (list | np.ndarray): The input data for
+                making a prediction.
 
         Returns:
-            list: The prediction result from the model.
+            Prediction: The prediction result from the model.
         """
         logger.info('making prediction!')
-        return self.model.predict([input_parameters]).tolist()
+        return self._predict_cached([input_parameters])
+
+    def predict_batch(self, input_matrix: list | np.ndarray) -> Prediction:
+        """
+        Make predictions for several rows using a single model call.
+
+        Scoring a whole feature matrix at once avoids paying the fixed
+        per-call overhead of the forest for every single row.
+
+        Args:
+            input_matrix (list | np.ndarray): Rows of input data, one
+                per item.
+
+        Returns:
+            Prediction: The prediction results, in the order of the rows.
+        """
+        batch_size = len(input_matrix)
+        logger.info(f'making prediction for a batch of {batch_size}!')
+        return self._predict_cached(input_matrix)
+
+    def model_source(self) -> Path:
+        """
+        Get the file whose changes can change the model to serve.
+
+        Returns:
+            Path: The registry index, or the model file.
+        """
+        if self.model_version:
+            return model_registry.index_path(self.model_path, self.model_name)
+        return Path(f'{self.model_path}/{self.model_name}')
+
+    def _model_file(self) -> Path:
+        """
+        Get the file of the model to serve.
+
+        Returns:
+            Path: The model file, looked up in the registry if needed.
+        """
+        if self.model_version:
+            return model_registry.resolve_model(
+                self.model_path, self.model_name, self.model_version,
+            )
+        return Path(f'{self.model_path}/{self.model_name}')
+
+    def _predict_cached(self, input_matrix: list | np.ndarray) -> Prediction:
+        """
+        Make predictions, only running the model for uncached rows.
+
+        Args:
+            input_matrix (list | np.ndarray): Rows of input data.
+
+        Returns:
+            Prediction: The prediction results, in the order of the rows.
+        """
+        loaded_model = self.loaded_model
+        input_matrix = np.asarray(input_matrix, dtype=np.float64)
+        if loaded_model.bucket_index is None:
+            row_keys = [input_row.tobytes() for input_row in input_matrix]
+        else:
+            row_keys = loaded_model.bucket_index.keys(input_matrix)
+        keys = [(loaded_model.version, row_key) for row_key in row_keys]
+        predictions = [self.cache.get(key) for key in keys]
+        missing = [
+            index
+            for index, prediction in enumerate(predictions)
+            if prediction is None
+        ]
+        metrics.predictions_total.inc(loaded_model.version, amount=len(keys))
+        if missing:
+            metrics.batch_size.observe(len(missing))
+            with metrics.stage_latency.time('inference'):
+                computed = loaded_model.estimator.predict(
+                    input_matrix[missing],
+                ).tolist()
+            for index, prediction in zip(missing, computed):
+                predictions[index] = prediction
+                self.cache.put(keys[index], prediction)
+        return Prediction(predictions, loaded_model.version)
+
+
+def _compile(estimator: Any) -> Any:
+    """
+    Compile a forest estimator if the compiled engine is selected.
+
+    Args:
+        estimator (Any): The deserialized ML model.
+
+    Returns:
+        Any: The model to make predictions with.
+    """
+    if serving_settings.inference_engine != 'compiled':
+        return estimator
+    if isinstance(estimator, CompiledForest):
+        return estimator
+    if getattr(estimator, 'estimators_', None) is None:
+        logger.warning('model is not a forest, serving it with sklearn')
+        return estimator
+    logger.info('compiling the forest into arrays')
+    return CompiledForest.from_estimator(estimator)
+
+
+def _index(estimator: Any) -> BucketIndex | None:
+    """
+    Build the threshold-bucket index of a forest if it is enabled.
+
+    Args:
+        estimator (Any): The deserialized ML model.
+
+    Returns:
+        BucketIndex | None: The bucket index, None if it is disabled.
+    """
+    if not serving_settings.bucket_index_enabled:
+        return None
+    if isinstance(estimator, CompiledForest):
+        return BucketIndex.from_forest(estimator)
+    if getattr(estimator, 'estimators_', None) is None:
+        logger.warning('model is not a forest, not indexing its buckets')
+        return None
+    return BucketIndex.from_estimator(estimator)
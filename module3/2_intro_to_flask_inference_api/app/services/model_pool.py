@@ -0,0 +1,161 @@
+"""
+This module provides a pool of resident models.
+
+It contains the ModelPool class, which lazily loads the models
+requested by name and version into their own ModelInferenceService,
+and evicts the least recently used ones to stay within a memory budget.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from loguru import logger
+
+from services.model_inference import ModelInferenceService
+
+BYTES_PER_MB = 1024 * 1024
+CACHE_ENTRY_BYTES = 320
+
+
+class ModelPool:
+    """
+    A memory-bounded LRU pool of lazily loaded models.
+
+    A model is identified by its name and its registry version, `latest`
+    or `pinned`, or an empty version for the plain model file. It is
+    loaded on first use, and concurrent first uses of the same model
+    wait for a single load instead of loading it again. The footprint
+    of a model is approximated by the size of its model file, the full
+    capacity of its prediction cache and its compiled copy for
+    prediction intervals, if any; once the resident models
+    exceed the budget, the least recently used ones are evicted, always
+    keeping the model just requested.
+
+    Attributes:
+        max_bytes: Memory budget of the resident models, in bytes.
+
+    Methods:
+        __init__: Constructor that initializes the ModelPool.
+        get: Gets the inference service of a model, loading it if needed.
+        snapshot: Returns the resident models and the memory they use.
+    """
+
+    def __init__(self, max_mb: int) -> None:
+        """
+        Initialize the ModelPool.
+
+        Args:
+            max_mb (int): Memory budget of the resident models, in MB.
+        """
+        self.max_bytes = max_mb * BYTES_PER_MB
+        self._models = OrderedDict()
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        model_name: str,
+        model_version: str,
+    ) -> ModelInferenceService:
+        """
+        Get the inference service of a model, loading it if needed.
+
+        Args:
+            model_name (str): Name of the model.
+            model_version (str): Registry version or alias, empty for file.
+
+        Returns:
+            ModelInferenceService: The service serving the model.
+        """
+        key = (model_name, model_version)
+        with self._lock:
+            service = self._models.get(key)
+            if service is not None:
+                self._models.move_to_end(key)
+                return service
+            is_loader = key not in self._loading
+            if is_loader:
+                self._loading[key] = Future()
+            loading = self._loading[key]
+        if is_loader:
+            self._load(key, loading)
+        return loading.result()
+
+    def snapshot(self) -> dict:
+        """
+        Return the resident models and the memory they use.
+
+        Returns:
+            dict: The budget, the memory used and the resident models,
+                from least to most recently used.
+        """
+        with self._lock:
+            services = list(self._models.values())
+        return {
+            'max_bytes': self.max_bytes,
+            'used_bytes': sum(map(footprint, services)),
+            'models': [
+                {
+                    'model_name': service.model_name,
+                    'model_version': service.model_version,
+                    'served_version': service.loaded_model.version,
+                    'bytes': footprint(service),
+                }
+                for service in services
+            ],
+        }
+
+    def _load(self, key: tuple[str, str], loading: Future) -> None:
+        """
+        Load a model and make it resident, evicting others if needed.
+
+        Args:
+            key (tuple[str, str]): Name and version of the model.
+            loading (Future): Future resolved with the loaded service.
+        """
+        logger.info(f'loading model {key} into the pool')
+        service = ModelInferenceService(*key)
+        try:
+            service.load_model()
+        except Exception as error:
+            with self._lock:
+                self._loading.pop(key)
+            loading.set_exception(error)
+            return
+        with self._lock:
+            self._models[key] = service
+            self._loading.pop(key)
+            self._evict()
+        loading.set_result(service)
+
+    def _evict(self) -> None:
+        """Evict least recently used models until within the budget."""
+        used_bytes = sum(map(footprint, self._models.values()))
+        while used_bytes > self.max_bytes and len(self._models) > 1:
+            key, service = self._models.popitem(last=False)
+            used_bytes -= footprint(service)
+            logger.info(f'evicted model {key} from the pool')
+
+
+def footprint(service: ModelInferenceService) -> int:
+    """
+    Approximate the memory used by a model service.
+
+    The prediction cache is counted at its full capacity, which it
+    reaches once enough distinct rows have been scored, at an estimated
+    `CACHE_ENTRY_BYTES` per entry.
+
+    Args:
+        service (ModelInferenceService): A service with a loaded model.
+
+    Returns:
+        int: The size of the model file, of the full cache and of the
+            compiled copy, in bytes.
+    """
+    loaded_model = service.loaded_model
+    cache_bytes = max(service.cache.max_size, 0) * CACHE_ENTRY_BYTES
+    copy_bytes = 0
+    if loaded_model.compiled_forest is not None:
+        copy_bytes = loaded_model.compiled_forest.nbytes
+    return loaded_model.size + cache_bytes + copy_bytes
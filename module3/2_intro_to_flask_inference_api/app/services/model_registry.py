@@ -0,0 +1,56 @@
+"""
+This module provides lookups in the versioned model registry.
+
+The registry is written by the model builder service. Every version
+of a model is stored immutably next to an index holding the `latest`
+and `pinned` aliases and the metadata of every version:
+
+    <model_path>/registry/<model_name>/index.json
+    <model_path>/registry/<model_name>/<version>/model
+    <model_path>/registry/<model_name>/<version>/metadata.json
+"""
+
+import json
+from pathlib import Path
+
+ALIASES = frozenset(('latest', 'pinned'))
+MODEL_FILE = 'model'
+
+
+def index_path(model_path: str, model_name: str) -> Path:
+    """
+    Get the index of the registry of a model.
+
+    Args:
+        model_path (str): Directory of the models.
+        model_name (str): Name of the model.
+
+    Returns:
+        Path: The index file of the registry.
+    """
+    return Path(model_path) / 'registry' / model_name / 'index.json'
+
+
+def resolve_model(model_path: str, model_name: str, selector: str) -> Path:
+    """
+    Find the model file of a version or alias in the registry.
+
+    Args:
+        model_path (str): Directory of the models.
+        model_name (str): Name of the model.
+        selector (str): `latest`, `pinned` or a model version.
+
+    Returns:
+        Path: The model file of the selected version.
+
+    Raises:
+        FileNotFoundError: If no model matches the selector.
+    """
+    registry_index = index_path(model_path, model_name)
+    if not registry_index.exists():
+        raise FileNotFoundError('Model registry does not exist!')
+    index = json.loads(registry_index.read_text())
+    version = index[selector] if selector in ALIASES else selector
+    if version not in index['versions']:
+        raise FileNotFoundError(f'No registered model for {selector}!')
+    return registry_index.parent / version / MODEL_FILE
@@ -0,0 +1,87 @@
+"""
+This module provides hot reloading of the model file.
+
+It contains the ModelWatcher class, which polls the model file, or the
+model registry index, of a ModelInferenceService in a background thread
+and reloads the model whenever the file changes.
+"""
+
+import os
+import threading
+
+from loguru import logger
+
+from services.model_inference import ModelInferenceService
+
+
+class ModelWatcher:
+    """
+    A background poller reloading the model when its file changes.
+
+    The file is considered changed when its modification time or size
+    differ from the last poll; the service itself skips files whose
+    content matches the loaded model. The polling thread is restarted in
+    forked child processes, so every worker of a pre-fork server keeps
+    watching.
+
+    Attributes:
+        interval: Number of seconds between two polls.
+
+    Methods:
+        __init__: Constructor that initializes the ModelWatcher.
+        start: Starts polling in a background thread.
+    """
+
+    def __init__(
+        self,
+        inference_service: ModelInferenceService,
+        interval: float,
+    ) -> None:
+        """
+        Initialize the ModelWatcher.
+
+        Args:
+            inference_service (ModelInferenceService): Service to reload.
+            interval (float): Number of seconds between two polls.
+        """
+        self.interval = interval
+        self._inference_service = inference_service
+        self._model_path = inference_service.model_source()
+        self._last_stat = self._stat()
+        os.register_at_fork(after_in_child=self.start)
+
+    def start(self) -> None:
+        """Start polling the model file in a daemon thread."""
+        threading.Thread(
+            target=self._run,
+            name='model-watcher',
+            daemon=True,
+        ).start()
+
+    def _run(self) -> None:
+        """Poll the model file forever."""
+        logger.info(f'watching {self._model_path} for changes')
+        stop = threading.Event()
+        while not stop.wait(self.interval):
+            model_stat = self._stat()
+            if model_stat is None or model_stat == self._last_stat:
+                continue
+            self._last_stat = model_stat
+            try:
+                self._inference_service.load_model()
+            except Exception:
+                logger.exception('reloading the model failed')
+
+    def _stat(self) -> tuple[int, int] | None:
+        """
+        Return the modification time and size of the model file.
+
+        Returns:
+            tuple[int, int] | None: Modification time in ns and size in
+                bytes, or None if the file does not exist.
+        """
+        try:
+            model_stat = self._model_path.stat()
+        except FileNotFoundError:
+            return None
+        return model_stat.st_mtime_ns, model_stat.st_size
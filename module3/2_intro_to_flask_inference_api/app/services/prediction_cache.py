@@ -0,0 +1,104 @@
+"""
+This module provides a bounded cache for model predictions.
+
+It contains the PredictionCache class, a thread-safe least recently used
+mapping from feature tuples to predictions, which keeps hit, miss and
+eviction counters.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+
+
+class PredictionCache:
+    """
+    A thread-safe LRU cache of predictions.
+
+    A max size of zero disables the cache: lookups always miss and
+    nothing is stored.
+
+    Attributes:
+        max_size: Largest number of predictions kept in the cache.
+        hits: Number of lookups answered from the cache.
+        misses: Number of lookups not found in the cache.
+        evictions: Number of predictions dropped to make room.
+
+    Methods:
+        __init__: Constructor that initializes the PredictionCache.
+        get: Looks up a prediction and marks it as recently used.
+        put: Stores a prediction, evicting the least recently used one.
+        clear: Drops all cached predictions.
+        snapshot: Returns the size and counters of the cache.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """
+        Initialize the PredictionCache.
+
+        Args:
+            max_size (int): Largest number of predictions to keep.
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> float | None:
+        """
+        Look up a cached prediction.
+
+        Args:
+            key (Hashable): Model version and feature values of the row.
+
+        Returns:
+            float | None: The cached prediction, or None on a miss.
+        """
+        with self._lock:
+            prediction = self._entries.get(key)
+            if prediction is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return prediction
+
+    def put(self, key: Hashable, prediction: float) -> None:
+        """
+        Store a prediction in the cache.
+
+        Args:
+            key (Hashable): Model version and feature values of the row.
+            prediction (float): The prediction made for the row.
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = prediction
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached predictions, keeping the counters."""
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        """
+        Return the size and counters of the cache.
+
+        Returns:
+            dict: Current size, max size, hits, misses and evictions.
+        """
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,73 @@
+"""
+This module provides prediction intervals of forest models.
+
+It contains the predict_interval function, which collects the leaf
+output of every tree in a single vectorized traversal of the compiled
+forest, and derives the mean, the standard deviation and the requested
+quantiles of the tree outputs from that one matrix. The mean is the
+regular prediction of the forest. The compiled forest is built on the
+first interval request of a model and kept with it
+(`LoadedModel.compiled_forest`).
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from services import metrics
+from services.compiled_forest import average_trees
+from services.model_inference import LoadedModel
+
+
+class PredictionInterval(NamedTuple):
+    """
+    The spread of the tree outputs of a forest for a feature matrix.
+
+    Attributes:
+        mean: The prediction of the forest, one per input row.
+        std: Standard deviation of the tree outputs, one per input row.
+        quantiles: Quantiles of the tree outputs, one list per quantile.
+        model_version: Version of the model which served the prediction.
+    """
+
+    mean: list
+    std: list
+    quantiles: dict[float, list]
+    model_version: str
+
+
+def predict_interval(
+    loaded_model: LoadedModel,
+    input_matrix: list | np.ndarray,
+    quantiles: tuple[float, ...],
+) -> PredictionInterval:
+    """
+    Make predictions with the spread of the trees of a forest.
+
+    Args:
+        loaded_model (LoadedModel): The model to predict with.
+        input_matrix (list | np.ndarray): Rows of input data.
+        quantiles (tuple[float, ...]): Quantiles to compute, in [0, 1].
+
+    Returns:
+        PredictionInterval: The mean, deviation and quantiles per row.
+
+    Raises:
+        ValueError: If the model is not a forest.
+    """
+    if loaded_model.compiled_forest is None:
+        raise ValueError('Model is not a forest')
+    forest = loaded_model.compiled_forest.get()
+    metrics.predictions_total.inc(
+        loaded_model.version, amount=len(input_matrix),
+    )
+    with metrics.stage_latency.time('inference'):
+        tree_outputs = forest.tree_outputs(input_matrix)
+        tree_quantiles = np.quantile(tree_outputs, quantiles, axis=1)
+        interval = PredictionInterval(
+            average_trees(tree_outputs).tolist(),
+            tree_outputs.std(axis=1, dtype=np.float64).tolist(),
+            dict(zip(quantiles, tree_quantiles.tolist())),
+            loaded_model.version,
+        )
+    return interval
@@ -0,0 +1,63 @@
+"""
+This module starts the serving services of the application.
+
+Importing it loads the configured model, which is then warmed up in
+the background, and creates the services the API shares. It is kept
+out of the package `__init__`, so the other modules of the package,
+such as the forest formats used by `convert_model.py`, can be imported
+without starting anything.
+"""
+
+from config import serving_settings
+from services.admission import AdmissionController
+from services.async_inference import AsyncInferenceService
+from services.batching import PredictionBatcher
+from services.model_inference import ModelInferenceService
+from services.model_pool import ModelPool
+from services.model_watcher import ModelWatcher
+from services.shadow import ShadowScorer
+
+
+model_inference_service = ModelInferenceService()
+model_inference_service.load_model()
+
+model_pool = ModelPool(max_mb=serving_settings.model_pool_max_mb)
+
+prediction_batcher = None
+if serving_settings.batching_enabled:
+    prediction_batcher = PredictionBatcher(
+        model_inference_service,
+        window_ms=serving_settings.batching_window_ms,
+        max_size=serving_settings.batching_max_size,
+    )
+
+shadow_scorer = None
+if serving_settings.shadow_enabled:
+    shadow_candidate = ModelInferenceService(
+        model_name=serving_settings.shadow_model_name or None,
+        model_version=serving_settings.shadow_model_version,
+    )
+    shadow_candidate.load_model()
+    shadow_scorer = ShadowScorer(
+        shadow_candidate,
+        sample_rate=serving_settings.shadow_sample_rate,
+        queue_size=serving_settings.shadow_queue_size,
+    )
+
+admission_controller = AdmissionController(
+    max_concurrency=serving_settings.admission_max_concurrency,
+    max_queue=serving_settings.admission_max_queue,
+    queue_timeout=serving_settings.admission_queue_timeout,
+)
+
+async_inference_service = AsyncInferenceService(
+    model_inference_service,
+    executor_kind=serving_settings.async_executor,
+    max_workers=serving_settings.async_executor_workers,
+)
+
+if serving_settings.model_watch_interval > 0:
+    ModelWatcher(
+        model_inference_service,
+        interval=serving_settings.model_watch_interval,
+    ).start()
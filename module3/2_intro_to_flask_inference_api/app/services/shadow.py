@@ -0,0 +1,237 @@
+"""
+This module provides shadow scoring of a candidate model.
+
+It contains the ShadowScorer class, which copies a sampled fraction of
+the live predictions onto a bounded queue and scores them again with a
+candidate model in a background thread, off the request path. The
+ShadowReport class aggregates the prediction deltas and latencies of
+both models.
+"""
+
+import queue
+import random
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+from loguru import logger
+
+from services.model_inference import ModelInferenceService, Prediction
+
+MILLISECONDS = 1000
+
+
+class ShadowReport:
+    """
+    Thread-safe aggregate of the comparisons of the shadow scorer.
+
+    It counts the compared requests and rows, the sampled requests
+    dropped on a full queue or failed by the candidate, and sums the
+    prediction deltas, candidate minus live, and the latencies of both
+    models.
+
+    Methods:
+        __init__: Constructor that initializes the ShadowReport.
+        record: Records the comparison of one request.
+        count: Counts a dropped or failed request.
+        snapshot: Returns a consistent summary of the report.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty report."""
+        self._lock = threading.Lock()
+        self._totals = Counter()
+        self._max_abs_delta = 0
+
+    def record(
+        self,
+        deltas: np.ndarray,
+        live_ms: float,
+        candidate_ms: float,
+    ) -> None:
+        """
+        Record the comparison of one request.
+
+        Args:
+            deltas (np.ndarray): Candidate minus live prediction per row.
+            live_ms (float): Latency of the live model, in ms.
+            candidate_ms (float): Latency of the candidate, in ms.
+        """
+        abs_deltas = np.abs(deltas)
+        with self._lock:
+            self._totals.update(
+                requests=1,
+                rows=len(deltas),
+                delta_sum=float(deltas.sum()),
+                abs_delta_sum=float(abs_deltas.sum()),
+                live_ms_sum=live_ms,
+                candidate_ms_sum=candidate_ms,
+            )
+            self._max_abs_delta = max(
+                self._max_abs_delta, float(abs_deltas.max()),
+            )
+
+    def count(self, outcome: str) -> None:
+        """
+        Count a sampled request which was not compared.
+
+        Args:
+            outcome (str): Either `dropped` or `failed`.
+        """
+        with self._lock:
+            self._totals[outcome] += 1
+
+    def snapshot(self) -> dict:
+        """
+        Return a consistent summary of the report.
+
+        Returns:
+            dict: Counts, mean and largest prediction deltas, and mean
+                latencies of both models.
+        """
+        with self._lock:
+            totals = self._totals.copy()
+            max_abs_delta = self._max_abs_delta
+        rows = max(totals['rows'], 1)
+        requests = max(totals['requests'], 1)
+        return {
+            'requests': totals['requests'],
+            'rows': totals['rows'],
+            'dropped': totals['dropped'],
+            'failed': totals['failed'],
+            'mean_delta': totals['delta_sum'] / rows,
+            'mean_abs_delta': totals['abs_delta_sum'] / rows,
+            'max_abs_delta': max_abs_delta,
+            'live_mean_ms': totals['live_ms_sum'] / requests,
+            'candidate_mean_ms': totals['candidate_ms_sum'] / requests,
+        }
+
+
+class ShadowScorer:
+    """
+    A background comparison of a candidate model with the live model.
+
+    `submit` only draws a random number and, for sampled requests, puts
+    the rows and live predictions on a bounded queue without waiting;
+    when the queue is full the request is dropped from the comparison.
+    A background thread scores the queued rows with the candidate.
+
+    Attributes:
+        candidate: Service of the candidate model.
+        sample_rate: Fraction of the requests copied to the candidate.
+        report: Aggregated comparison of both models.
+
+    Methods:
+        __init__: Constructor that initializes the ShadowScorer.
+        submit: Copies a live prediction to the candidate, if sampled.
+        snapshot: Returns the report with the versions of both models.
+    """
+
+    def __init__(
+        self,
+        candidate: ModelInferenceService,
+        sample_rate: float,
+        queue_size: int,
+    ) -> None:
+        """
+        Initialize the ShadowScorer.
+
+        Args:
+            candidate (ModelInferenceService): Service of the candidate.
+            sample_rate (float): Fraction of the requests to compare.
+            queue_size (int): Largest number of queued requests.
+        """
+        self.candidate = candidate
+        self.sample_rate = sample_rate
+        self.report = ShadowReport()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._worker_lock = threading.Lock()
+        self._worker = None
+        self._live_version = None
+
+    def submit(
+        self,
+        input_matrix: list,
+        prediction: Prediction,
+        live_seconds: float,
+    ) -> None:
+        """
+        Copy a live prediction to the candidate, if it is sampled.
+
+        Args:
+            input_matrix (list): The rows scored by the live model.
+            prediction (Prediction): The predictions of the live model.
+            live_seconds (float): Latency of the live model, in seconds.
+        """
+        if random.random() >= self.sample_rate:  # noqa: S311
+            return
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((input_matrix, prediction, live_seconds))
+        except queue.Full:
+            self.report.count('dropped')
+
+    def snapshot(self) -> dict:
+        """
+        Return the report with the versions of both models.
+
+        Returns:
+            dict: The report of the comparison.
+        """
+        return {
+            'live_version': self._live_version,
+            'candidate_version': self.candidate.loaded_model.version,
+            'sample_rate': self.sample_rate,
+            **self.report.snapshot(),
+        }
+
+    def _ensure_worker(self) -> None:
+        """Start the scoring thread, also after the process was forked."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name='shadow-scorer',
+                    daemon=True,
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        """Score queued requests with the candidate forever."""
+        logger.info('starting up shadow scorer')
+        while True:  # noqa: WPS457
+            self._compare(*self._queue.get())
+
+    def _compare(
+        self,
+        input_matrix: list,
+        prediction: Prediction,
+        live_seconds: float,
+    ) -> None:
+        """
+        Score one request with the candidate and record the comparison.
+
+        Args:
+            input_matrix (list): The rows scored by the live model.
+            prediction (Prediction): The predictions of the live model.
+            live_seconds (float): Latency of the live model, in seconds.
+        """
+        started = time.perf_counter()
+        try:
+            candidate_prediction = self.candidate.predict_batch(input_matrix)
+        except Exception:
+            logger.exception('shadow scoring failed')
+            self.report.count('failed')
+            return
+        candidate_seconds = time.perf_counter() - started
+        self._live_version = prediction.model_version
+        self.report.record(
+            np.subtract(
+                candidate_prediction.predictions, prediction.predictions,
+            ),
+            live_seconds * MILLISECONDS,
+            candidate_seconds * MILLISECONDS,
+        )
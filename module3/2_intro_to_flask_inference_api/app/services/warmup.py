@@ -0,0 +1,229 @@
+"""
+This module provides the warm-up of freshly loaded models.
+
+The first predictions of a model are much slower than the steady state
+because of cold pages, lazy imports and first-call allocations. The
+warm_up function runs rounds of synthetic predictions over inputs which
+reach every split of the forest, until the round latency has settled.
+The ModelWarmup class keeps warming a model in the background until its
+latency settles, and tells whether the process is ready to serve.
+"""
+
+import statistics
+import threading
+import time
+from typing import Any, NamedTuple
+
+import numpy as np
+from loguru import logger
+
+from config import serving_settings
+from services.bucket_index import BucketIndex
+from services.compiled_forest import CompiledForest
+
+MILLISECONDS = 1000
+SEED = 42
+
+
+class WarmupReport(NamedTuple):
+    """
+    The outcome of the warm-up of a model.
+
+    Attributes:
+        rounds: Number of synthetic prediction rounds run.
+        latencies_ms: Latency of every round, in ms.
+        settled: Whether the round latency settled before the last round.
+        timed_out: Whether the warm-up gave up before the latency settled.
+    """
+
+    rounds: int
+    latencies_ms: tuple[float, ...]
+    settled: bool
+    timed_out: bool = False
+
+
+class ModelWarmup:
+    """
+    The warm-up of a model, continued in the background until settled.
+
+    Rounds of `warm_up` are repeated until the latency settles. On a
+    noisy host it may never settle, so after `warmup_max_seconds` the
+    warm-up gives up and the model is considered warm anyway. The
+    latest report is published in a single assignment, so it can be
+    read from any thread.
+
+    Readiness is sticky: the warm-up of a model replacing one which was
+    ready keeps the process ready, since the previous model kept
+    serving until the new one was swapped in.
+
+    Attributes:
+        estimator: The model to warm up.
+        report: Outcome of the latest rounds, None before the first.
+
+    Methods:
+        __init__: Constructor that initializes the ModelWarmup.
+        warm_up: Runs one warm-up in the calling thread.
+        start: Keeps warming up in a background thread.
+        warm: Whether the model is warm, or the warm-up gave up.
+        ready: Whether the model is warm, or replaced a ready one.
+    """
+
+    def __init__(
+        self,
+        estimator: Any,
+        previous: 'ModelWarmup | None' = None,
+    ) -> None:
+        """
+        Initialize the ModelWarmup.
+
+        Args:
+            estimator (Any): The model to warm up.
+            previous (ModelWarmup | None): Warm-up of the replaced model.
+        """
+        self.estimator = estimator
+        self.report = None
+        self._rounds = 0
+        self._was_ready = previous is not None and previous.ready
+
+    def warm_up(self) -> WarmupReport:
+        """
+        Run one warm-up of at most `warmup_max_rounds` rounds.
+
+        Returns:
+            WarmupReport: The report, counting the rounds of every
+                warm-up of the model so far.
+        """
+        report = warm_up(self.estimator)
+        self._rounds += report.rounds
+        self.report = report._replace(rounds=self._rounds)  # noqa: WPS437
+        return self.report
+
+    def start(self) -> None:
+        """Keep warming up in a background thread until ready."""
+        threading.Thread(
+            target=self._keep_warming, name='model-warmup', daemon=True,
+        ).start()
+
+    @property
+    def warm(self) -> bool:
+        """
+        Tell whether the model is warm.
+
+        Returns:
+            bool: Whether the latency settled or the warm-up gave up.
+        """
+        report = self.report
+        return report is not None and (report.settled or report.timed_out)
+
+    @property
+    def ready(self) -> bool:
+        """
+        Tell whether the process is ready to serve.
+
+        Returns:
+            bool: Whether the model is warm, or replaced a ready model.
+        """
+        return self._was_ready or self.warm
+
+    def _keep_warming(self) -> None:
+        """Warm up until the latency settles or the time is up."""
+        deadline = time.perf_counter() + serving_settings.warmup_max_seconds
+        while not self.warm_up().settled:
+            if time.perf_counter() >= deadline:
+                logger.warning(
+                    f'model latency did not settle in {self._rounds} '
+                    'rounds, serving it warm enough',
+                )
+                self.report = self.report._replace(  # noqa: WPS437
+                    timed_out=True,
+                )
+                return
+
+
+def warm_up(estimator: Any) -> WarmupReport:
+    """
+    Run synthetic predictions until their latency settles.
+
+    Every round makes a single-row and a batch prediction. The latency
+    has settled once the median of the last `warmup_window` rounds is
+    within `warmup_tolerance` of the median of the window before.
+
+    Args:
+        estimator (Any): The model to warm up.
+
+    Returns:
+        WarmupReport: The latencies of the rounds, and whether they
+            settled within `warmup_max_rounds` rounds.
+    """
+    input_matrix = synthetic_inputs(
+        estimator, serving_settings.warmup_batch_size,
+    )
+    latencies_ms = []
+    settled = False
+    while not settled:
+        if len(latencies_ms) == serving_settings.warmup_max_rounds:
+            break
+        started = time.perf_counter()
+        estimator.predict(input_matrix[:1])
+        estimator.predict(input_matrix)
+        latencies_ms.append((time.perf_counter() - started) * MILLISECONDS)
+        settled = _settled(latencies_ms)
+
+    rounds = len(latencies_ms)
+    if settled:
+        logger.info(f'model warmed up in {rounds} rounds')
+    else:
+        logger.warning(f'model latency did not settle in {rounds} rounds')
+    return WarmupReport(rounds, tuple(latencies_ms), settled)
+
+
+def synthetic_inputs(estimator: Any, size: int) -> np.ndarray:
+    """
+    Draw representative inputs for a model.
+
+    The features of a forest are drawn from the values just below and
+    above each of its split thresholds, so the rows take both branches
+    of every split. Other models get all-zero rows.
+
+    Args:
+        estimator (Any): The model to draw inputs for.
+        size (int): Number of rows.
+
+    Returns:
+        np.ndarray: The feature matrix.
+    """
+    n_features = estimator.n_features_in_
+    if isinstance(estimator, CompiledForest):
+        bucket_index = BucketIndex.from_forest(estimator)
+    elif getattr(estimator, 'estimators_', None) is not None:
+        bucket_index = BucketIndex.from_estimator(estimator)
+    else:
+        return np.zeros((size, n_features))
+
+    generator = np.random.default_rng(SEED)
+    columns = []
+    for thresholds in bucket_index.thresholds:
+        split_values = np.concatenate(
+            [[0], np.floor(thresholds), np.floor(thresholds) + 1],
+        )
+        columns.append(generator.choice(split_values, size))
+    return np.column_stack(columns)
+
+
+def _settled(latencies_ms: list[float]) -> bool:
+    """
+    Check whether the latency of the last rounds has settled.
+
+    Args:
+        latencies_ms (list[float]): Latency of every round so far.
+
+    Returns:
+        bool: Whether the last window is within tolerance of the one
+            before.
+    """
+    window = serving_settings.warmup_window
+    if len(latencies_ms) < 2 * window:
+        return False
+    last = statistics.median(latencies_ms[-window:])
+    previous = statistics.median(latencies_ms[-2 * window:-window])
+    return abs(last - previous) <= serving_settings.warmup_tolerance * previous
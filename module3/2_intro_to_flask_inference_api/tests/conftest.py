@@ -0,0 +1,87 @@
+"""
+Test configuration of the inference service.
+
+The modules of the service import each other from the `app` directory
+and read their settings from the environment, or from `config/.env`,
+when they are first imported. The tests therefore run from a temporary
+directory, which also receives the log file, with the settings they
+need, and fit small forests instead of loading a trained model.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+APP_DIR = Path(__file__).resolve().parents[1] / 'app'
+N_FEATURES = 9
+
+sys.path.insert(0, str(APP_DIR))
+os.chdir(tempfile.mkdtemp(prefix='inference-tests-'))
+os.environ.update(MODEL_PATH='.', MODEL_NAME='model', LOG_LEVEL='INFO')
+
+
+def fit_forest(seed: int) -> RandomForestRegressor:
+    """
+    Fit a small forest on integer features, like apartment features.
+
+    Args:
+        seed (int): Seed of the data and of the forest.
+
+    Returns:
+        RandomForestRegressor: The fitted forest.
+    """
+    generator = np.random.default_rng(seed)
+    features = generator.integers(0, 100, size=(300, N_FEATURES))
+    target = features @ generator.random(N_FEATURES) + generator.random(300)
+    return RandomForestRegressor(
+        n_estimators=20, max_depth=8, random_state=seed,
+    ).fit(features, target)
+
+
+@pytest.fixture(scope='session')
+def forest() -> RandomForestRegressor:
+    """
+    Provide a small fitted forest.
+
+    Returns:
+        RandomForestRegressor: The fitted forest.
+    """
+    return fit_forest(seed=0)
+
+
+@pytest.fixture
+def rows() -> np.ndarray:
+    """
+    Provide rows of integer features, including unseen values.
+
+    Returns:
+        np.ndarray: The feature rows.
+    """
+    return np.random.default_rng(1).integers(-10, 120, size=(200, N_FEATURES))
+
+
+@pytest.fixture
+def threshold_rows(forest: RandomForestRegressor) -> np.ndarray:
+    """
+    Provide float rows on and around the split thresholds of the forest.
+
+    Args:
+        forest: The forest whose thresholds to use.
+
+    Returns:
+        np.ndarray: The feature rows.
+    """
+    thresholds = np.concatenate([
+        tree.tree_.threshold[tree.tree_.feature >= 0]
+        for tree in forest.estimators_
+    ])
+    values = np.concatenate([
+        thresholds, np.nextafter(thresholds, np.inf), thresholds + 0.5,
+    ])
+    generator = np.random.default_rng(2)
+    return generator.choice(values, size=(500, forest.n_features_in_))
@@ -0,0 +1,116 @@
+"""Tests of the fast request decoding and its fallback to the schema."""
+
+import numpy as np
+import pytest
+
+from api import codec
+
+INT64_MAX = np.iinfo(np.int64).max
+
+
+@pytest.fixture
+def apartment() -> dict:
+    """
+    Provide a valid apartment.
+
+    Returns:
+        dict: The apartment, with every field set.
+    """
+    return {
+        'area': 10,
+        'constraction_year': 2000,
+        'bedrooms': 2,
+        'garden_area': 1,
+        'balcony_present': 1,
+        'parking_present': 0,
+        'furnished': 1,
+        'garage_present': 0,
+        'storage_present': 1,
+    }
+
+
+def test_decode_row_accepts_ints(apartment):
+    """A dict of plain ints is decoded in field order."""
+    assert codec.decode_row(apartment) == list(apartment.values())
+
+
+@pytest.mark.parametrize('area', [
+    '10', 10.0, True, None, INT64_MAX + 1, -INT64_MAX - 2,
+])
+def test_decode_row_rejects_non_int64(apartment, area):
+    """Anything but an int within the int64 range is left to the schema."""
+    assert codec.decode_row({**apartment, 'area': area}) is None
+
+
+@pytest.mark.parametrize('item', [[], 'apartment', 1, None])
+def test_decode_row_rejects_non_dicts(item):
+    """Items which are not objects are left to the schema."""
+    assert codec.decode_row(item) is None
+
+
+def test_decode_row_rejects_missing_fields(apartment):
+    """Apartments with a missing field are left to the schema."""
+    apartment.pop('bedrooms')
+
+    assert codec.decode_row(apartment) is None
+
+
+def test_decode_args_accepts_digits(apartment):
+    """Query parameters of plain digits are decoded as ints."""
+    args = {name: str(feature) for name, feature in apartment.items()}
+
+    assert codec.decode_args(args) == list(apartment.values())
+
+
+@pytest.mark.parametrize('area', [
+    '', '-1', '+1', '1.0', ' 1', '١٢',
+    str(INT64_MAX + 1), '9' * 20, '1' * 5000,
+])
+def test_decode_args_rejects(apartment, area):
+    """Signs, non-ASCII digits and out-of-range values go to the schema."""
+    args = {name: str(feature) for name, feature in apartment.items()}
+    args['area'] = area
+
+    assert codec.decode_args(args) is None
+
+
+def test_decode_batch_reports_invalid_items(apartment):
+    """Invalid items are reported by index, valid ones are scored."""
+    batch = codec.decode_batch([
+        apartment,
+        {**apartment, 'area': 'large'},
+        {**apartment, 'area': INT64_MAX + 1},
+        {**apartment, 'area': '12'},
+    ])
+
+    assert batch.size == 4
+    assert batch.indices == [0, 3]
+    assert batch.matrix[:, 0].tolist() == [10, 12]
+    assert [error['index'] for error in batch.errors] == [1, 2]
+
+
+def test_decode_batch_columns(apartment):
+    """Columns of ints are decoded without the schema."""
+    columns = {name: [feature, feature] for name, feature in apartment.items()}
+
+    batch = codec.decode_batch(columns)
+
+    assert batch.indices == [0, 1]
+    assert not batch.errors
+    assert batch.matrix.tolist() == [list(apartment.values())] * 2
+
+
+def test_decode_batch_rejects_uneven_columns(apartment):
+    """Columns of different lengths are not a batch."""
+    columns = {name: [feature] for name, feature in apartment.items()}
+    columns['area'] = [1, 2]
+
+    with pytest.raises(ValueError, match='same length'):
+        codec.decode_batch(columns)
+
+
+@pytest.mark.parametrize('body', ['apartments', 1, None])
+def test_decode_batch_rejects_other_bodies(body):
+    """Bodies which are neither a list nor an object are rejected."""
+    with pytest.raises(ValueError, match='Expected'):
+        codec.decode_batch(body)
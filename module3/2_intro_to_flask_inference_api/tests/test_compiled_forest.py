@@ -0,0 +1,62 @@
+"""Tests of the array-compiled forest evaluator."""
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from services.compiled_forest import CompiledForest, LazyCompiledForest
+
+
+def test_predictions_equal_sklearn(forest, rows):
+    """Predictions on integer rows are bit-identical to the estimator."""
+    compiled = CompiledForest.from_estimator(forest)
+
+    assert np.array_equal(compiled.predict(rows), forest.predict(rows))
+
+
+def test_predictions_equal_sklearn_on_thresholds(forest, threshold_rows):
+    """Rows on the split thresholds take the same branches as sklearn."""
+    compiled = CompiledForest.from_estimator(forest)
+
+    assert np.array_equal(
+        compiled.predict(threshold_rows), forest.predict(threshold_rows),
+    )
+
+
+def test_tree_outputs_equal_trees(forest, rows):
+    """Every column of the tree outputs is the prediction of its tree."""
+    tree_outputs = CompiledForest.from_estimator(forest).tree_outputs(rows)
+
+    for column, tree in enumerate(forest.estimators_):
+        assert np.array_equal(
+            tree_outputs[:, column], tree.predict(rows.astype(np.float32)),
+        )
+
+
+def test_lazy_forest_compiles_once(forest, rows):
+    """A lazily compiled forest is compiled on first use and then kept."""
+    lazy_forest = LazyCompiledForest(forest)
+    assert lazy_forest.nbytes == 0
+
+    compiled = lazy_forest.get()
+
+    assert lazy_forest.get() is compiled
+    assert lazy_forest.nbytes > 0
+    assert np.array_equal(compiled.predict(rows), forest.predict(rows))
+
+
+def test_lazy_forest_shares_compiled_model(forest):
+    """A model served compiled is used as is, without a copy."""
+    compiled = CompiledForest.from_estimator(forest)
+    lazy_forest = LazyCompiledForest(compiled)
+
+    assert lazy_forest.get() is compiled
+    assert lazy_forest.nbytes == 0
+
+
+def test_lazy_forest_rejects_other_models(rows):
+    """Models which are not forests cannot be compiled."""
+    model = LinearRegression().fit(rows, rows[:, 0])
+
+    with pytest.raises(ValueError, match='not a forest'):
+        LazyCompiledForest(model).get()
@@ -0,0 +1,72 @@
+"""Tests of the compaction of compiled forests."""
+
+import numpy as np
+import pytest
+
+from services.compiled_forest import CompiledForest
+from services.forest_compaction import compact, forest_size, max_deviation
+
+
+@pytest.fixture(scope='module')
+def compiled(forest) -> CompiledForest:
+    """
+    Provide the forest compiled with its original dtypes.
+
+    Args:
+        forest: The forest to compile.
+
+    Returns:
+        CompiledForest: The compiled forest.
+    """
+    return CompiledForest.from_estimator(forest)
+
+
+@pytest.mark.parametrize('rows_fixture', ['rows', 'threshold_rows'])
+def test_deviation_within_bound(compiled, rows_fixture, request):
+    """Predictions of the compact forest deviate by at most the bound."""
+    input_rows = request.getfixturevalue(rows_fixture)
+    compact_forest = compact(compiled)
+    bound = max_deviation(compiled, compact_forest)
+
+    deviation = np.abs(
+        compact_forest.predict(input_rows) - compiled.predict(input_rows),
+    )
+
+    assert bound > 0
+    assert deviation.max() <= bound * (1 + 1e-9)
+
+
+@pytest.mark.parametrize('rows_fixture', ['rows', 'threshold_rows'])
+def test_same_leaves(compiled, rows_fixture, request):
+    """Every tree routes every row to the leaf it did before compaction."""
+    input_rows = request.getfixturevalue(rows_fixture)
+    compact_forest = compact(compiled)
+
+    tree_outputs = compiled.tree_outputs(input_rows)
+    compact_outputs = compact_forest.tree_outputs(input_rows)
+
+    assert np.array_equal(
+        compact_outputs, tree_outputs.astype(np.float32),
+    )
+
+
+def test_thresholds_rounded_down(compiled):
+    """Thresholds are the largest float32 not above the original ones."""
+    thresholds = compiled.arrays.threshold
+    rounded = compact(compiled).arrays.threshold
+
+    assert rounded.dtype == np.float32
+    assert np.all(rounded <= thresholds)
+    assert np.all(np.nextafter(rounded, np.float32(np.inf)) > thresholds)
+
+
+def test_narrow_dtypes_and_smaller_size(compiled):
+    """The node arrays use narrow dtypes and take less memory."""
+    compact_forest = compact(compiled)
+    arrays = compact_forest.arrays
+
+    assert arrays.feature.dtype == np.int8
+    assert arrays.children_left.dtype.itemsize <= 2
+    assert arrays.roots.dtype == arrays.children_left.dtype
+    assert arrays.outputs.dtype == np.float32
+    assert forest_size(compact_forest) < forest_size(compiled)
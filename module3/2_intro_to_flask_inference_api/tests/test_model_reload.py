@@ -0,0 +1,57 @@
+"""Tests of the hot reload of the served model."""
+
+import pickle
+
+import pytest
+from conftest import fit_forest
+
+from config import serving_settings
+from services.model_inference import ModelInferenceService
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch, forest) -> ModelInferenceService:
+    """
+    Provide a service serving a pickled forest from a temporary directory.
+
+    Args:
+        tmp_path: The temporary directory of the test.
+        monkeypatch: The pytest monkeypatch fixture.
+        forest: The forest to serve first.
+
+    Returns:
+        ModelInferenceService: The service with the forest loaded.
+    """
+    monkeypatch.setattr(serving_settings, 'warmup_on_load', False)
+    monkeypatch.setattr(serving_settings, 'warmup_max_rounds', 1)
+    (tmp_path / 'model').write_bytes(pickle.dumps(forest))
+    inference_service = ModelInferenceService(model_name='model')
+    inference_service.model_path = str(tmp_path)
+    inference_service.load_model()
+    return inference_service
+
+
+def test_unchanged_file_keeps_cache(service, rows):
+    """Loading the same file again keeps the model and its cache."""
+    version = service.loaded_model.version
+    service.predict_batch(rows)
+
+    assert not service.load_model()
+    assert service.loaded_model.version == version
+    assert service.cache.snapshot()['size'] == len(rows)
+
+
+def test_reload_clears_cache(service, rows, tmp_path):
+    """A new model file replaces the model and drops its predictions."""
+    new_forest = fit_forest(seed=2)
+    old_version = service.loaded_model.version
+    service.predict_batch(rows)
+
+    (tmp_path / 'model').write_bytes(pickle.dumps(new_forest))
+
+    assert service.load_model()
+    assert service.loaded_model.version != old_version
+    assert service.cache.snapshot()['size'] == 0
+    prediction = service.predict_batch(rows)
+    assert prediction.model_version == service.loaded_model.version
+    assert prediction.predictions == new_forest.predict(rows).tolist()